@@ -15,6 +15,7 @@
         "analytic",
     ],
     "data": [
+        "data/ir_cron.xml",
         "views/account_analytic_distribution_model.xml",
         "views/account_move_line.xml",
     ],
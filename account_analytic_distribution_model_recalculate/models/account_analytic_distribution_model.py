@@ -1,16 +1,28 @@
 # Copyright 2024 (APSL - Nagarro) Bernat Obrador
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import _, api, fields, models
+import logging
+import threading
+import time
+
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 
 from odoo.addons.analytic.models.analytic_distribution_model import (
     NonMatchingDistribution,
 )
 
+_logger = logging.getLogger(__name__)
+
 
 class AccountAnalyticDistributionModel(models.Model):
     _inherit = ["account.analytic.distribution.model"]
+    # Number of journal items rewritten by transaction on recalculation.
+    # Recalculations of more items are done in background by the cron job.
+    _recalculate_batch_size = 1000
+    # Number of batches processed by each run of the cron job
+    _recalculate_cron_batches = 20
 
     start_date = fields.Date()
     end_date = fields.Date()
@@ -20,6 +32,23 @@ class AccountAnalyticDistributionModel(models.Model):
         and still matches the model criteria""",
         default=False,
     )
+    recalculate_state = fields.Selection(
+        [("pending", "Pending"), ("done", "Done")],
+        readonly=True,
+        copy=False,
+        help="State of the recalculation of the journal items in background",
+    )
+    recalculate_total = fields.Integer(
+        readonly=True, copy=False, help="Journal items to recalculate"
+    )
+    recalculate_done = fields.Integer(
+        readonly=True, copy=False, help="Journal items already recalculated"
+    )
+    recalculate_last_line_id = fields.Integer(
+        readonly=True,
+        copy=False,
+        help="Last journal item recalculated, to resume the recalculation",
+    )
 
     def _compute_display_name(self):
         for model in self:
@@ -99,12 +128,136 @@ class AccountAnalyticDistributionModel(models.Model):
                     )
                 )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        # Compiled matching indexes of the models
+        self.env.registry.clear_cache()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(not fname.startswith("recalculate_") for fname in vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @tools.ormcache("company_id")
+    def _get_matching_index(self, company_id):
+        """Return the models of the company compiled to be matched in memory,
+        by partner and product, or None if some fields to check cannot be
+        compared in memory."""
+        fnames = set(self._get_fields_to_check())
+        match_fields = {}
+        for fname in fnames - {"start_date", "end_date"}:
+            field = self._fields[fname]
+            if field.type == "many2one":
+                match_fields[fname] = False
+            elif field.type == "char" and fname.endswith("_prefix"):
+                match_fields[fname] = True
+            else:
+                return None
+        index = {}
+        distribution_models = self.sudo().search(
+            [("company_id", "in", [company_id, False])]
+        )
+        for position, model in enumerate(distribution_models):
+            values = {
+                fname: model[fname].id if not is_prefix else model[fname]
+                for fname, is_prefix in match_fields.items()
+            }
+            spec = {
+                "position": position,
+                "id": model.id,
+                "values": values,
+                "start_date": fields.Date.to_string(model.start_date),
+                "end_date": fields.Date.to_string(model.end_date),
+                "analytic_distribution": model.analytic_distribution,
+            }
+            key = (values.get("partner_id"), values.get("product_id"))
+            index.setdefault(key, []).append(spec)
+        date_score = len(fnames & {"start_date", "end_date"})
+        return match_fields, date_score, index
+
+    @api.model
+    def _match_model(self, vals):
+        """Return the spec of the best model for ``vals`` from the compiled
+        index, False if no model matches, or None if they cannot be matched
+        in memory. The score of the models is the one of ``_check_score``."""
+        compiled = self._get_matching_index(vals.get("company_id") or False)
+        if compiled is None:
+            return None
+        match_fields, date_score, index = compiled
+        if any(key not in match_fields and key != "date" for key in vals):
+            return None
+        date = vals.get("date") and fields.Date.to_string(
+            fields.Date.to_date(vals["date"])
+        )
+        candidates = []
+        for partner_id in {vals.get("partner_id") or False, False}:
+            for product_id in {vals.get("product_id") or False, False}:
+                candidates += index.get((partner_id, product_id), [])
+        best_score = 0
+        res = False
+        for spec in sorted(candidates, key=lambda c: c["position"]):
+            if date and (
+                (spec["start_date"] and spec["start_date"] > date)
+                or (spec["end_date"] and spec["end_date"] < date)
+            ):
+                continue
+            score = self._get_spec_score(spec, vals, match_fields)
+            if score is not None and score + date_score > best_score:
+                res = spec
+                best_score = score + date_score
+        return res
+
+    @api.model
+    def _get_spec_score(self, spec, vals, match_fields):
+        score = 0
+        for fname, is_prefix in match_fields.items():
+            model_value = spec["values"][fname]
+            value = vals.get(fname)
+            if fname == "company_id":
+                if not model_value:
+                    score += 0.5
+                elif value == model_value:
+                    score += 1
+                else:
+                    return None
+                continue
+            if not model_value:
+                continue
+            if value and (
+                model_value in value
+                if isinstance(value, (list, tuple))
+                else value.startswith(model_value)
+                if is_prefix
+                else value == model_value
+            ):
+                score += 1
+            else:
+                return None
+        return score
+
     @api.model
     def _get_distribution(self, vals):
         """
         Override the _get_distribution method to add the distribution_model_id
         to the result.
+        The models are matched from a compiled index, without searching them.
         """
+        spec = self._match_model(vals)
+        if spec is not None:
+            if self.env.context.get("get_distributiion_model_id"):
+                return self.browse(spec["id"]) if spec else {}
+            if not spec:
+                return {}
+            distribution = spec["analytic_distribution"]
+            return dict(distribution) if distribution else distribution
         if self.env.context.get("get_distributiion_model_id"):
             domain = []
             for fname, value in vals.items():
@@ -125,9 +278,13 @@ class AccountAnalyticDistributionModel(models.Model):
             return super()._get_distribution(vals)
 
     def _get_fields_to_check(self):
-        # Exclude the recalculate field from the fields to check
+        # Exclude the recalculate fields from the fields to check
         # to avoid NonMatchingDistribution
-        return [f for f in super()._get_fields_to_check() if f != "recalculate"]
+        return [
+            f
+            for f in super()._get_fields_to_check()
+            if f != "recalculate" and not f.startswith("recalculate_")
+        ]
 
     def _check_score(self, key, value):
         self.ensure_one()
@@ -247,26 +404,125 @@ class AccountAnalyticDistributionModel(models.Model):
 
         return domain
 
+    def _get_lines_query(self, domain):
+        """Return the subquery of the journal items matching ``domain``"""
+        aml_model = self.env["account.move.line"]
+        query = aml_model._where_calc(domain)
+        aml_model._apply_ir_rules(query, "read")
+        return query.subselect()
+
+    def _get_lines_to_recalculate_query(self, select, last_line_id=0, limit=None):
+        """Return the query of the journal items generated by the model whose
+        analytic distribution differs from the one of the model."""
+        self.ensure_one()
+        self.flush_recordset(["analytic_distribution"])
+        self.env["account.move.line"].flush_model(
+            ["analytic_distribution", "distribution_model_id"]
+        )
+        return SQL(
+            """
+            SELECT %(select)s
+            FROM account_move_line aml
+            JOIN account_analytic_distribution_model adm
+                ON adm.id = aml.distribution_model_id
+            WHERE aml.distribution_model_id = %(model_id)s
+                AND aml.analytic_distribution IS DISTINCT FROM adm.analytic_distribution
+                AND aml.id > %(last_line_id)s
+                AND aml.id IN (%(lines)s)
+            %(limit)s
+            """,
+            select=SQL(select),
+            model_id=self.id,
+            last_line_id=last_line_id,
+            lines=self._get_lines_query(self._get_lines_domain()),
+            limit=SQL("ORDER BY aml.id LIMIT %s", limit) if limit else SQL(),
+        )
+
+    def _recalculate_batch(self):
+        """Rewrite the analytic distribution of the next batch of journal
+        items of the model, which regenerates their analytic lines.
+        Return False when there is nothing left to recalculate."""
+        self.ensure_one()
+        self.env.cr.execute(
+            self._get_lines_to_recalculate_query(
+                "aml.id",
+                last_line_id=self.recalculate_last_line_id,
+                limit=self._recalculate_batch_size,
+            )
+        )
+        line_ids = [row[0] for row in self.env.cr.fetchall()]
+        if not line_ids:
+            self.recalculate_state = "done"
+            return False
+        start = time.perf_counter()
+        self.env["account.move.line"].browse(line_ids).write(
+            {"analytic_distribution": self.analytic_distribution}
+        )
+        self.write(
+            {
+                "recalculate_done": self.recalculate_done + len(line_ids),
+                "recalculate_last_line_id": line_ids[-1],
+            }
+        )
+        duration = time.perf_counter() - start
+        _logger.info(
+            "Distribution model %s: %s/%s journal items recalculated " "(%.1f items/s)",
+            self.id,
+            self.recalculate_done,
+            self.recalculate_total,
+            len(line_ids) / duration if duration else 0,
+        )
+        return True
+
+    @api.model
+    def _cron_recalculate_analytic_lines(self):
+        """Process the pending recalculations by batches committed one by
+        one, and trigger the cron again while some are left."""
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        batches = self._recalculate_cron_batches
+        for record in self.search([("recalculate_state", "=", "pending")]):
+            while batches and record._recalculate_batch():
+                batches -= 1
+                if auto_commit:
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+            if not batches:
+                self.env.ref(
+                    "account_analytic_distribution_model_recalculate."
+                    "ir_cron_recalculate_analytic_lines"
+                )._trigger()
+                break
+
     def action_recalculate_analytic_lines(self):
         """
         Recalculate the analytic lines that match the distribution model
         and where generated by himself.
+        Recalculations of more than one batch of journal items are done in
+        background.
         """
-
+        message = False
         for record in self:
-            domain = record._get_lines_domain()
-            domain.append(("distribution_model_id", "=", record.id))
-
-            domain.append(("analytic_distribution", "!=", record.analytic_distribution))
-
-            lines_to_update = self.env["account.move.line"].search(domain)
-
-            if lines_to_update:
-                lines_to_update.write(
-                    {"analytic_distribution": record.analytic_distribution}
+            record.env.cr.execute(record._get_lines_to_recalculate_query("COUNT(*)"))
+            total = record.env.cr.fetchone()[0]
+            record.write(
+                {
+                    "recalculate_state": "pending",
+                    "recalculate_total": total,
+                    "recalculate_done": 0,
+                    "recalculate_last_line_id": 0,
+                }
+            )
+            if total > self._recalculate_batch_size:
+                self.env.ref(
+                    "account_analytic_distribution_model_recalculate."
+                    "ir_cron_recalculate_analytic_lines"
+                )._trigger()
+                message = _("%s analytic lines will be recalculated in background.") % (
+                    total
                 )
-
-            message = self._get_message(len(lines_to_update))
+                continue
+            while record._recalculate_batch():
+                pass
+            message = self._get_message(record.recalculate_done)
 
         return {
             "type": "ir.actions.client",
@@ -283,20 +539,30 @@ class AccountAnalyticDistributionModel(models.Model):
         """
         Sync the jorurnal items that match the distribution model
         """
-
+        self.env["account.move.line"].flush_model(["distribution_model_id"])
         for record in self:
-            actual_lines = self.env["account.move.line"].search(
-                [
-                    ("distribution_model_id", "=", record.id),
-                ]
+            lines = record._get_lines_query(record._get_lines_domain())
+            # Only the journal items whose model changes are updated
+            self.env.cr.execute(
+                SQL(
+                    """
+                    UPDATE account_move_line SET distribution_model_id = NULL
+                    WHERE distribution_model_id = %(model_id)s
+                        AND id NOT IN (%(lines)s)
+                    """,
+                    model_id=record.id,
+                    lines=lines,
+                )
             )
-            actual_lines.write({"distribution_model_id": False})
-
-            domain = record._get_lines_domain()
-            lines = self.env["account.move.line"].search(domain)
-
-            lines.write(
-                {
-                    "distribution_model_id": record.id,
-                }
+            self.env.cr.execute(
+                SQL(
+                    """
+                    UPDATE account_move_line SET distribution_model_id = %(model_id)s
+                    WHERE id IN (%(lines)s)
+                        AND distribution_model_id IS DISTINCT FROM %(model_id)s
+                    """,
+                    model_id=record.id,
+                    lines=lines,
+                )
             )
+        self.env["account.move.line"].invalidate_model(["distribution_model_id"])
@@ -371,3 +371,82 @@ class TestDistributionModelDate(TransactionCase):
             move.line_ids[0].distribution_model_id.id, self.distribution_1.id
         )
         self.assertFalse(move.line_ids[1].distribution_model_id)
+
+    @freeze_time("2024-01-01")
+    def test_action_recalculate_analytic_lines_in_background(self):
+        self.distribution_1.analytic_distribution = False
+        self.distribution_1.account_prefix = self.financial_account.code
+        move = self.env["account.move"].create(
+            {
+                "move_type": "entry",
+                "date": datetime.now().date(),
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": "test",
+                            "account_id": self.financial_account.id,
+                            "partner_id": self.partner_a.id,
+                            "debit": debit,
+                            "credit": credit,
+                        },
+                    )
+                    for debit, credit in ((100.0, 0.0), (0.0, 100.0))
+                ],
+            }
+        )
+        move.action_post()
+        lines = move.line_ids
+        self.assertEqual(lines.distribution_model_id, self.distribution_1)
+        self.distribution_1.analytic_distribution = {self.analytic_account_1.id: 100}
+        self.patch(type(self.distribution_1), "_recalculate_batch_size", 1)
+        result = self.distribution_1.action_recalculate_analytic_lines()
+        self.assertIn("in background", result["params"]["message"])
+        self.assertEqual(self.distribution_1.recalculate_state, "pending")
+        self.assertEqual(self.distribution_1.recalculate_total, 2)
+        self.assertFalse(any(lines.mapped("analytic_distribution")))
+        self.env[
+            "account.analytic.distribution.model"
+        ]._cron_recalculate_analytic_lines()
+        self.assertEqual(self.distribution_1.recalculate_state, "done")
+        self.assertEqual(self.distribution_1.recalculate_done, 2)
+        for line in lines:
+            self.assertEqual(
+                line.analytic_distribution, self.distribution_1.analytic_distribution
+            )
+            self.assertTrue(line.analytic_line_ids)
+
+    @freeze_time("2024-01-01")
+    def test_get_distribution_compiled_index(self):
+        self.distribution_1.account_prefix = self.financial_account.code
+        model_obj = self.env["account.analytic.distribution.model"].with_context(
+            get_distributiion_model_id=True
+        )
+        vals = {
+            "product_id": False,
+            "product_categ_id": False,
+            "partner_id": self.partner_a.id,
+            "partner_category_id": [],
+            "account_prefix": self.financial_account.code,
+            "company_id": self.env.company.id,
+            "date": "2024-01-01",
+        }
+        self.assertEqual(model_obj._get_distribution(vals), self.distribution_1)
+        self.assertEqual(
+            model_obj.with_context(get_distributiion_model_id=False)._get_distribution(
+                vals
+            ),
+            self.distribution_1.analytic_distribution,
+        )
+        # Out of the dates of the model
+        self.assertFalse(model_obj._get_distribution(dict(vals, date="2024-02-01")))
+        # Not matching the prefix of the model
+        self.assertFalse(model_obj._get_distribution(dict(vals, account_prefix="X")))
+        # The index is refreshed when a model changes
+        self.distribution_1.partner_id = self.partner_b
+        self.assertFalse(model_obj._get_distribution(vals))
+        self.assertEqual(
+            model_obj._get_distribution(dict(vals, partner_id=self.partner_b.id)),
+            self.distribution_1,
+        )
@@ -5,3 +5,4 @@ from . import account_asset_profile
 from . import account_asset_line
 from . import account_asset_recompute_trigger
 from . import account_move
+from . import res_company
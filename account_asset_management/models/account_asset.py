@@ -4,6 +4,7 @@
 
 import calendar
 import logging
+import time
 from datetime import date
 from functools import reduce
 from sys import exc_info
@@ -13,6 +14,8 @@ from dateutil.relativedelta import relativedelta
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.osv import expression
+from odoo.tools import split_every
 
 _logger = logging.getLogger(__name__)
 
@@ -28,6 +31,10 @@ class AccountAsset(models.Model):
     _inherit = ["mail.thread", "mail.activity.mixin", "analytic.mixin"]
     _description = "Asset"
     _order = "date_start desc, code, name"
+    # Number of depreciation lines posted together in batch posting mode
+    _depreciation_batch_size = 500
+    # Number of assets whose depreciation lines are created together
+    _board_batch_size = 200
     _check_company_auto = True
     _rec_names_search = ["code", "name"]
 
@@ -558,23 +565,24 @@ class AccountAsset(models.Model):
             lines1[0]["depreciated_value"] = 0.0
         table[0]["lines"] = lines1 + lines2
 
-    def _compute_depreciation_line(
+    def _prepare_depreciation_lines(
         self,
         depreciated_value_posted,
         table_i_start,
         line_i_start,
         table,
-        last_line,
         posted_lines,
     ):
+        """Return the values of the depreciation lines to create from the
+        depreciation table, in date order and without `previous_id`."""
         company = self.company_id
         currency = company.currency_id
         fiscalyear_lock_date = company.fiscalyear_lock_date or fields.Date.to_date(
             "1901-01-01"
         )
 
+        vals_list = []
         seq = len(posted_lines)
-        depr_line = last_line
         last_date = table[-1]["lines"][-1]["date"]
         depreciated_value = depreciated_value_posted
         amount_to_allocate = 0.0
@@ -597,23 +605,26 @@ class AccountAsset(models.Model):
                     if self.method in ["linear-limit", "degr-limit"]:
                         amount -= self.salvage_value
                 if amount or self.carry_forward_missed_depreciations:
-                    vals = {
-                        "previous_id": depr_line.id,
-                        "amount": currency.round(amount),
-                        "asset_id": self.id,
-                        "name": name,
-                        "line_date": line["date"],
-                        "line_days": line["days"],
-                        "init_entry": fiscalyear_lock_date >= line["date"],
-                    }
+                    vals_list.append(
+                        {
+                            "amount": currency.round(amount),
+                            "asset_id": self.id,
+                            "name": name,
+                            "line_date": line["date"],
+                            "line_days": line["days"],
+                            "init_entry": fiscalyear_lock_date >= line["date"],
+                        }
+                    )
                     depreciated_value += currency.round(amount)
-                    depr_line = self.env["account.asset.line"].create(vals)
                 else:
                     seq -= 1
             line_i_start = 0
+        return vals_list
 
     def compute_depreciation_board(self):
         line_obj = self.env["account.asset.line"]
+        # Lines to create, by asset: [(last posted line, [line values])]
+        board_vals = []
 
         for asset in self:
             currency = asset.company_id.currency_id
@@ -721,14 +732,23 @@ class AccountAsset(models.Model):
                 table_i_start = 0
                 line_i_start = 0
 
-            asset._compute_depreciation_line(
-                depreciated_value_posted,
-                table_i_start,
-                line_i_start,
-                table,
-                last_line,
-                posted_lines,
+            board_vals.append(
+                (
+                    last_line,
+                    asset._prepare_depreciation_lines(
+                        depreciated_value_posted,
+                        table_i_start,
+                        line_i_start,
+                        table,
+                        posted_lines,
+                    ),
+                )
             )
+            if len(board_vals) >= self._board_batch_size:
+                line_obj._create_depreciation_lines(board_vals)
+                board_vals = []
+        if board_vals:
+            line_obj._create_depreciation_lines(board_vals)
         return True
 
     def _get_fy_duration(self, fy, option="days"):
@@ -1171,7 +1191,56 @@ class AccountAsset(models.Model):
         """use this method to customise the name of the accounting entry"""
         return (self.code or str(self.id)) + "/" + str(seq)
 
-    def _compute_entries(self, date_end, check_triggers=False):
+    @api.model
+    def _create_move_safe(self, depreciation):
+        """Create the entry of a depreciation line, returning the ids of the
+        created entries and the error message, if any."""
+        try:
+            with self.env.cr.savepoint():
+                return depreciation.create_move(), ""
+        except Exception:
+            e = exc_info()[0]
+            tb = "".join(format_exception(*exc_info()))
+            asset_ref = depreciation.asset_id.name
+            if depreciation.asset_id.code:
+                asset_ref = f"[{depreciation.asset_id.code}] {asset_ref}"
+            error_msg = _("Error while processing asset '{ref}': \n\n{tb}").format(
+                ref=asset_ref, tb=tb
+            )
+            _logger.error("%s, %s", self._name, error_msg)
+            return [], _("\nError while processing asset '{ref}': {exception}").format(
+                ref=asset_ref, exception=str(e)
+            )
+
+    @api.model
+    def _create_moves_batch(self, depreciations, batch_size):
+        """Create the entries of the depreciation lines by chunks of
+        `batch_size` lines. The lines of a failing chunk are processed again
+        one by one to isolate the lines in error."""
+        result = []
+        error_log = ""
+        line_obj = self.env["account.asset.line"]
+        for chunk_ids in split_every(batch_size, depreciations.ids):
+            chunk = line_obj.browse(chunk_ids)
+            try:
+                with self.env.cr.savepoint():
+                    result += chunk.create_move_batch()
+            except Exception:
+                _logger.info(
+                    "Batch of %s depreciation lines failed, retrying line by line",
+                    len(chunk),
+                )
+                for depreciation in chunk:
+                    move_ids, error = self._create_move_safe(depreciation)
+                    result += move_ids
+                    error_log += error
+            self.env.invalidate_all()
+        return result, error_log
+
+    def _compute_entries(self, date_end, check_triggers=False, batch_size=0):
+        """Create the depreciation entries up to `date_end`. With a
+        `batch_size`, the entries are created and posted by chunks of lines
+        (see `_create_moves_batch`) instead of one by one."""
         # TODO : add ir_cron job calling this method to
         # generate periodical accounting entries
         result = []
@@ -1180,10 +1249,11 @@ class AccountAsset(models.Model):
             recompute_obj = self.env["account.asset.recompute.trigger"]
             recomputes = recompute_obj.sudo().search([("state", "=", "open")])
             if recomputes:
-                trigger_companies = recomputes.mapped("company_id")
-                for asset in self:
-                    if asset.company_id.id in trigger_companies.ids:
-                        asset.compute_depreciation_board()
+                domain = expression.OR(
+                    [trigger._get_asset_domain() for trigger in recomputes]
+                )
+                assets = self.search(expression.AND([[("id", "in", self.ids)], domain]))
+                assets.compute_depreciation_board()
 
         depreciations = self.env["account.asset.line"].search(
             [
@@ -1195,23 +1265,23 @@ class AccountAsset(models.Model):
             ],
             order="line_date",
         )
-        for depreciation in depreciations:
-            try:
-                with self.env.cr.savepoint():
-                    result += depreciation.create_move()
-            except Exception:
-                e = exc_info()[0]
-                tb = "".join(format_exception(*exc_info()))
-                asset_ref = depreciation.asset_id.name
-                if depreciation.asset_id.code:
-                    asset_ref = f"[{depreciation.asset_id.code}] {asset_ref}"
-                error_log += _(
-                    "\nError while processing asset '{ref}': {exception}"
-                ).format(ref=asset_ref, exception=str(e))
-                error_msg = _("Error while processing asset '{ref}': \n\n{tb}").format(
-                    ref=asset_ref, tb=tb
-                )
-                _logger.error("%s, %s", self._name, error_msg)
+        start = time.perf_counter()
+        if batch_size:
+            result, error_log = self._create_moves_batch(depreciations, batch_size)
+        else:
+            for depreciation in depreciations:
+                move_ids, error = self._create_move_safe(depreciation)
+                result += move_ids
+                error_log += error
+        duration = time.perf_counter() - start
+        asset_count = len(depreciations.asset_id)
+        _logger.info(
+            "%s depreciation entries of %s assets created in %.2fs (%.1f assets/s)",
+            len(result),
+            asset_count,
+            duration,
+            asset_count / duration if duration else 0.0,
+        )
 
         if check_triggers and recomputes:
             companies = recomputes.mapped("company_id")
@@ -2,7 +2,9 @@
 # Copyright 2021 Tecnativa - João Marques
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import _, api, fields, models
+from collections import defaultdict
+
+from odoo import Command, _, api, fields, models
 from odoo.exceptions import UserError
 
 
@@ -92,13 +94,10 @@ class AccountAssetLine(models.Model):
         all_excluded_lines.depreciated_value = 0
         all_excluded_lines.remaining_value = 0
         # Group depreciation lines per asset
-        asset_ids = dlines.mapped("asset_id")
-        grouped_dlines = []
-        for asset in asset_ids:
-            grouped_dlines.append(
-                dlines.filtered(lambda line, asset=asset: line.asset_id.id == asset.id)
-            )
-        for dlines in grouped_dlines:
+        grouped_dlines = defaultdict(list)
+        for dl in dlines:
+            grouped_dlines[dl.asset_id.id].append(dl)
+        for dlines in grouped_dlines.values():
             for i, dl in enumerate(dlines):
                 if i == 0:
                     depreciation_base = dl.depreciation_base
@@ -123,6 +122,42 @@ class AccountAssetLine(models.Model):
                 self.depreciation_base - self.depreciated_value - self.amount
             )
 
+    @api.model
+    def _create_depreciation_lines(self, board_vals):
+        """Create the depreciation lines of many assets at once.
+
+        :param board_vals: list of `(previous_line, vals_list)` by asset, where
+            `vals_list` are the values of the lines of the asset in date order
+            and `previous_line` the line preceding the first one, if any.
+        :return: the created lines
+
+        The lines are created with a single `create` and chained afterwards,
+        as each line needs the id of the previous one.
+        """
+        lines = self.create(
+            [vals for __, vals_list in board_vals for vals in vals_list]
+        )
+        previous_ids = []
+        line_ids = iter(lines.ids)
+        for previous_line, vals_list in board_vals:
+            previous_id = previous_line.id or None
+            for _vals in vals_list:
+                previous_ids.append(previous_id)
+                previous_id = next(line_ids)
+        if lines:
+            self.env.cr.execute(
+                """
+                UPDATE account_asset_line AS aal SET previous_id = v.previous_id
+                FROM unnest(%s::int[], %s::int[]) AS v(id, previous_id)
+                WHERE aal.id = v.id
+                """,
+                (lines.ids, previous_ids),
+            )
+            lines.invalidate_recordset(["previous_id"])
+            self.env.add_to_compute(self._fields["depreciated_value"], lines)
+            self.env.add_to_compute(self._fields["remaining_value"], lines)
+        return lines
+
     def write(self, vals):
         for dl in self:
             line_date = vals.get("line_date") or dl.line_date
@@ -255,9 +290,33 @@ class AccountAssetLine(models.Model):
         }
         return move_line_data
 
+    def _prepare_move_vals(self):
+        """Return the values of the depreciation entry of the line, with its
+        journal items."""
+        self.ensure_one()
+        profile = self.asset_id.profile_id
+        depreciation_date = self.line_date
+        move_vals = self._setup_move_data(depreciation_date)
+        move_vals["line_ids"] = []
+        for account, ml_type in (
+            (profile.account_depreciation_id, "depreciation"),
+            (profile.account_expense_depreciation_id, "expense"),
+        ):
+            aml_vals = self._setup_move_line_data(
+                depreciation_date, account, ml_type, self.env["account.move"]
+            )
+            aml_vals.pop("move_id")
+            move_vals["line_ids"].append(Command.create(aml_vals))
+        return move_vals
+
+    def _close_depreciated_assets(self):
+        """Close the assets of the lines that are fully depreciated."""
+        for asset in self.asset_id:
+            if asset.currency_id.is_zero(asset.value_residual):
+                asset.state = "close"
+
     def create_move(self):
         created_move_ids = []
-        asset_ids = set()
         ctx = dict(self.env.context, allow_asset=True, check_move_validity=False)
         for line in self:
             asset = line.asset_id
@@ -277,13 +336,26 @@ class AccountAssetLine(models.Model):
             move.action_post()
             line.with_context(allow_asset_line_update=True).write({"move_id": move.id})
             created_move_ids.append(move.id)
-            asset_ids.add(asset.id)
         # we re-evaluate the assets to determine if we can close them
-        for asset in self.env["account.asset"].browse(list(asset_ids)):
-            if asset.currency_id.is_zero(asset.value_residual):
-                asset.state = "close"
+        self._close_depreciated_assets()
         return created_move_ids
 
+    def create_move_batch(self):
+        """Same as `create_move` for many lines at once: the entries are
+        created with a single `create`, posted together and then linked to
+        their lines."""
+        ctx = dict(self.env.context, allow_asset=True, check_move_validity=False)
+        moves = (
+            self.env["account.move"]
+            .with_context(**ctx)
+            .create([line._prepare_move_vals() for line in self])
+        )
+        moves.action_post()
+        for line, move in zip(self, moves):
+            line.with_context(allow_asset_line_update=True).move_id = move
+        self._close_depreciated_assets()
+        return moves.ids
+
     def open_move(self):
         self.ensure_one()
         return {
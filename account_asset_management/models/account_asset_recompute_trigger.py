@@ -1,7 +1,7 @@
 # Copyright 2009-2018 Noviat
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class AccountAssetRecomputeTrigger(models.Model):
@@ -21,3 +21,48 @@ class AccountAssetRecomputeTrigger(models.Model):
         default="open",
         readonly=True,
     )
+    date_from = fields.Date(
+        readonly=True,
+        help="Start of the period impacted by the event. The unposted "
+        "depreciation lines from this date are recomputed. Leave empty to "
+        "recompute the depreciation boards from the last posted entry.",
+    )
+    date_to = fields.Date(
+        readonly=True,
+        help="End of the period impacted by the event. Assets starting after "
+        "this date are not recomputed.",
+    )
+
+    @api.model
+    def _create_trigger(self, company, reason, date_from=False, date_to=False):
+        return self.sudo().create(
+            {
+                "reason": reason,
+                "company_id": company.id,
+                "date_trigger": fields.Datetime.now(),
+                "date_from": date_from,
+                "date_to": date_to,
+            }
+        )
+
+    def _get_asset_domain(self):
+        """Domain of the assets whose depreciation board is impacted by the
+        trigger: assets of the company with unposted depreciation lines in or
+        after the impacted period."""
+        self.ensure_one()
+        domain = [("company_id", "=", self.company_id.id)]
+        if self.date_to:
+            domain.append(("date_start", "<=", self.date_to))
+        if self.date_from:
+            domain.append(
+                (
+                    "depreciation_line_ids",
+                    "any",
+                    [
+                        ("type", "=", "depreciate"),
+                        ("move_check", "=", False),
+                        ("line_date", ">=", self.date_from),
+                    ],
+                )
+            )
+        return domain
@@ -0,0 +1,32 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import _, fields, models
+
+
+class ResCompany(models.Model):
+    _inherit = "res.company"
+
+    def _get_asset_fy_dates(self, date):
+        fy_dates = self.compute_fiscalyear_dates(date)
+        return fy_dates["date_from"], fy_dates["date_to"]
+
+    def write(self, vals):
+        fy_fields = {"fiscalyear_last_day", "fiscalyear_last_month"}
+        if not fy_fields & set(vals):
+            return super().write(vals)
+        today = fields.Date.context_today(self)
+        fy_dates = {company: company._get_asset_fy_dates(today) for company in self}
+        res = super().write(vals)
+        trigger_obj = self.env["account.asset.recompute.trigger"]
+        for company, old_dates in fy_dates.items():
+            new_dates = company._get_asset_fy_dates(today)
+            if new_dates == old_dates:
+                continue
+            # The boards are impacted from the current fiscal year on
+            trigger_obj._create_trigger(
+                company,
+                _("Fiscal year end changed"),
+                date_from=min(old_dates[0], new_dates[0]),
+            )
+        return res
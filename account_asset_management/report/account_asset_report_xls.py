@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 import logging
+from collections import defaultdict
 
 from odoo import _, models
 from odoo.exceptions import UserError
@@ -21,6 +22,7 @@ class AssetReportXlsx(models.AbstractModel):
     _name = "report.account_asset_management.asset_report_xls"
     _description = "Dynamic XLS asset report generator"
     _inherit = "report.report_xlsx.abstract"
+    _xlsx_stream = True
 
     def _get_ws_params(self, wb, data, wiz):
         self._get_assets(wiz, data)
@@ -419,9 +421,85 @@ class AssetReportXlsx(models.AbstractModel):
             {
                 "assets": assets,
                 "grouped_assets": grouped_assets,
+                "asset_values": self._get_asset_values(wiz, assets),
             }
         )
 
+    def _get_asset_values(self, wiz, assets):
+        """Return the depreciation figures of `assets` read with one query
+        on the depreciation lines, as a dict by asset id with:
+        - line_count: number of depreciation lines
+        - depreciated_start: amount depreciated at the start of the period
+        - depreciated_end: amount depreciated at the end of the period
+        """
+        res = {
+            asset_id: {
+                "line_count": 0,
+                "depreciated_start": 0.0,
+                "depreciated_end": 0.0,
+            }
+            for asset_id in assets.ids
+        }
+        if not assets:
+            return res
+        self.env["account.asset.line"].flush_model(
+            ["asset_id", "type", "line_date", "amount", "depreciated_value"]
+        )
+        self.env.cr.execute(
+            """
+            SELECT asset_id, COUNT(*),
+                (ARRAY_AGG(depreciated_value + amount ORDER BY line_date DESC, id DESC)
+                    FILTER (WHERE line_date <= %(date_from)s))[1],
+                (ARRAY_AGG(depreciated_value + amount ORDER BY line_date DESC, id DESC)
+                    FILTER (WHERE line_date <= %(date_to)s))[1]
+            FROM account_asset_line
+            WHERE type = 'depreciate' AND asset_id IN %(asset_ids)s
+            GROUP BY asset_id
+            """,
+            {
+                "date_from": wiz.date_from,
+                "date_to": wiz.date_to,
+                "asset_ids": tuple(assets.ids),
+            },
+        )
+        for (
+            asset_id,
+            count,
+            depreciated_start,
+            depreciated_end,
+        ) in self.env.cr.fetchall():
+            res[asset_id].update(
+                {
+                    "line_count": count,
+                    "depreciated_start": depreciated_start or 0.0,
+                    "depreciated_end": depreciated_end or 0.0,
+                }
+            )
+        return res
+
+    def _get_group_asset_ids(self, assets):
+        """Return the ids of `assets` by asset group id, in report order."""
+        res = defaultdict(list)
+        if not assets:
+            return res
+        self.env["account.asset"].flush_model(["group_ids"])
+        self.env.cr.execute(
+            "SELECT asset_id, group_id FROM account_asset_group_rel "
+            "WHERE asset_id IN %s",
+            (tuple(assets.ids),),
+        )
+        asset_groups = defaultdict(list)
+        for asset_id, group_id in self.env.cr.fetchall():
+            asset_groups[asset_id].append(group_id)
+        for asset in self._sort_assets(assets):
+            for group_id in asset_groups[asset.id]:
+                res[group_id].append(asset.id)
+        return res
+
+    @staticmethod
+    def _sort_assets(assets):
+        return assets.sorted(lambda r: (r.date_start or "", r.code or "", r.name))
+
     @staticmethod
     def acquisition_filter(wiz, asset):
         return asset.date_start >= wiz.date_from
@@ -438,44 +516,63 @@ class AssetReportXlsx(models.AbstractModel):
             and asset.date_remove <= wiz.date_to
         )
 
-    def _group_assets(self, assets, group, grouped_assets):
+    def _group_assets(self, assets, group, grouped_assets, group_asset_ids=None):
+        if group_asset_ids is None:
+            group_asset_ids = self._get_group_asset_ids(assets)
         if group:
-            group_assets = assets.filtered(lambda r: group in r.group_ids)
+            group_assets = assets.browse(group_asset_ids[group.id]).with_prefetch(
+                assets._prefetch_ids
+            )
         else:
-            group_assets = assets
-        group_assets = group_assets.sorted(
-            lambda r: (r.date_start or "", r.code or "", r.name)
-        )
+            group_assets = self._sort_assets(assets)
         grouped_assets[group] = {"assets": group_assets}
         for child in group.child_ids:
-            self._group_assets(assets, child, grouped_assets[group])
+            self._group_assets(assets, child, grouped_assets[group], group_asset_ids)
+
+    def _get_groups_with_assets(self, wiz, asset_filter, group, group_val, res):
+        """Add to the set `res` the groups of the tree of `group` with assets
+        to report, and return whether `group` has any."""
+        has_assets = any(asset_filter(wiz, asset) for asset in group_val["assets"])
+        for child in group.child_ids:
+            if self._get_groups_with_assets(
+                wiz, asset_filter, child, group_val[child], res
+            ):
+                has_assets = True
+        if has_assets:
+            res.add(group)
+        return has_assets
 
     def _create_report_entries(
-        self, ws_params, wiz, entries, group, group_val, error_dict
+        self,
+        ws_params,
+        wiz,
+        entries,
+        group,
+        group_val,
+        error_dict,
+        asset_values=None,
+        groups_with_assets=None,
     ):
         report = ws_params["report_type"]
+        filt = getattr(self, f"{report}_filter")
 
-        def asset_filter(asset):
-            filt = getattr(self, f"{report}_filter")
-            return filt(wiz, asset)
-
-        def _has_assets(group, group_val):
-            assets = group_val.get("assets")
-            assets = assets.filtered(asset_filter)
-            if assets:
-                return True
-            for child in group.child_ids:
-                if _has_assets(child, group_val[child]):
-                    return True
-            return False
-
-        assets = group_val.get("assets")
-        assets = assets.filtered(asset_filter)
-
+        if groups_with_assets is None:
+            groups_with_assets = set()
+            self._get_groups_with_assets(
+                wiz, filt, group, group_val, groups_with_assets
+            )
         # remove empty entries
-        if not _has_assets(group, group_val):
+        if group not in groups_with_assets:
             return
 
+        assets = group_val.get("assets")
+        assets = assets.filtered(lambda asset: filt(wiz, asset))
+        if asset_values is None:
+            asset_values = {}
+        missing_assets = assets.filtered(lambda asset: asset.id not in asset_values)
+        if missing_assets:
+            asset_values.update(self._get_asset_values(wiz, missing_assets))
+
         asset_entries = []
         group_entry = {
             "_purchase_value": 0.0,
@@ -490,45 +587,32 @@ class AssetReportXlsx(models.AbstractModel):
             group_entry["_purchase_value"] += asset.purchase_value
             group_entry["_depreciation_base"] += asset.depreciation_base
             group_entry["_salvage_value"] += asset.salvage_value
-            dls_all = asset.depreciation_line_ids.filtered(
-                lambda r: r.type == "depreciate"
-            )
-            dls_all = dls_all.sorted(key=lambda r: r.line_date)
-            if not dls_all and asset.method_number:
+            values = asset_values[asset.id]
+            if not values["line_count"] and asset.method_number:
                 error_dict["no_table"] += asset
-            # period_start_value
-            dls = dls_all.filtered(lambda r: r.line_date <= wiz.date_from)
-            if dls:
-                value_depreciated = dls[-1].depreciated_value + dls[-1].amount
-            else:
-                value_depreciated = 0.0
             asset_entry["_period_start_value"] = (
-                asset.depreciation_base - value_depreciated
+                asset.depreciation_base - values["depreciated_start"]
             )
             group_entry["_period_start_value"] += asset_entry["_period_start_value"]
-            # period_end_value
-            dls = dls_all.filtered(lambda r: r.line_date <= wiz.date_to)
-            if dls:
-                value_depreciated = dls[-1].depreciated_value + dls[-1].amount
-            else:
-                value_depreciated = 0.0
             asset_entry["_period_end_value"] = (
-                asset.depreciation_base - value_depreciated
+                asset.depreciation_base - values["depreciated_end"]
             )
             group_entry["_period_end_value"] += asset_entry["_period_end_value"]
 
             asset_entries.append(asset_entry)
 
-        todos = []
-        for g in group.child_ids:
-            if _has_assets(g, group_val[g]):
-                todos.append(g)
-
         entries.append(group_entry)
         entries.extend(asset_entries)
-        for todo in todos:
+        for child in group.child_ids:
             self._create_report_entries(
-                ws_params, wiz, entries, todo, group_val[todo], error_dict
+                ws_params,
+                wiz,
+                entries,
+                child,
+                group_val[child],
+                error_dict,
+                asset_values=asset_values,
+                groups_with_assets=groups_with_assets,
             )
 
     def _asset_report(self, workbook, ws, ws_params, data, wiz):
@@ -592,26 +676,30 @@ class AssetReportXlsx(models.AbstractModel):
             "dups": self.env["account.asset"],
         }
 
-        self._create_report_entries(ws_params, wiz, entries, root, root_val, error_dict)
+        self._create_report_entries(
+            ws_params,
+            wiz,
+            entries,
+            root,
+            root_val,
+            error_dict,
+            asset_values=data.get("asset_values"),
+        )
 
         # traverse entries in reverse order to calc totals
-        for i, entry in enumerate(reversed(entries)):
+        group_entries = {entry["group"]: entry for entry in entries if "group" in entry}
+        for entry in reversed(entries):
             if "group" in entry:
                 parent = entry["group"].parent_id
-                for parent_entry in reversed(entries[: -i - 1]):
-                    if "group" in parent_entry and parent_entry["group"] == parent:
-                        parent_entry["_purchase_value"] += entry["_purchase_value"]
-                        parent_entry["_depreciation_base"] += entry[
-                            "_depreciation_base"
-                        ]
-                        parent_entry["_salvage_value"] += entry["_salvage_value"]
-                        parent_entry["_period_start_value"] += entry[
-                            "_period_start_value"
-                        ]
-                        parent_entry["_period_end_value"] += entry["_period_end_value"]
-                        continue
-
-        processed = []
+                parent_entry = parent and group_entries.get(parent)
+                if parent_entry:
+                    parent_entry["_purchase_value"] += entry["_purchase_value"]
+                    parent_entry["_depreciation_base"] += entry["_depreciation_base"]
+                    parent_entry["_salvage_value"] += entry["_salvage_value"]
+                    parent_entry["_period_start_value"] += entry["_period_start_value"]
+                    parent_entry["_period_end_value"] += entry["_period_end_value"]
+
+        processed = set()
         for entry in entries:
             period_start_value_cell = period_start_value_pos and self._rowcol_to_cell(
                 row_pos, period_start_value_pos
@@ -646,11 +734,11 @@ class AssetReportXlsx(models.AbstractModel):
 
             else:
                 asset = entry["asset"]
-                if asset in processed:
+                if asset.id in processed:
                     error_dict["dups"] += asset
                     continue
                 else:
-                    processed.append(asset)
+                    processed.add(asset.id)
                 row_pos = self._write_line(
                     ws,
                     row_pos,
@@ -979,3 +979,103 @@ class TestAssetManagement(AccountTestInvoicingCommon):
             }
         )
         self.assertEqual(asset.salvage_value, 5)
+
+    def test_22_batch_posting(self):
+        """Depreciation entries created and posted by batches."""
+        assets = self.asset_model
+        for i in range(3):
+            assets |= self.asset_model.create(
+                {
+                    "name": f"Laptop {i}",
+                    "code": f"PI0020{i}",
+                    "purchase_value": 1500.0,
+                    "profile_id": self.ict3Y.id,
+                    "date_start": time.strftime("%Y-01-01"),
+                }
+            )
+        assets.compute_depreciation_board()
+        assets.validate()
+        created_move_ids, error_log = assets._compute_entries(
+            date(date.today().year, 12, 31), batch_size=2
+        )
+        self.assertFalse(error_log)
+        self.assertEqual(len(created_move_ids), 3)
+        moves = self.env["account.move"].browse(created_move_ids)
+        self.assertEqual(set(moves.mapped("state")), {"posted"})
+        for asset in assets:
+            line = asset.depreciation_line_ids.filtered("move_check")
+            self.assertEqual(len(line), 1)
+            self.assertEqual(line.move_id.amount_total, 500)
+            self.assertEqual(asset.value_depreciated, 500)
+            self.assertEqual(asset.value_residual, 1000)
+
+    def test_23_bulk_depreciation_board(self):
+        """Depreciation boards of many assets created at once."""
+        assets = self.asset_model
+        for i in range(3):
+            assets |= self.asset_model.create(
+                {
+                    "name": f"Car {i}",
+                    "purchase_value": 12000.0 + i * 1000,
+                    "salvage_value": 2000.0,
+                    "profile_id": self.car5y.id,
+                    "date_start": time.strftime("%Y-01-01"),
+                }
+            )
+        assets.compute_depreciation_board()
+        assets.invalidate_model()
+        for asset in assets:
+            lines = asset.depreciation_line_ids.filtered(
+                lambda line: line.type == "depreciate"
+            )
+            self.assertEqual(len(lines), 5)
+            self.assertFalse(lines[0].previous_id)
+            previous = lines[0]
+            for line in lines[1:]:
+                self.assertEqual(line.previous_id, previous)
+                previous = line
+            self.assertEqual(lines[-1].remaining_value, 0)
+            self.assertEqual(
+                lines[-1].depreciated_value + lines[-1].amount,
+                asset.depreciation_base,
+            )
+
+    def test_24_recompute_trigger_date_range(self):
+        """Only the boards impacted by the period of a trigger are recomputed."""
+        this_year = date.today().year
+        old_asset = self.asset_model.create(
+            {
+                "name": "Old laptop",
+                "purchase_value": 1500.0,
+                "profile_id": self.ict3Y.id,
+                "date_start": date(this_year - 5, 1, 1),
+            }
+        )
+        new_asset = self.asset_model.create(
+            {
+                "name": "New laptop",
+                "purchase_value": 1500.0,
+                "profile_id": self.ict3Y.id,
+                "date_start": date(this_year, 1, 1),
+            }
+        )
+        assets = old_asset | new_asset
+        assets.compute_depreciation_board()
+        assets.validate()
+        old_lines = old_asset.depreciation_line_ids
+        new_lines = new_asset.depreciation_line_ids
+        trigger = self.env["account.asset.recompute.trigger"]._create_trigger(
+            self.env.company, "Test", date_from=date(this_year, 1, 1)
+        )
+        assets._compute_entries(date(this_year - 10, 1, 1), check_triggers=True)
+        self.assertEqual(trigger.state, "done")
+        self.assertEqual(old_asset.depreciation_line_ids, old_lines)
+        self.assertNotEqual(new_asset.depreciation_line_ids, new_lines)
+        self.assertEqual(
+            len(
+                new_asset.depreciation_line_ids.filtered(
+                    lambda line: line.type == "create"
+                )
+            ),
+            1,
+        )
@@ -49,7 +49,9 @@ class TestAssetManagementXls(AccountTestInvoicingCommon):
                 "method_period": "year",
             }
         )
-        cls.env["account.asset"].create(
+        cls.group_fa = group_fa
+        cls.group_tfa = group_tfa
+        cls.asset = cls.env["account.asset"].create(
             {
                 "state": "draft",
                 "method_time": "year",
@@ -61,7 +63,8 @@ class TestAssetManagementXls(AccountTestInvoicingCommon):
                 "profile_id": ict3Y.id,
                 "date_start": time.strftime("%Y-01-01"),
             }
-        ).validate()
+        )
+        cls.asset.validate()
         fy_dates = cls.company.compute_fiscalyear_dates(fields.date.today())
 
         wiz_vals = {
@@ -86,3 +89,26 @@ class TestAssetManagementXls(AccountTestInvoicingCommon):
             active_model=self.xls_report._name, **self.report_action["context"]
         )
         model.create_xlsx_report(self.xls_report.ids, data=self.report_action["data"])
+
+    def test_02_asset_values(self):
+        """Depreciation figures and groups of the assets read in batch"""
+        model = self.env["report.%s" % self.xls_report_name]
+        data = {}
+        model._get_assets(self.xls_report, data)
+        self.assertIn(self.asset, data["assets"])
+        self.assertEqual(
+            data["grouped_assets"][self.group_fa]["assets"], self.asset.browse()
+        )
+        self.assertEqual(
+            data["grouped_assets"][self.group_fa][self.group_tfa]["assets"], self.asset
+        )
+        lines = self.asset.depreciation_line_ids.filtered(
+            lambda r: r.type == "depreciate"
+        )
+        line_end = lines.filtered(lambda r: r.line_date <= self.xls_report.date_to)[-1]
+        values = data["asset_values"][self.asset.id]
+        self.assertEqual(values["line_count"], len(lines))
+        self.assertEqual(values["depreciated_start"], 0.0)
+        self.assertEqual(
+            values["depreciated_end"], line_end.depreciated_value + line_end.amount
+        )
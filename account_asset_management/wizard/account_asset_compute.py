@@ -15,12 +15,18 @@ class AccountAssetCompute(models.TransientModel):
         help="All depreciation lines prior to this date will be automatically"
         " posted",
     )
+    batch_posting = fields.Boolean(
+        default=True,
+        help="Create and post the depreciation entries by batches instead of "
+        "one by one. The lines of a failing batch are processed one by one.",
+    )
     note = fields.Text()
 
     def asset_compute(self):
         assets = self.env["account.asset"].search([("state", "=", "open")])
+        batch_size = self.batch_posting and assets._depreciation_batch_size or 0
         created_move_ids, error_log = assets._compute_entries(
-            self.date_end, check_triggers=True
+            self.date_end, check_triggers=True, batch_size=batch_size
         )
 
         if error_log:
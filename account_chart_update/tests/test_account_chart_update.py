@@ -218,3 +218,31 @@ class TestAccountChartUpdate(TestAccountChartUpdateCommon):
         self.assertEqual(wizard.updated_accounts, 1)
         self.assertEqual(new_account.code, wizard.padded_code(account_data_0["code"]))
         wizard.unlink()
+
+    def test_chart_update_matching_index(self):
+        wizard = self.wizard_obj.create(self.wizard_vals).with_context(
+            chart_update_indexes={}
+        )
+        tax = self.env["account.tax"].search(
+            [("company_id", "=", self.company.id)], limit=1
+        )
+        index = wizard._get_matching_index("account.tax", "name")
+        self.assertIn(tax.id, index[(tax.name, tax.type_tax_use)])
+        self.assertNotIn(tax.name, index)
+        xml_id = self._get_model_data(tax)[:1].name.split("_", 1)[1]
+        data = {"name": "Not existing tax", "type_tax_use": tax.type_tax_use}
+        self.assertEqual(wizard._find_record_matching("account.tax", xml_id, data), tax)
+        # The indexes are kept until the next action, also in other contexts
+        new_tax = tax.copy()
+        key = (new_tax.name, new_tax.type_tax_use)
+        self.assertNotIn(
+            new_tax.id,
+            wizard.with_context(lang="en_US")
+            ._get_matching_index("account.tax", "name")
+            .get(key, ()),
+        )
+        other_wizard = wizard.with_context(chart_update_indexes={})
+        self.assertIn(
+            new_tax.id, other_wizard._get_matching_index("account.tax", "name")[key]
+        )
+        wizard.unlink()
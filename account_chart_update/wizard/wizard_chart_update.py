@@ -11,12 +11,21 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 import logging
+import time
+from contextlib import contextmanager
 
 from odoo import _, api, fields, models, tools
 
 _logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def _log_duration(description):
+    start = time.perf_counter()
+    yield
+    _logger.info("%s done in %.2fs", description, time.perf_counter() - start)
+
+
 class WizardUpdateChartsAccounts(models.TransientModel):
     _name = "wizard.update.charts.accounts"
     _description = "Wizard Update Charts Accounts"
@@ -414,40 +423,59 @@ class WizardUpdateChartsAccounts(models.TransientModel):
 
     def action_find_records(self):
         """Searchs for records to update/create and shows them."""
+        if "chart_update_indexes" not in self.env.context:
+            # The indexes of the company records are built once by action
+            return self.with_context(chart_update_indexes={}).action_find_records()
         self.env.registry.clear_cache()
-        t_data = self._get_chart_template_data()
+        company_name = self.company_id.display_name
+        with _log_duration(f"Chart template data of {company_name}"):
+            t_data = self._get_chart_template_data()
         # Search for, and load, the records to create/update.
         if self.update_account_group:
-            self._find_account_groups(t_data["account.group"])
+            with _log_duration(f"Account groups search of {company_name}"):
+                self._find_account_groups(t_data["account.group"])
         if self.update_account:
-            self._find_accounts(t_data["account.account"])
+            with _log_duration(f"Accounts search of {company_name}"):
+                self._find_accounts(t_data["account.account"])
         if self.update_tax_group:
-            self._find_tax_groups(t_data["account.tax.group"])
+            with _log_duration(f"Tax groups search of {company_name}"):
+                self._find_tax_groups(t_data["account.tax.group"])
         if self.update_tax:
-            self._find_taxes(t_data["account.tax"])
+            with _log_duration(f"Taxes search of {company_name}"):
+                self._find_taxes(t_data["account.tax"])
         if self.update_fiscal_position:
-            self._find_fiscal_positions(t_data["account.fiscal.position"])
+            with _log_duration(f"Fiscal positions search of {company_name}"):
+                self._find_fiscal_positions(t_data["account.fiscal.position"])
         # Write the results, and go to the next step.
         self.state = "ready"
         return self._reopen()
 
     def action_update_records(self):
         """Action that creates/updates/deletes the selected elements."""
+        if "chart_update_indexes" not in self.env.context:
+            return self.with_context(chart_update_indexes={}).action_update_records()
         self.rejected_new_account_number = 0
         self.rejected_updated_account_number = 0
         self.log = False
-        t_data = self._get_chart_template_data()
+        company_name = self.company_id.display_name
+        with _log_duration(f"Chart template data of {company_name}"):
+            t_data = self._get_chart_template_data()
         # Create or update the records.
         if self.update_account_group:
-            self._update_account_groups(t_data["account.group"])
+            with _log_duration(f"Account groups update of {company_name}"):
+                self._update_account_groups(t_data["account.group"])
         if self.update_account:
-            self._update_accounts(t_data["account.account"])
+            with _log_duration(f"Accounts update of {company_name}"):
+                self._update_accounts(t_data["account.account"])
         if self.update_tax_group:
-            self._update_tax_groups(t_data["account.tax.group"])
+            with _log_duration(f"Tax groups update of {company_name}"):
+                self._update_tax_groups(t_data["account.tax.group"])
         if self.update_tax:
-            self._update_taxes(t_data["account.tax"])
+            with _log_duration(f"Taxes update of {company_name}"):
+                self._update_taxes(t_data["account.tax"])
         if self.update_fiscal_position:
-            self._update_fiscal_positions(t_data["account.fiscal.position"])
+            with _log_duration(f"Fiscal positions update of {company_name}"):
+                self._update_fiscal_positions(t_data["account.fiscal.position"])
         # Store new chart in the company
         self.company_id.chart_template = self.chart_template
         # Store the data and go to the next step.
@@ -505,31 +533,18 @@ class WizardUpdateChartsAccounts(models.TransientModel):
         """
         result = dict()
         ignore = self.fields_to_ignore(real._name)
-        field_mapping = {
-            "account.tax": self.tax_field_ids,
-            "account.account": self.account_field_ids,
-            "account.group": self.account_group_field_ids,
-            "account.fiscal.position": self.fp_field_ids,
-        }
-        langs = self.env["res.lang"].search([])
-        # If the fields to be queried are not mapped, use all of them
-        # (example: account.tax.repartition.line).
-        if real._name not in field_mapping:
-            field_mapping[real._name] = self.env["ir.model.fields"].search(
-                self._domain_per_name(real._name)
-            )
-        fields_by_key = {x.name: x for x in field_mapping[real._name]}
-        to_include = field_mapping[real._name].mapped("name")
+        field_specs = self._get_diff_field_specs(real._name)
+        lang_codes = [code for code, __ in self.env["res.lang"].get_installed()]
         for key in record_values.keys():
-            if key in ignore or key not in to_include or not record_values.get(key):
+            if key in ignore or key not in field_specs or not record_values.get(key):
                 continue
-            field = fields_by_key[key]
+            ttype, translate = field_specs[key]
             record_value, real_value = record_values[key], real[key]
             if real._name == "account.account" and key == "code":
                 record_value = self.padded_code(record_value)
                 real_value = self.padded_code(real_value)
             # Field ttype conditions
-            if field.ttype == "many2many":
+            if ttype == "many2many":
                 if isinstance(record_value, str):
                     real_xml_ids = []
                     for child_item in real_value:
@@ -544,7 +559,7 @@ class WizardUpdateChartsAccounts(models.TransientModel):
                     if record_value_compare.sort() != real_value.ids.sort():
                         result[key] = record_value
                 continue
-            elif field.ttype == "many2one":
+            elif ttype == "many2one":
                 real_xml_id = self._get_external_id(real_value) if real_value else False
                 full_xml_id = (
                     f"account.{self.company_id.id}_{record_value}"
@@ -554,7 +569,7 @@ class WizardUpdateChartsAccounts(models.TransientModel):
                 if real_xml_id != full_xml_id:
                     result[key] = record_value
                 continue
-            elif field.ttype == "one2many":
+            elif ttype == "one2many":
                 if len(record_value) != len(real_value):
                     result[key] = [(5, 0, 0)] + record_value
                 else:
@@ -572,12 +587,12 @@ class WizardUpdateChartsAccounts(models.TransientModel):
                             break
                 continue
             # Define correct value if field is translatable
-            if field.translate:
-                for lang in langs:
-                    short_lang = lang.code.split("_")[0]
+            if translate:
+                for lang_code in lang_codes:
+                    short_lang = lang_code.split("_")[0]
                     key_lang = f"{key}@{short_lang}"
                     if key_lang in record_values:
-                        real_value_lang = real.with_context(lang=lang.code)[key]
+                        real_value_lang = real.with_context(lang=lang_code)[key]
                         record_value_lang = record_values[key_lang]
                         if record_value_lang != real_value_lang:
                             result[key_lang] = record_value_lang
@@ -591,6 +606,31 @@ class WizardUpdateChartsAccounts(models.TransientModel):
                 ]
         return result
 
+    def _get_diff_field_specs(self, model_name):
+        """Return the type and translatability of the fields compared by
+        `diff_fields` for the model, by field name."""
+        indexes = self._get_indexes()
+        if ("fields", model_name) in indexes:
+            return indexes[("fields", model_name)]
+        field_mapping = {
+            "account.tax": self.tax_field_ids,
+            "account.account": self.account_field_ids,
+            "account.group": self.account_group_field_ids,
+            "account.fiscal.position": self.fp_field_ids,
+        }
+        # If the fields to be queried are not mapped, use all of them
+        # (example: account.tax.repartition.line).
+        if model_name in field_mapping:
+            model_fields = field_mapping[model_name]
+        else:
+            model_fields = self.env["ir.model.fields"].search(
+                self._domain_per_name(model_name)
+            )
+        indexes[("fields", model_name)] = {
+            field.name: (field.ttype, field.translate) for field in model_fields
+        }
+        return indexes[("fields", model_name)]
+
     @api.model
     def diff_notes(self, record_values, real):
         """Get notes for humans on why is this record going to be updated.
@@ -626,6 +666,70 @@ class WizardUpdateChartsAccounts(models.TransientModel):
             ("active", "=", True),
         ]
 
+    def _get_indexes(self):
+        """Return the indexes of the current action, by key.
+
+        They are kept in the ``chart_update_indexes`` context key set by the
+        actions, so they are never shared with other actions. Without it, the
+        indexes are built again on each call.
+        """
+        return self.env.context.get("chart_update_indexes", {})
+
+    def _get_company_record_ids(self, model_name):
+        """Return the ids of the records of the company, read once to match
+        all the templates of the model."""
+        indexes = self._get_indexes()
+        if ("records", model_name) not in indexes:
+            indexes[("records", model_name)] = tuple(
+                self.env[model_name]
+                .search([("company_id", "=", self.company_id.id)])
+                .ids
+            )
+        return indexes[("records", model_name)]
+
+    def _get_xmlid_index(self, model_name):
+        """Return the ids of the records by XML-ID of the company (those
+        named `account.<company id>_<template XML-ID>`)."""
+        indexes = self._get_indexes()
+        if ("xmlid", model_name) in indexes:
+            return indexes[("xmlid", model_name)]
+        imd_data = self.env["ir.model.data"].search_read(
+            [
+                ("module", "=", "account"),
+                ("model", "=", model_name),
+                ("name", "=like", f"{self.company_id.id}\\_%"),
+            ],
+            ["name", "res_id"],
+        )
+        existing_ids = set(
+            self.env[model_name].browse([d["res_id"] for d in imd_data]).exists().ids
+        )
+        indexes[("xmlid", model_name)] = {
+            f"account.{d['name']}": d["res_id"]
+            for d in imd_data
+            if d["res_id"] in existing_ids
+        }
+        return indexes[("xmlid", model_name)]
+
+    def _get_matching_index(self, model_name, f_name):
+        """Return the ids of the records of the company by value of the
+        matching field `f_name`. For taxes, the key also includes the tax
+        type to prevent matching the wrong record."""
+        indexes = self._get_indexes()
+        if ("matching", model_name, f_name) in indexes:
+            return indexes[("matching", model_name, f_name)]
+        index = {}
+        records = self.env[model_name].browse(self._get_company_record_ids(model_name))
+        for record in records:
+            key = record[f_name]
+            if model_name == "account.tax" and f_name != "type_tax_use":
+                key = (key, record.type_tax_use)
+            index.setdefault(key, []).append(record.id)
+        indexes[("matching", model_name, f_name)] = {
+            key: tuple(ids) for key, ids in index.items()
+        }
+        return indexes[("matching", model_name, f_name)]
+
     def _find_record_matching(self, model_name, xmlid, data):
         mapped_fields = {
             "account.group": self.account_group_matching_ids,
@@ -635,33 +739,34 @@ class WizardUpdateChartsAccounts(models.TransientModel):
             "account.fiscal.position": self.fp_matching_ids,
         }
         company = self.company_id
-        model = self.env[model_name]
-        company_domain = [("company_id", "=", company.id)]
+        # Records read together when compared to the templates
+        model = self.env[model_name].with_prefetch(
+            self._get_company_record_ids(model_name)
+        )
         for matching in mapped_fields[model_name].sorted("sequence"):
             if matching.matching_value == "xml_id":
-                full_xmlid = (
-                    f"account.{company.id}_{xmlid}" if "." not in xmlid else xmlid
-                )
-                record = self.env.ref(full_xmlid, raise_if_not_found=False)
+                if "." in xmlid:
+                    record = self.env.ref(xmlid, raise_if_not_found=False)
+                else:
+                    res_id = self._get_xmlid_index(model_name).get(
+                        f"account.{company.id}_{xmlid}"
+                    )
+                    record = res_id and model.browse(res_id)
                 if record:
                     return record
             else:
                 f_name = matching.matching_value
                 if not data.get(f_name):
                     continue
-                f_value = data[f_name]
+                key = data[f_name]
                 # Fix code from account.account
                 if model_name == "account.account" and f_name == "code":
-                    f_value = self.padded_code(f_value)
-                # Prepare domain
-                domain = [(f_name, "=", f_value)] + company_domain
+                    key = self.padded_code(key)
                 if model_name == "account.tax" and f_name != "type_tax_use":
-                    # Extra domain to prevent find the wrong record
-                    domain += [("type_tax_use", "=", data["type_tax_use"])]
-                # Search record from model
-                result = model.search(domain)
-                if result:
-                    return result
+                    key = (key, data["type_tax_use"])
+                result_ids = self._get_matching_index(model_name, f_name).get(key)
+                if result_ids:
+                    return model.browse(result_ids)
         return False
 
     def _get_external_id(self, record):
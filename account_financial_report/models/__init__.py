@@ -1,6 +1,9 @@
 from . import account_age_report_configuration
 from . import account_group
 from . import account
+from . import account_financial_report_job
+from . import account_move
 from . import account_move_line
+from . import account_move_line_monthly_balance
 from . import ir_actions_report
 from . import res_config_settings
@@ -0,0 +1,224 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+import hashlib
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+REPORT_EXTENSIONS = {"qweb-pdf": "pdf", "xlsx": "xlsx", "qweb-html": "html"}
+
+
+class AccountFinancialReportJob(models.Model):
+    """Financial report rendered in background by a scheduled action.
+
+    The rendered file is kept as an attachment and reused for identical
+    requests (same report and parameters) until a move is posted or reset to
+    draft in the period covered by the report.
+    """
+
+    _name = "account.financial.report.job"
+    _description = "Financial Report Background Job"
+    _order = "create_date desc, id desc"
+    # Running jobs older than this (seconds) are considered interrupted
+    _job_timeout = 3600
+
+    name = fields.Char(required=True, readonly=True)
+    report_name = fields.Char(required=True, readonly=True)
+    report_type = fields.Char(required=True, readonly=True)
+    data = fields.Json(readonly=True)
+    wizard_values = fields.Json(
+        readonly=True, help="Values of the wizard, created again to render the report"
+    )
+    params_hash = fields.Char(required=True, readonly=True, index=True)
+    company_id = fields.Many2one("res.company", readonly=True, index=True)
+    user_id = fields.Many2one(
+        "res.users", required=True, readonly=True, default=lambda self: self.env.user
+    )
+    date_to = fields.Date(
+        readonly=True,
+        help="End of the period covered by the report. Posting a move up to "
+        "this date expires the result.",
+    )
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+            ("expired", "Expired"),
+        ],
+        default="pending",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    progress = fields.Integer(readonly=True)
+    attachment_id = fields.Many2one("ir.attachment", readonly=True)
+    date_started = fields.Datetime(readonly=True)
+    date_done = fields.Datetime(readonly=True)
+    error = fields.Text(readonly=True)
+
+    @api.model
+    def _get_params_hash(self, report_name, report_type, data, wizard_values):
+        params = dict(data, wizard_id=False)
+        params["wizard_values"] = wizard_values
+        key = json.dumps(
+            [report_name, report_type, params], sort_keys=True, default=str
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @api.model
+    def _enqueue(self, wizard, action):
+        """Return the job rendering the report ``action`` of ``wizard``,
+        reusing a done or queued job with the same parameters if any."""
+        data = json.loads(json.dumps(action["data"], default=str))
+        wizard_values = json.loads(json.dumps(wizard.copy_data()[0], default=str))
+        params_hash = self._get_params_hash(
+            action["report_name"], action["report_type"], data, wizard_values
+        )
+        job = self.search(
+            [
+                ("params_hash", "=", params_hash),
+                ("user_id", "=", self.env.uid),
+                "|",
+                ("state", "in", ["pending", "done"]),
+                "&",
+                ("state", "=", "running"),
+                ("date_started", ">=", self._get_timeout_date()),
+            ],
+            limit=1,
+        )
+        if job:
+            return job
+        job = self.create(
+            {
+                "name": action.get("name") or action["report_name"],
+                "report_name": action["report_name"],
+                "report_type": action["report_type"],
+                "data": data,
+                "wizard_values": wizard_values,
+                "params_hash": params_hash,
+                "company_id": data.get("company_id"),
+                "date_to": data.get("date_to") or data.get("date_at"),
+            }
+        )
+        self.env.ref("account_financial_report.ir_cron_financial_report_job")._trigger()
+        return job
+
+    @api.model
+    def _get_timeout_date(self):
+        return fields.Datetime.now() - timedelta(seconds=self._job_timeout)
+
+    @api.model
+    def _invalidate_for_moves(self, moves):
+        """Expire the results of the reports covering the date of ``moves``."""
+        for company in moves.company_id:
+            company_moves = moves.filtered(lambda m, c=company: m.company_id == c)
+            date_from = min(company_moves.mapped("date"))
+            self.sudo().search(
+                [
+                    ("company_id", "=", company.id),
+                    ("state", "=", "done"),
+                    "|",
+                    ("date_to", "=", False),
+                    ("date_to", ">=", date_from),
+                ]
+            ).write({"state": "expired"})
+
+    def _set_progress(self, progress, **vals):
+        self.write(dict(vals, progress=progress))
+        if not getattr(threading.current_thread(), "testing", False):
+            self.env.cr.commit()  # pylint: disable=invalid-commit
+
+    def _run(self):
+        self.ensure_one()
+        self._set_progress(
+            10, state="running", date_started=fields.Datetime.now(), error=False
+        )
+        report_model = (
+            self.env["ir.actions.report"]
+            .with_user(self.user_id)
+            .with_company(self.company_id or self.user_id.company_id)
+        )
+        # The wizard of the request is transient and may have been vacuumed
+        wizard = report_model.env[self.data["wizard_name"]].create(
+            self.wizard_values or {}
+        )
+        data = dict(self.data, wizard_id=wizard.id)
+        content, __ = report_model._render(self.report_name, wizard.ids, data=data)
+        self.progress = 90
+        extension = REPORT_EXTENSIONS.get(self.report_type, "bin")
+        attachment = self.env["ir.attachment"].create(
+            {
+                "name": f"{self.name}.{extension}",
+                "raw": content,
+                "res_model": self._name,
+                "res_id": self.id,
+            }
+        )
+        self._set_progress(
+            100,
+            state="done",
+            attachment_id=attachment.id,
+            date_done=fields.Datetime.now(),
+        )
+
+    @api.model
+    def _cron_run_jobs(self, limit=10):
+        # Jobs whose worker was killed (time limit, memory) stay running
+        self.search(
+            [
+                ("state", "=", "running"),
+                ("date_started", "<", self._get_timeout_date()),
+            ]
+        ).write(
+            {
+                "state": "failed",
+                "progress": 0,
+                "error": _("The report was interrupted before being rendered."),
+            }
+        )
+        jobs = self.search([("state", "=", "pending")], order="id", limit=limit)
+        for job in jobs:
+            try:
+                job._run()
+            except Exception as e:
+                _logger.exception("Financial report job %s failed", job.id)
+                self.env.cr.rollback()
+                job._set_progress(0, state="failed", error=str(e))
+        if len(jobs) == limit:
+            self.env.ref(
+                "account_financial_report.ir_cron_financial_report_job"
+            )._trigger()
+
+    def action_retry(self):
+        self.filtered(lambda j: j.state in ("failed", "expired")).write(
+            {"state": "pending", "progress": 0, "error": False}
+        )
+        self.env.ref("account_financial_report.ir_cron_financial_report_job")._trigger()
+
+    def action_download(self):
+        self.ensure_one()
+        if self.state != "done":
+            return self._get_job_action()
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/web/content/{self.attachment_id.id}?download=true",
+            "target": "self",
+        }
+
+    def _get_job_action(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Report Job"),
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
@@ -0,0 +1,38 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    # Move fields recomputing keys of the journal items without writing them
+    _MONTHLY_BALANCE_FIELDS = ("date", "partner_id")
+
+    def write(self, vals):
+        key_change = bool(set(vals) & set(self._MONTHLY_BALANCE_FIELDS))
+        if "state" not in vals and not key_change:
+            return super().write(vals)
+        monthly_balance = self.env["account.move.line.monthly.balance"].sudo()
+        job_model = self.env["account.financial.report.job"]
+        posted_before = self.filtered(lambda m: m.state == "posted")
+        removed = self.browse()
+        if key_change or vals.get("state", "posted") != "posted":
+            removed = posted_before
+            monthly_balance._update_from_move_lines(removed.line_ids, sign=-1)
+            job_model._invalidate_for_moves(removed)
+        # The journal items of these moves are already synced here
+        res = super(
+            AccountMove, self.with_context(monthly_balance_move_ids=self.ids)
+        ).write(vals)
+        posted_after = self.filtered(lambda m: m.state == "posted")
+        added = posted_after & (removed | (self - posted_before))
+        monthly_balance._update_from_move_lines(added.line_ids)
+        job_model._invalidate_for_moves(added)
+        return res
+
+    def unlink(self):
+        self.env["account.move.line.monthly.balance"].sudo()._update_from_move_lines(
+            self.filtered(lambda m: m.state == "posted").line_ids, sign=-1
+        )
+        return super().unlink()
@@ -61,6 +61,24 @@ class AccountMoveLine(models.Model):
             ON account_move_line (account_id, partner_id)"""
             )
 
+    def write(self, vals):
+        """Keep the monthly balances in sync when the keys of posted journal
+        items are modified."""
+        monthly_balance = self.env["account.move.line.monthly.balance"].sudo()
+        if not set(vals) & set(monthly_balance._KEY_FIELDS + ("date",)):
+            return super().write(vals)
+        synced_move_ids = self.env.context.get("monthly_balance_move_ids") or []
+        posted_lines = self.filtered(
+            lambda line: line.parent_state == "posted"
+            and line.move_id.id not in synced_move_ids
+        )
+        monthly_balance._update_from_move_lines(posted_lines, sign=-1)
+        res = super().write(vals)
+        monthly_balance._update_from_move_lines(
+            posted_lines.filtered(lambda line: line.parent_state == "posted")
+        )
+        return res
+
     @api.model
     def search_count(self, domain, limit=None):
         # In Big DataBase every time you change the domain widget this method
@@ -0,0 +1,234 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+import datetime
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+
+class AccountMoveLineMonthlyBalance(models.Model):
+    """Monthly totals of the posted journal items.
+
+    One row per company, account, partner, journal, tax and month, kept up to
+    date when moves are posted or reset to draft. The reports read the opening
+    balances from here instead of scanning the whole history of
+    ``account.move.line``.
+    """
+
+    _name = "account.move.line.monthly.balance"
+    _description = "Journal Items Monthly Balance"
+    _log_access = False
+    _order = "date, account_id"
+
+    company_id = fields.Many2one("res.company", required=True, readonly=True)
+    account_id = fields.Many2one("account.account", required=True, readonly=True)
+    partner_id = fields.Many2one("res.partner", readonly=True)
+    journal_id = fields.Many2one("account.journal", required=True, readonly=True)
+    tax_line_id = fields.Many2one("account.tax", readonly=True)
+    date = fields.Date(
+        required=True, readonly=True, help="First day of the month of the items."
+    )
+    debit = fields.Float(readonly=True)
+    credit = fields.Float(readonly=True)
+    balance = fields.Float(readonly=True)
+    amount_currency = fields.Float(readonly=True)
+
+    _BALANCE_FIELDS = ("debit", "credit", "balance", "amount_currency")
+    # Journal items fields the totals are grouped by
+    _KEY_FIELDS = (
+        "company_id",
+        "account_id",
+        "partner_id",
+        "journal_id",
+        "tax_line_id",
+    )
+
+    def init(self):
+        self.env.cr.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS account_move_line_monthly_balance_key
+            ON account_move_line_monthly_balance (
+                company_id, account_id, COALESCE(partner_id, 0), journal_id,
+                COALESCE(tax_line_id, 0), date
+            )"""
+        )
+        self.env.cr.execute("SELECT 1 FROM account_move_line_monthly_balance LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    def _get_upsert_query(self, where, sign=1):
+        return SQL(
+            """
+            INSERT INTO account_move_line_monthly_balance (
+                company_id, account_id, partner_id, journal_id, tax_line_id, date,
+                debit, credit, balance, amount_currency
+            )
+            SELECT aml.company_id, aml.account_id, aml.partner_id, aml.journal_id,
+                aml.tax_line_id, date_trunc('month', aml.date)::date,
+                %(sign)s * SUM(aml.debit), %(sign)s * SUM(aml.credit),
+                %(sign)s * SUM(aml.balance), %(sign)s * SUM(aml.amount_currency)
+            FROM account_move_line aml
+            WHERE aml.parent_state = 'posted'
+                AND (aml.display_type IS NULL
+                    OR aml.display_type NOT IN ('line_section', 'line_note'))
+                AND %(where)s
+            GROUP BY aml.company_id, aml.account_id, aml.partner_id, aml.journal_id,
+                aml.tax_line_id, date_trunc('month', aml.date)
+            ON CONFLICT (
+                company_id, account_id, COALESCE(partner_id, 0), journal_id,
+                COALESCE(tax_line_id, 0), date
+            ) DO UPDATE SET
+                debit = account_move_line_monthly_balance.debit + EXCLUDED.debit,
+                credit = account_move_line_monthly_balance.credit + EXCLUDED.credit,
+                balance = account_move_line_monthly_balance.balance
+                    + EXCLUDED.balance,
+                amount_currency = account_move_line_monthly_balance.amount_currency
+                    + EXCLUDED.amount_currency
+            """,
+            sign=sign,
+            where=where,
+        )
+
+    @api.model
+    def _rebuild(self, company_ids=None):
+        """Recompute the table from the posted journal items."""
+        self.env.flush_all()
+        if company_ids:
+            self.env.cr.execute(
+                "DELETE FROM account_move_line_monthly_balance "
+                "WHERE company_id IN %s",
+                (tuple(company_ids),),
+            )
+            where = SQL("aml.company_id IN %s", tuple(company_ids))
+        else:
+            self.env.cr.execute("DELETE FROM account_move_line_monthly_balance")
+            where = SQL("TRUE")
+        self.env.cr.execute(self._get_upsert_query(where))
+        self.invalidate_model()
+
+    @api.model
+    def _update_from_move_lines(self, move_lines, sign=1):
+        """Add (``sign=1``) or remove (``sign=-1``) the amounts of the given
+        posted journal items."""
+        if not move_lines:
+            return
+        move_lines.flush_recordset()
+        self.env.cr.execute(
+            self._get_upsert_query(SQL("aml.id IN %s", tuple(move_lines.ids)), sign)
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _translate_domain(self, domain):
+        """Translate an ``account.move.line`` domain into a domain on this
+        model plus the date bounds ``(date_from, date_to)`` where ``date_to``
+        is exclusive. Return ``None`` when the domain cannot be answered from
+        the monthly totals (draft items, analytic filters, OR operators...).
+        """
+        res_domain = []
+        date_from = date_to = False
+        posted = False
+        for leaf in domain:
+            if leaf == "&":
+                continue
+            if not isinstance(leaf, (list, tuple)) or len(leaf) != 3:
+                return None
+            fname, operator, value = leaf
+            if fname in ("move_id.state", "parent_state"):
+                if (operator, value) not in (("=", "posted"), ("in", ["posted"])):
+                    return None
+                posted = True
+            elif fname == "display_type":
+                if operator != "not in":
+                    return None
+            elif fname == "date":
+                value = fields.Date.to_date(value)
+                if operator == "<":
+                    date_to = min(date_to, value) if date_to else value
+                elif operator == "<=":
+                    value += datetime.timedelta(days=1)
+                    date_to = min(date_to, value) if date_to else value
+                elif operator == ">=":
+                    date_from = max(date_from, value) if date_from else value
+                else:
+                    return None
+            elif fname == "account_type":
+                res_domain.append(("account_id.account_type", operator, value))
+            elif fname.split(".")[0] in self._KEY_FIELDS:
+                res_domain.append((fname, operator, value))
+            else:
+                return None
+        if not posted or not date_to:
+            return None
+        return res_domain, date_from, date_to
+
+    @api.model
+    def _get_group_key(self, group, groupby):
+        key = []
+        for fname in groupby:
+            value = group[fname]
+            key.append(value[0] if isinstance(value, tuple) else value)
+        return tuple(key)
+
+    @api.model
+    def _read_group_balances(self, domain, fields, groupby, lazy=True):
+        """Drop-in replacement of ``account.move.line`` ``read_group`` for
+        balance totals. Whole months are read from this table and only the
+        journal items of the partial months at the edges of the date range are
+        grouped from ``account.move.line``. Fall back to the standard
+        ``read_group`` when the query cannot be answered from the totals."""
+        aml_model = self.env["account.move.line"]
+        translated = self._translate_domain(domain)
+        if (
+            translated is None
+            or (lazy and len(groupby) > 1)
+            or any(fname not in self._KEY_FIELDS for fname in groupby)
+        ):
+            return aml_model.read_group(
+                domain=domain, fields=fields, groupby=groupby, lazy=lazy
+            )
+        res_domain, date_from, date_to = translated
+        # Whole months covered by [date_from, date_to)
+        month_to = date_to.replace(day=1)
+        month_from = date_from and date_from.replace(day=1)
+        if month_from and month_from != date_from:
+            month_from += relativedelta(months=1)
+        if month_from and month_from >= month_to:
+            return aml_model.read_group(
+                domain=domain, fields=fields, groupby=groupby, lazy=lazy
+            )
+        res_domain = res_domain + [("date", "<", month_to)]
+        edge_domains = []
+        if month_to != date_to:
+            edge_domains.append(domain + [("date", ">=", month_to)])
+        if month_from:
+            res_domain.append(("date", ">=", month_from))
+            if month_from != date_from:
+                edge_domains.append(domain + [("date", "<", month_from)])
+        groups = self.read_group(
+            domain=res_domain, fields=fields, groupby=groupby, lazy=lazy
+        )
+        # These keys would give domains on this model, not on journal items
+        for group in groups:
+            group.pop("__domain", None)
+        groups_by_key = {self._get_group_key(g, groupby): g for g in groups}
+        for edge_domain in edge_domains:
+            edge_groups = aml_model.read_group(
+                domain=edge_domain, fields=fields, groupby=groupby, lazy=lazy
+            )
+            for edge_group in edge_groups:
+                edge_group.pop("__domain", None)
+                key = self._get_group_key(edge_group, groupby)
+                group = groups_by_key.get(key)
+                if not group:
+                    groups_by_key[key] = edge_group
+                    groups.append(edge_group)
+                    continue
+                for fname in self._BALANCE_FIELDS:
+                    if fname in edge_group:
+                        group[fname] = (group.get(fname) or 0.0) + (
+                            edge_group[fname] or 0.0
+                        )
+        return groups
@@ -1,7 +1,10 @@
 # Copyright 2020 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+from datetime import date
+
 from odoo import api, models
+from odoo.tools import SQL
 
 
 class AgedPartnerBalanceReport(models.AbstractModel):
@@ -19,13 +22,12 @@ class AgedPartnerBalanceReport(models.AbstractModel):
     ]
 
     @api.model
-    def _get_move_lines_domain_not_reconciled(
-        self, company_id, account_ids, partner_ids, only_posted_moves, date_from
+    def _get_move_lines_domain_at_date(
+        self, company_id, account_ids, partner_ids, only_posted_moves
     ):
         domain = [
             ("account_id", "in", account_ids),
             ("company_id", "=", company_id),
-            ("reconciled", "=", False),
         ]
         if partner_ids:
             domain += [("partner_id", "in", partner_ids)]
@@ -33,95 +35,126 @@ class AgedPartnerBalanceReport(models.AbstractModel):
             domain += [("move_id.state", "=", "posted")]
         else:
             domain += [("move_id.state", "in", ["posted", "draft"])]
-        if date_from:
-            domain += [("date", ">", date_from)]
         return domain
 
     @api.model
-    def _get_new_move_lines_domain(
-        self, new_ml_ids, account_ids, company_id, partner_ids, only_posted_moves
+    def _get_residuals_at_date_query(
+        self,
+        company_id,
+        account_ids,
+        partner_ids,
+        only_posted_moves,
+        date_from,
+        date_at,
     ):
-        domain = [
-            ("account_id", "in", account_ids),
-            ("company_id", "=", company_id),
-            ("id", "in", new_ml_ids),
-        ]
-        if partner_ids:
-            domain += [("partner_id", "in", partner_ids)]
-        if only_posted_moves:
-            domain += [("move_id.state", "=", "posted")]
+        """Query returning ``(id, amount_residual, amount_residual_currency)``
+        of the journal items open at ``date_at``.
+
+        The residuals as of that date are the current residuals plus the
+        amounts of the partial reconciliations made after it: they are added
+        back to the debit items and subtracted from the credit ones. Items
+        fully reconciled today but partially reconciled after ``date_at`` are
+        included as well.
+        """
+        domain = self._get_move_lines_domain_at_date(
+            company_id, account_ids, partner_ids, only_posted_moves
+        )
+        query = self.env["account.move.line"]._search(domain)
+        if date_at < date.today():
+            adjustment = SQL(
+                """
+                SELECT line_id, SUM(amount) AS amount,
+                    SUM(amount_currency) AS amount_currency
+                FROM (
+                    SELECT debit_move_id AS line_id, amount,
+                        debit_amount_currency AS amount_currency
+                    FROM account_partial_reconcile
+                    WHERE max_date > %(date_at)s AND company_id = %(company_id)s
+                    UNION ALL
+                    SELECT credit_move_id, -amount, -credit_amount_currency
+                    FROM account_partial_reconcile
+                    WHERE max_date > %(date_at)s AND company_id = %(company_id)s
+                ) AS partial
+                GROUP BY line_id
+                """,
+                date_at=date_at,
+                company_id=company_id,
+            )
         else:
-            domain += [("move_id.state", "in", ["posted", "draft"])]
-        return domain
+            adjustment = SQL(
+                "SELECT NULL::int AS line_id, 0.0 AS amount, 0.0 AS amount_currency"
+            )
+        unreconciled = SQL("NOT account_move_line.reconciled")
+        if date_from:
+            unreconciled = SQL(
+                "%s AND account_move_line.date > %s", unreconciled, date_from
+            )
+        return SQL(
+            """
+            WITH adjustment AS (%(adjustment)s)
+            SELECT account_move_line.id,
+                account_move_line.amount_residual
+                    + COALESCE(adjustment.amount, 0.0),
+                account_move_line.amount_residual_currency
+                    + COALESCE(adjustment.amount_currency, 0.0)
+            FROM %(from_clause)s
+            LEFT JOIN adjustment ON adjustment.line_id = account_move_line.id
+            WHERE %(where_clause)s
+                AND account_move_line.date <= %(date_at)s
+                AND (%(unreconciled)s OR adjustment.line_id IS NOT NULL)
+            ORDER BY account_move_line.date DESC, account_move_line.move_name DESC,
+                account_move_line.id
+            """,
+            adjustment=adjustment,
+            from_clause=query.from_clause,
+            where_clause=query.where_clause,
+            date_at=date_at,
+            unreconciled=unreconciled,
+        )
 
-    def _recalculate_move_lines(
+    def _get_move_lines_at_date(
         self,
-        move_lines,
-        debit_ids,
-        credit_ids,
-        debit_amount,
-        credit_amount,
-        ml_ids,
-        account_ids,
         company_id,
+        account_ids,
         partner_ids,
         only_posted_moves,
-        debit_amount_currency,
-        credit_amount_currency,
+        date_from,
+        date_at,
     ):
-        debit_ids = set(debit_ids)
-        credit_ids = set(credit_ids)
-        in_credit_but_not_in_debit = credit_ids - debit_ids
-        reconciled_ids = list(debit_ids) + list(in_credit_but_not_in_debit)
-        reconciled_ids = set(reconciled_ids)
-        ml_ids = set(ml_ids)
-        new_ml_ids = reconciled_ids - ml_ids
-        new_ml_ids = list(new_ml_ids)
-        new_domain = self._get_new_move_lines_domain(
-            new_ml_ids, account_ids, company_id, partner_ids, only_posted_moves
+        """Return the ``search_read`` values of the journal items open at
+        ``date_at``, with their residual amounts as of that date."""
+        self.env.flush_all()
+        self.env.cr.execute(
+            self._get_residuals_at_date_query(
+                company_id,
+                account_ids,
+                partner_ids,
+                only_posted_moves,
+                date_from,
+                date_at,
+            )
         )
-        company_currency = self.env["res.company"].browse(company_id).currency_id
-        ml_fields = self._get_ml_fields()
-        new_move_lines = self.env["account.move.line"].search_read(
-            domain=new_domain, fields=ml_fields
+        residuals = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        move_lines = (
+            self.env["account.move.line"]
+            .browse(list(residuals))
+            .read(self._get_ml_fields())
         )
-        move_lines = move_lines + new_move_lines
         for move_line in move_lines:
-            ml_id = move_line["id"]
-            if ml_id in debit_ids:
-                if move_line.get("amount_residual", False):
-                    move_line["amount_residual"] += debit_amount[ml_id]
-                else:
-                    move_line["amount_residual"] = debit_amount[ml_id]
-                if move_line.get("amount_residual_currency", False):
-                    move_line["amount_residual_currency"] += debit_amount_currency[
-                        ml_id
-                    ]
-                else:
-                    move_line["amount_residual_currency"] = debit_amount_currency[ml_id]
-            if ml_id in credit_ids:
-                if move_line.get("amount_residual", False):
-                    move_line["amount_residual"] -= credit_amount[ml_id]
-                else:
-                    move_line["amount_residual"] = -credit_amount[ml_id]
-                if move_line.get("amount_residual_currency", False):
-                    move_line["amount_residual_currency"] -= credit_amount_currency[
-                        ml_id
-                    ]
-                else:
-                    move_line["amount_residual_currency"] = -credit_amount_currency[
-                        ml_id
-                    ]
-            # Set amount_currency=0 to keep the same behaviour as in v13
-            # Conditions: if there is no curency_id defined or it is equal
-            # to the company's curency_id
-            if "amount_currency" in move_line and (
-                "currency_id" not in move_line
-                or move_line["currency_id"] == company_currency.id
-            ):
-                move_line["amount_currency"] = 0
+            residual, residual_currency = residuals[move_line["id"]]
+            move_line["amount_residual"] = residual
+            if "amount_residual_currency" in move_line:
+                move_line["amount_residual_currency"] = residual_currency
         return move_lines
 
+    @api.model
+    def _read_group_balances(self, domain, fields, groupby, lazy=True):
+        """``read_group`` on journal items for balance totals, answered from
+        the monthly balances whenever the domain allows it."""
+        return self.env["account.move.line.monthly.balance"]._read_group_balances(
+            domain, fields, groupby, lazy=lazy
+        )
+
     def _get_accounts_data(self, accounts_ids):
         accounts = self.env["account.account"].browse(accounts_ids)
         accounts_data = {}
@@ -9,6 +9,7 @@ class AbstractReportXslx(models.AbstractModel):
     _name = "report.account_financial_report.abstract_report_xlsx"
     _description = "Abstract XLSX Account Financial Report"
     _inherit = "report.report_xlsx.abstract"
+    _xlsx_stream = True
 
     def get_workbook_options(self):
         vals = super().get_workbook_options()
@@ -54,42 +55,66 @@ class AbstractReportXslx(models.AbstractModel):
          * format_amount
          * format_percent_bold_italic
         """
-        currency_id = self.env["res.company"]._default_currency_id()
         report_data["formats"] = {
-            "format_bold": workbook.add_format({"bold": True}),
-            "format_right": workbook.add_format({"align": "right"}),
-            "format_left": workbook.add_format({"align": "left"}),
-            "format_right_bold_italic": workbook.add_format(
-                {"align": "right", "bold": True, "italic": True}
-            ),
-            "format_header_left": workbook.add_format(
-                {"bold": True, "border": True, "bg_color": "#FFFFCC"}
-            ),
-            "format_header_center": workbook.add_format(
-                {"bold": True, "align": "center", "border": True, "bg_color": "#FFFFCC"}
-            ),
-            "format_header_right": workbook.add_format(
-                {"bold": True, "align": "right", "border": True, "bg_color": "#FFFFCC"}
-            ),
-            "format_header_amount": workbook.add_format(
-                {"bold": True, "border": True, "bg_color": "#FFFFCC"}
-            ),
-            "format_amount": workbook.add_format(),
-            "format_amount_bold": workbook.add_format({"bold": True}),
-            "format_percent_bold_italic": workbook.add_format(
-                {"bold": True, "italic": True}
-            ),
+            name: workbook.add_format(properties)
+            for name, properties in self._get_format_properties().items()
         }
-        report_data["formats"]["format_amount"].set_num_format(
-            "#,##0." + "0" * currency_id.decimal_places
-        )
-        report_data["formats"]["format_header_amount"].set_num_format(
-            "#,##0." + "0" * currency_id.decimal_places
-        )
-        report_data["formats"]["format_percent_bold_italic"].set_num_format("#,##0.00%")
-        report_data["formats"]["format_amount_bold"].set_num_format(
-            "#,##0." + "0" * currency_id.decimal_places
-        )
+        # Formats specific to a currency, see `_get_currency_format`
+        report_data["currency_formats"] = {}
+
+    def _get_format_properties(self):
+        """Return the properties of the formats defined by `_define_formats`."""
+        currency_id = self.env["res.company"]._default_currency_id()
+        amount_format = "#,##0." + "0" * currency_id.decimal_places
+        header = {"bold": True, "border": True, "bg_color": "#FFFFCC"}
+        return {
+            "format_bold": {"bold": True},
+            "format_right": {"align": "right"},
+            "format_left": {"align": "left"},
+            "format_right_bold_italic": {
+                "align": "right",
+                "bold": True,
+                "italic": True,
+            },
+            "format_header_left": dict(header),
+            "format_header_center": dict(header, align="center"),
+            "format_header_right": dict(header, align="right"),
+            "format_header_amount": dict(header, num_format=amount_format),
+            "format_amount": {"num_format": amount_format},
+            "format_amount_bold": {"bold": True, "num_format": amount_format},
+            "format_percent_bold_italic": {
+                "bold": True,
+                "italic": True,
+                "num_format": "#,##0.00%",
+            },
+        }
+
+    def _get_currency_format(self, base_format, currency, report_data):
+        """Return the format `base_format` with the number format of
+        `currency`. Each format is added only once to the workbook."""
+        key = (base_format, currency.id)
+        currency_formats = report_data["currency_formats"]
+        if key not in currency_formats:
+            properties = dict(self._get_format_properties()[base_format])
+            if base_format == "format_header_amount":
+                properties["num_format"] = "#,##0." + "0" * currency.decimal_places
+            else:
+                properties["num_format"] = self._report_xlsx_currency_format(currency)
+            currency_formats[key] = report_data["workbook"].add_format(properties)
+        return currency_formats[key]
+
+    def _write_row(self, cells, report_data):
+        """Write all the cells of the current line and go to the next one.
+        `cells` is a list of `(col_pos, value, cell_format)`: numbers are
+        written as numbers and anything else as strings."""
+        sheet = report_data["sheet"]
+        row_pos = report_data["row_pos"]
+        for col_pos, value, cell_format in cells:
+            if isinstance(value, float):
+                sheet.write_number(row_pos, col_pos, value, cell_format)
+            else:
+                sheet.write_string(row_pos, col_pos, value, cell_format)
+        report_data["row_pos"] += 1
 
     def _set_column_width(self, report_data):
         """Set width for all defined columns.
@@ -189,63 +214,41 @@ class AbstractReportXslx(models.AbstractModel):
         """Write a line on current line using all defined columns field name.
         Columns are defined with `_get_report_columns` method.
         """
+        formats = report_data["formats"]
+        is_group = (
+            hasattr(line_object, "account_group_id") and line_object.account_group_id
+        )
+        cells = []
         for col_pos, column in report_data["columns"].items():
             value = getattr(line_object, column["field"])
             cell_type = column.get("type", "string")
             if cell_type == "many2one":
-                report_data["sheet"].write_string(
-                    report_data["row_pos"],
-                    col_pos,
-                    value.name or "",
-                    report_data["formats"]["format_right"],
-                )
+                cells.append((col_pos, value.name or "", formats["format_right"]))
             elif cell_type == "string":
-                if (
-                    hasattr(line_object, "account_group_id")
-                    and line_object.account_group_id
-                ):
-                    report_data["sheet"].write_string(
-                        report_data["row_pos"],
-                        col_pos,
-                        value or "",
-                        report_data["formats"]["format_bold"],
-                    )
-                else:
-                    report_data["sheet"].write_string(
-                        report_data["row_pos"], col_pos, value or ""
-                    )
+                cell_format = formats["format_bold"] if is_group else None
+                cells.append((col_pos, value or "", cell_format))
             elif cell_type == "amount":
-                if (
-                    hasattr(line_object, "account_group_id")
-                    and line_object.account_group_id
-                ):
-                    cell_format = report_data["formats"]["format_amount_bold"]
+                if is_group:
+                    cell_format = formats["format_amount_bold"]
                 else:
-                    cell_format = report_data["formats"]["format_amount"]
-                report_data["sheet"].write_number(
-                    report_data["row_pos"], col_pos, float(value), cell_format
-                )
+                    cell_format = formats["format_amount"]
+                cells.append((col_pos, float(value), cell_format))
             elif cell_type == "amount_currency":
                 if line_object.currency_id:
                     format_amt = self._get_currency_amt_format(line_object, report_data)
-                    report_data["sheet"].write_number(
-                        report_data["row_pos"], col_pos, float(value), format_amt
-                    )
-        report_data["row_pos"] += 1
+                    cells.append((col_pos, float(value), format_amt))
+        self._write_row(cells, report_data)
 
     def write_line_from_dict(self, line_dict, report_data):
         """Write a line on current line"""
+        formats = report_data["formats"]
+        cells = []
         for col_pos, column in report_data["columns"].items():
             value = line_dict.get(column["field"], False)
             cell_type = column.get("type", "string")
             if cell_type == "string":
                 if line_dict.get("type", "") == "group_type":
-                    report_data["sheet"].write_string(
-                        report_data["row_pos"],
-                        col_pos,
-                        value or "",
-                        report_data["formats"]["format_bold"],
-                    )
+                    cells.append((col_pos, value or "", formats["format_bold"]))
                 else:
                     if (
                         not isinstance(value, str)
@@ -253,38 +256,27 @@ class AbstractReportXslx(models.AbstractModel):
                         and not isinstance(value, int)
                     ):
                         value = value and value.strftime("%d/%m/%Y")
-                    report_data["sheet"].write_string(
-                        report_data["row_pos"], col_pos, value or ""
-                    )
+                    cells.append((col_pos, value or "", None))
             elif cell_type == "amount":
                 if (
                     line_dict.get("account_group_id", False)
                     and line_dict["account_group_id"]
                 ):
-                    cell_format = report_data["formats"]["format_amount_bold"]
+                    cell_format = formats["format_amount_bold"]
                 else:
-                    cell_format = report_data["formats"]["format_amount"]
-                report_data["sheet"].write_number(
-                    report_data["row_pos"], col_pos, float(value), cell_format
-                )
+                    cell_format = formats["format_amount"]
+                cells.append((col_pos, float(value), cell_format))
             elif cell_type == "amount_currency":
                 if line_dict.get("currency_name", False):
                     format_amt = self._get_currency_amt_format_dict(
                         line_dict, report_data
                     )
-                    report_data["sheet"].write_number(
-                        report_data["row_pos"], col_pos, float(value), format_amt
-                    )
+                    cells.append((col_pos, float(value), format_amt))
             elif cell_type == "currency_name":
-                report_data["sheet"].write_string(
-                    report_data["row_pos"],
-                    col_pos,
-                    value or "",
-                    report_data["formats"]["format_right"],
-                )
+                cells.append((col_pos, value or "", formats["format_right"]))
             else:
                 self.write_non_standard_column(cell_type, col_pos, value)
-        report_data["row_pos"] += 1
+        self._write_row(cells, report_data)
 
     def write_initial_balance(self, my_object, label, report_data):
         """Write a specific initial balance line on current line
@@ -526,81 +518,37 @@ class AbstractReportXslx(models.AbstractModel):
     def _get_currency_amt_format(self, line_object, report_data):
         """Return amount format specific for each currency."""
         if "account_group_id" in line_object and line_object["account_group_id"]:
-            format_amt = report_data["formats"]["format_amount_bold"]
-            field_prefix = "format_amount_bold"
+            base_format = "format_amount_bold"
         else:
-            format_amt = report_data["formats"]["format_amount"]
-            field_prefix = "format_amount"
+            base_format = "format_amount"
         if "currency_id" in line_object and line_object.get("currency_id", False):
             if isinstance(line_object["currency_id"], int):
                 currency = self.env["res.currency"].browse(line_object["currency_id"])
             else:
                 currency = line_object["currency_id"]
-            field_name = f"{field_prefix}_{currency.name}"
-            if hasattr(self, field_name):
-                format_amt = getattr(self, field_name)
-            else:
-                format_amt = report_data["workbook"].add_format()
-                report_data["field_name"] = format_amt
-                format_amt.set_num_format(self._report_xlsx_currency_format(currency))
-        return format_amt
+            return self._get_currency_format(base_format, currency, report_data)
+        return report_data["formats"][base_format]
 
     def _get_currency_amt_format_dict(self, line_dict, report_data):
         """Return amount format specific for each currency."""
-        if line_dict.get("account_group_id", False) and line_dict["account_group_id"]:
-            format_amt = report_data["formats"]["format_amount_bold"]
-            field_prefix = "format_amount_bold"
-        else:
-            format_amt = report_data["formats"]["format_amount"]
-            field_prefix = "format_amount"
-        if line_dict.get("currency_id", False) and line_dict["currency_id"]:
-            if isinstance(line_dict["currency_id"], int):
-                currency = self.env["res.currency"].browse(line_dict["currency_id"])
-            else:
-                currency = line_dict["currency_id"]
-            field_name = f"{field_prefix}_{currency.name}"
-            if hasattr(self, field_name):
-                format_amt = getattr(self, field_name)
-            else:
-                format_amt = report_data["workbook"].add_format()
-                report_data["field_name"] = format_amt
-                format_amt.set_num_format(self._report_xlsx_currency_format(currency))
-        return format_amt
+        return self._get_currency_amt_format(line_dict, report_data)
 
     def _get_currency_amt_header_format(self, line_object, report_data):
         """Return amount header format for each currency."""
-        format_amt = report_data["formats"]["format_header_amount"]
         if line_object.currency_id:
-            field_name = "format_header_amount_%s" % line_object.currency_id.name
-            if hasattr(self, field_name):
-                format_amt = getattr(self, field_name)
-            else:
-                format_amt = report_data["workbook"].add_format(
-                    {"bold": True, "border": True, "bg_color": "#FFFFCC"}
-                )
-                report_data["field_name"] = format_amt
-                format_amount = "#,##0." + (
-                    "0" * line_object.currency_id.decimal_places
-                )
-                format_amt.set_num_format(format_amount)
-        return format_amt
+            return self._get_currency_format(
+                "format_header_amount", line_object.currency_id, report_data
+            )
+        return report_data["formats"]["format_header_amount"]
 
     def _get_currency_amt_header_format_dict(self, line_object, report_data):
         """Return amount header format for each currency."""
-        format_amt = report_data["formats"]["format_header_amount"]
         if line_object["currency_id"]:
-            field_name = "format_header_amount_%s" % line_object["currency_name"]
-            if hasattr(self, field_name):
-                format_amt = getattr(self, field_name)
-            else:
-                format_amt = report_data["workbook"].add_format(
-                    {"bold": True, "border": True, "bg_color": "#FFFFCC"}
-                )
-                report_data["field_name"] = format_amt
-                currency = self.env["res.currency"].browse(line_object["currency_id"])
-                format_amount = "#,##0." + ("0" * currency.decimal_places)
-                format_amt.set_num_format(format_amount)
-        return format_amt
+            currency = self.env["res.currency"].browse(line_object["currency_id"])
+            return self._get_currency_format(
+                "format_header_amount", currency, report_data
+            )
+        return report_data["formats"]["format_header_amount"]
 
     def _generate_report_content(self, workbook, report, data, report_data):
         """
@@ -2,18 +2,29 @@
 # Copyright 2020 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-import operator
-from datetime import date, datetime, timedelta
+import logging
+from datetime import datetime
 
 from odoo import api, models
 from odoo.tools import float_is_zero
 
+_logger = logging.getLogger(__name__)
+try:
+    import numpy as np
+except (OSError, ImportError) as err:
+    _logger.debug(err)
+
 
 class AgedPartnerBalanceReport(models.AbstractModel):
     _name = "report.account_financial_report.aged_partner_balance"
     _description = "Aged Partner Balance Report"
     _inherit = "report.account_financial_report.abstract_report"
 
+    # Standard aging buckets and the upper limit (in days overdue) of each one
+    # but the last
+    AGING_BUCKETS = ["current", "30_days", "60_days", "90_days", "120_days", "older"]
+    AGING_LIMITS = [0, 30, 60, 90, 120]
+
     @api.model
     def _initialize_account(self, ag_pb_data, acc_id):
         ag_pb_data[acc_id] = {}
@@ -45,53 +56,87 @@ class AgedPartnerBalanceReport(models.AbstractModel):
             ag_pb_data[acc_id][prt_id][interval_line] = 0.0
         return ag_pb_data
 
+    @api.model
+    def _get_aging_keys(self):
+        interval_lines = self.env.context["age_partner_config"].line_ids
+        return self.AGING_BUCKETS + list(interval_lines)
+
+    @api.model
+    def _get_aging_matrix(self, residuals, due_dates, date_at_object):
+        """Spread the residuals over the aging buckets.
+
+        Return an array with one row per residual and one column per key of
+        ``_get_aging_keys``: the standard buckets, then the interval
+        configuration lines. Each residual is put in one standard bucket and in
+        at most one interval line.
+        """
+        interval_lines = self.env.context["age_partner_config"].line_ids
+        today = date_at_object.toordinal()
+        residuals = np.asarray(residuals, dtype=float)
+        due = np.array(
+            [due_date.toordinal() if due_date else today for due_date in due_dates],
+            dtype=np.int64,
+        )
+        # Not overdue items count as due today
+        days = np.maximum(today - due, 0)
+        matrix = np.zeros(
+            (len(residuals), len(self.AGING_BUCKETS) + len(interval_lines))
+        )
+        rows = np.arange(len(residuals))
+        matrix[rows, np.searchsorted(self.AGING_LIMITS, days)] = residuals
+        unassigned = np.ones(len(residuals), dtype=bool)
+        lower_limit = 0
+        for index, line in enumerate(interval_lines):
+            upper_limit = line.inferior_limit
+            low, high = sorted((lower_limit, upper_limit))
+            if high - low == 1:
+                in_range = days == high
+            else:
+                in_range = (days > low) & (days < high)
+            match = unassigned & (in_range | (days == upper_limit))
+            matrix[match, len(self.AGING_BUCKETS) + index] = residuals[match]
+            unassigned &= ~match
+            lower_limit = upper_limit
+        return matrix
+
+    @api.model
+    def _compute_aging_amounts(
+        self, ag_pb_data, group_keys, residuals, due_dates, date_at_object
+    ):
+        """Add the aged residuals to the account and partner totals.
+
+        ``group_keys`` holds the ``(acc_id, prt_id)`` of each residual.
+        """
+        if not group_keys:
+            return ag_pb_data
+        keys = self._get_aging_keys()
+        matrix = self._get_aging_matrix(residuals, due_dates, date_at_object)
+        groups = list(dict.fromkeys(group_keys))
+        group_index = {group: index for index, group in enumerate(groups)}
+        totals = np.zeros((len(groups), len(keys)))
+        np.add.at(totals, [group_index[group] for group in group_keys], matrix)
+        residual_totals = np.bincount(
+            [group_index[group] for group in group_keys],
+            weights=np.asarray(residuals, dtype=float),
+            minlength=len(groups),
+        )
+        for (acc_id, prt_id), group_totals, residual in zip(
+            groups, totals.tolist(), residual_totals.tolist()
+        ):
+            ag_pb_data[acc_id]["residual"] += residual
+            ag_pb_data[acc_id][prt_id]["residual"] += residual
+            for key, amount in zip(keys, group_totals):
+                ag_pb_data[acc_id][key] += amount
+                ag_pb_data[acc_id][prt_id][key] += amount
+        return ag_pb_data
+
     @api.model
     def _calculate_amounts(
         self, ag_pb_data, acc_id, prt_id, residual, due_date, date_at_object
     ):
-        ag_pb_data[acc_id]["residual"] += residual
-        ag_pb_data[acc_id][prt_id]["residual"] += residual
-        interval_lines = self.env.context["age_partner_config"].line_ids
-        today = date_at_object
-        if not due_date or today <= due_date:
-            ag_pb_data[acc_id]["current"] += residual
-            ag_pb_data[acc_id][prt_id]["current"] += residual
-            due_date = today
-        elif today <= due_date + timedelta(days=30):
-            ag_pb_data[acc_id]["30_days"] += residual
-            ag_pb_data[acc_id][prt_id]["30_days"] += residual
-        elif today <= due_date + timedelta(days=60):
-            ag_pb_data[acc_id]["60_days"] += residual
-            ag_pb_data[acc_id][prt_id]["60_days"] += residual
-        elif today <= due_date + timedelta(days=90):
-            ag_pb_data[acc_id]["90_days"] += residual
-            ag_pb_data[acc_id][prt_id]["90_days"] += residual
-        elif today <= due_date + timedelta(days=120):
-            ag_pb_data[acc_id]["120_days"] += residual
-            ag_pb_data[acc_id][prt_id]["120_days"] += residual
-        else:
-            ag_pb_data[acc_id]["older"] += residual
-            ag_pb_data[acc_id][prt_id]["older"] += residual
-        if due_date:
-            days_difference = abs((today - due_date).days)
-            for index, line in enumerate(interval_lines):
-                lower_limit = (
-                    0 if not index else interval_lines[index - 1].inferior_limit
-                )
-                next_line = (
-                    interval_lines[index] if index < len(interval_lines) else None
-                )
-                interval_range = self._get_values_for_range_intervals(
-                    lower_limit, next_line.inferior_limit
-                )
-                if (
-                    days_difference in interval_range
-                    or days_difference == line.inferior_limit
-                ):
-                    ag_pb_data[acc_id][line] += residual
-                    ag_pb_data[acc_id][prt_id][line] += residual
-                    break
-        return ag_pb_data
+        return self._compute_aging_amounts(
+            ag_pb_data, [(acc_id, prt_id)], [residual], [due_date], date_at_object
+        )
 
     def _get_values_for_range_intervals(self, num1, num2):
         min_num = min(num1, num2)
@@ -100,50 +145,6 @@ class AgedPartnerBalanceReport(models.AbstractModel):
             return [max_num]
         return list(range(min_num + 1, max_num))
 
-    def _get_account_partial_reconciled(self, company_id, date_at_object):
-        domain = [("max_date", ">", date_at_object), ("company_id", "=", company_id)]
-        fields = [
-            "debit_move_id",
-            "credit_move_id",
-            "amount",
-            "debit_amount_currency",
-            "credit_amount_currency",
-        ]
-        accounts_partial_reconcile = self.env["account.partial.reconcile"].search_read(
-            domain=domain, fields=fields
-        )
-        debit_amount = {}
-        debit_amount_currency = {}
-        credit_amount = {}
-        credit_amount_currency = {}
-        for account_partial_reconcile_data in accounts_partial_reconcile:
-            debit_move_id = account_partial_reconcile_data["debit_move_id"][0]
-            credit_move_id = account_partial_reconcile_data["credit_move_id"][0]
-            if debit_move_id not in debit_amount.keys():
-                debit_amount[debit_move_id] = 0.0
-                debit_amount_currency[debit_move_id] = 0.0
-            debit_amount_currency[debit_move_id] += account_partial_reconcile_data[
-                "debit_amount_currency"
-            ]
-            debit_amount[debit_move_id] += account_partial_reconcile_data["amount"]
-            if credit_move_id not in credit_amount.keys():
-                credit_amount[credit_move_id] = 0.0
-                credit_amount_currency[credit_move_id] = 0.0
-            credit_amount[credit_move_id] += account_partial_reconcile_data["amount"]
-            credit_amount_currency[credit_move_id] += account_partial_reconcile_data[
-                "credit_amount_currency"
-            ]
-            account_partial_reconcile_data.update(
-                {"debit_move_id": debit_move_id, "credit_move_id": credit_move_id}
-            )
-        return (
-            accounts_partial_reconcile,
-            debit_amount,
-            credit_amount,
-            debit_amount_currency,
-            credit_amount_currency,
-        )
-
     def _get_move_lines_data(
         self,
         company_id,
@@ -154,52 +155,25 @@ class AgedPartnerBalanceReport(models.AbstractModel):
         only_posted_moves,
         show_move_line_details,
     ):
-        domain = self._get_move_lines_domain_not_reconciled(
-            company_id, account_ids, partner_ids, only_posted_moves, date_from
-        )
-        ml_fields = self._get_ml_fields()
         line_model = self.env["account.move.line"]
-        move_lines = line_model.search_read(domain=domain, fields=ml_fields)
+        move_lines = self._get_move_lines_at_date(
+            company_id,
+            account_ids,
+            partner_ids,
+            only_posted_moves,
+            date_from,
+            date_at_object,
+        )
         journals_ids = set()
         partners_ids = set()
         partners_data = {}
         ag_pb_data = {}
-        if date_at_object < date.today():
-            (
-                acc_partial_rec,
-                debit_amount,
-                credit_amount,
-                debit_amount_currency,
-                credit_amount_currency,
-            ) = self._get_account_partial_reconciled(company_id, date_at_object)
-            if acc_partial_rec:
-                ml_ids = list(map(operator.itemgetter("id"), move_lines))
-                debit_ids = list(
-                    map(operator.itemgetter("debit_move_id"), acc_partial_rec)
-                )
-                credit_ids = list(
-                    map(operator.itemgetter("credit_move_id"), acc_partial_rec)
-                )
-                move_lines = self._recalculate_move_lines(
-                    move_lines,
-                    debit_ids,
-                    credit_ids,
-                    debit_amount,
-                    credit_amount,
-                    ml_ids,
-                    account_ids,
-                    company_id,
-                    partner_ids,
-                    only_posted_moves,
-                    debit_amount_currency,
-                    credit_amount_currency,
-                )
         move_lines = [
             move_line
             for move_line in move_lines
-            if move_line["date"] <= date_at_object
-            and not float_is_zero(move_line["amount_residual"], precision_digits=2)
+            if not float_is_zero(move_line["amount_residual"], precision_digits=2)
         ]
+        group_keys = []
         for move_line in move_lines:
             journals_ids.add(move_line["journal_id"][0])
             acc_id = move_line["account_id"][0]
@@ -243,67 +217,35 @@ class AgedPartnerBalanceReport(models.AbstractModel):
                     }
                 )
                 ag_pb_data[acc_id][prt_id]["move_lines"].append(move_line_data)
-            ag_pb_data = self._calculate_amounts(
-                ag_pb_data,
-                acc_id,
-                prt_id,
-                move_line["amount_residual"],
-                move_line["date_maturity"],
-                date_at_object,
-            )
+            group_keys.append((acc_id, prt_id))
+        ag_pb_data = self._compute_aging_amounts(
+            ag_pb_data,
+            group_keys,
+            [move_line["amount_residual"] for move_line in move_lines],
+            [move_line["date_maturity"] for move_line in move_lines],
+            date_at_object,
+        )
         journals_data = self._get_journals_data(list(journals_ids))
         accounts_data = self._get_accounts_data(ag_pb_data.keys())
         return ag_pb_data, accounts_data, partners_data, journals_data
 
     @api.model
-    def _compute_maturity_date(self, ml, date_at_object):
-        ml.update(
-            {
-                "current": 0.0,
-                "30_days": 0.0,
-                "60_days": 0.0,
-                "90_days": 0.0,
-                "120_days": 0.0,
-                "older": 0.0,
-            }
+    def _compute_maturity_dates(self, move_lines, date_at_object):
+        """Set the aging buckets amounts of the move lines details."""
+        if not move_lines:
+            return
+        keys = self._get_aging_keys()
+        matrix = self._get_aging_matrix(
+            [ml["residual"] for ml in move_lines],
+            [ml["due_date"] for ml in move_lines],
+            date_at_object,
         )
-        interval_lines = self.env.context["age_partner_config"].line_ids
-        for interval_line in interval_lines:
-            ml[interval_line] = 0.0
-        due_date = ml["due_date"]
-        amount = ml["residual"]
-        today = date_at_object
-        if not due_date or today <= due_date:
-            ml["current"] += amount
-            due_date = today
-        elif today <= due_date + timedelta(days=30):
-            ml["30_days"] += amount
-        elif today <= due_date + timedelta(days=60):
-            ml["60_days"] += amount
-        elif today <= due_date + timedelta(days=90):
-            ml["90_days"] += amount
-        elif today <= due_date + timedelta(days=120):
-            ml["120_days"] += amount
-        else:
-            ml["older"] += amount
-        if due_date:
-            days_difference = abs((today - due_date).days)
-            for index, interval_line in enumerate(interval_lines):
-                lower_limit = (
-                    0 if not index else interval_lines[index - 1].inferior_limit
-                )
-                next_line = (
-                    interval_lines[index] if index < len(interval_lines) else None
-                )
-                interval_range = self._get_values_for_range_intervals(
-                    lower_limit, next_line.inferior_limit
-                )
-                if (
-                    days_difference in interval_range
-                    or days_difference == interval_line.inferior_limit
-                ):
-                    ml[interval_line] += amount
-                    break
+        for ml, amounts in zip(move_lines, matrix.tolist()):
+            ml.update(zip(keys, amounts))
+
+    @api.model
+    def _compute_maturity_date(self, ml, date_at_object):
+        self._compute_maturity_dates([ml], date_at_object)
 
     def _create_account_list(
         self,
@@ -315,6 +257,7 @@ class AgedPartnerBalanceReport(models.AbstractModel):
         date_at_oject,
     ):
         aged_partner_data = []
+        detail_move_lines = []
         interval_lines = self.env.context["age_partner_config"].line_ids
         for account in accounts_data.values():
             acc_id = account["id"]
@@ -357,59 +300,34 @@ class AgedPartnerBalanceReport(models.AbstractModel):
                                     "account": accounts_data[ml["acc_id"]]["code"],
                                 }
                             )
-                            self._compute_maturity_date(ml, date_at_oject)
                             move_lines.append(ml)
+                        detail_move_lines += move_lines
                         move_lines = sorted(move_lines, key=lambda k: (k["date"]))
                         partner.update({"move_lines": move_lines})
                     account["partners"].append(partner)
             aged_partner_data.append(account)
+        self._compute_maturity_dates(detail_move_lines, date_at_oject)
         return aged_partner_data
 
     @api.model
     def _calculate_percent(self, aged_partner_data):
-        interval_lines = self.env.context["age_partner_config"].line_ids
-        for account in aged_partner_data:
-            if abs(account["residual"]) > 0.01:
-                total = account["residual"]
-                account.update(
-                    {
-                        "percent_current": abs(
-                            round((account["current"] / total) * 100, 2)
-                        ),
-                        "percent_30_days": abs(
-                            round((account["30_days"] / total) * 100, 2)
-                        ),
-                        "percent_60_days": abs(
-                            round((account["60_days"] / total) * 100, 2)
-                        ),
-                        "percent_90_days": abs(
-                            round((account["90_days"] / total) * 100, 2)
-                        ),
-                        "percent_120_days": abs(
-                            round((account["120_days"] / total) * 100, 2)
-                        ),
-                        "percent_older": abs(
-                            round((account["older"] / total) * 100, 2)
-                        ),
-                    }
-                )
-                for interval_line in interval_lines:
-                    account[f"percent_{interval_line.id}"] = abs(
-                        round((account[interval_line] / total) * 100, 2)
-                    )
-            else:
-                account.update(
-                    {
-                        "percent_current": 0.0,
-                        "percent_30_days": 0.0,
-                        "percent_60_days": 0.0,
-                        "percent_90_days": 0.0,
-                        "percent_120_days": 0.0,
-                        "percent_older": 0.0,
-                    }
-                )
-                for interval_line in interval_lines:
-                    account[f"percent_{interval_line.id}"] = 0.0
+        if not aged_partner_data:
+            return aged_partner_data
+        keys = self._get_aging_keys()
+        percent_keys = [
+            "percent_%s" % (key if isinstance(key, str) else key.id) for key in keys
+        ]
+        totals = np.array(
+            [[account[key] for key in keys] for account in aged_partner_data]
+        )
+        residuals = np.array([account["residual"] for account in aged_partner_data])
+        significant = np.abs(residuals) > 0.01
+        percents = np.zeros(totals.shape)
+        percents[significant] = np.abs(
+            np.round(totals[significant] / residuals[significant, None] * 100, 2)
+        )
+        for account, account_percents in zip(aged_partner_data, percents.tolist()):
+            account.update(zip(percent_keys, account_percents))
         return aged_partner_data
 
     def _get_report_values(self, docids, data):
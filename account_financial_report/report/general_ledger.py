@@ -6,9 +6,10 @@
 import calendar
 import datetime
 import operator
+import uuid
 
 from odoo import _, api, models
-from odoo.tools import float_is_zero
+from odoo.tools import SQL, float_is_zero
 
 
 class GeneralLedgerReport(models.AbstractModel):
@@ -16,6 +17,9 @@ class GeneralLedgerReport(models.AbstractModel):
     _description = "General Ledger Report"
     _inherit = "report.account_financial_report.abstract_report"
 
+    # Number of move lines fetched at a time when streaming the ledger
+    _stream_chunk_size = 10000
+
     def _get_analytic_data(self, account_ids):
         analytic_accounts = self.env["account.analytic.account"].browse(account_ids)
         analytic_data = {}
@@ -102,12 +106,12 @@ class GeneralLedgerReport(models.AbstractModel):
         return domain
 
     def _get_accounts_initial_balance(self, initial_domain_bs, initial_domain_pl):
-        gl_initial_acc_bs = self.env["account.move.line"].read_group(
+        gl_initial_acc_bs = self._read_group_balances(
             domain=initial_domain_bs,
             fields=["account_id", "debit", "credit", "balance", "amount_currency:sum"],
             groupby=["account_id"],
         )
-        gl_initial_acc_pl = self.env["account.move.line"].read_group(
+        gl_initial_acc_pl = self._read_group_balances(
             domain=initial_domain_pl,
             fields=["account_id", "debit", "credit", "balance", "amount_currency:sum"],
             groupby=["account_id"],
@@ -137,7 +141,7 @@ class GeneralLedgerReport(models.AbstractModel):
         domain = self._get_initial_balance_fy_pl_ml_domain(
             account_ids, company_id, fy_start_date, base_domain
         )
-        initial_balances = self.env["account.move.line"].read_group(
+        initial_balances = self._read_group_balances(
             domain=domain,
             fields=["account_id", "debit", "credit", "balance", "amount_currency:sum"],
             groupby=["account_id"],
@@ -188,7 +192,7 @@ class GeneralLedgerReport(models.AbstractModel):
         return getattr(self, method)(data, domain, grouped_by)
 
     def _prepare_gen_ld_data_group_partners(self, data, domain, grouped_by):
-        gl_initial_acc_prt = self.env["account.move.line"].read_group(
+        gl_initial_acc_prt = self._read_group_balances(
             domain=domain,
             fields=[
                 "account_id",
@@ -217,7 +221,7 @@ class GeneralLedgerReport(models.AbstractModel):
         return data
 
     def _prepare_gen_ld_data_group_taxes(self, data, domain, grouped_by):
-        gl_initial_acc_prt = self.env["account.move.line"].read_group(
+        gl_initial_acc_prt = self._read_group_balances(
             domain=domain,
             fields=[
                 "account_id",
@@ -430,6 +434,82 @@ class GeneralLedgerReport(models.AbstractModel):
             res.append({"id": 0, "name": ""})
         return res
 
+    def _init_period_ml_aux_data(self):
+        return {
+            "journal_ids": set(),
+            "taxes_ids": set(),
+            "analytic_ids": set(),
+            "full_reconcile_data": {},
+        }
+
+    def _add_period_ml(
+        self,
+        gen_ld_data,
+        move_line,
+        ml_data,
+        foreign_currency,
+        grouped_by,
+        acc_prt_account_ids,
+    ):
+        """Add a period move line to ``gen_ld_data`` and collect the ids of the
+        related records (journals, taxes, analytic accounts and full
+        reconciliations) into ``ml_data``."""
+        ml_data["journal_ids"].add(move_line["journal_id"][0])
+        for tax_id in move_line["tax_ids"]:
+            ml_data["taxes_ids"].add(tax_id)
+        for ids in (move_line["analytic_distribution"] or {}).keys():
+            ml_data["analytic_ids"].update(map(int, ids.split(",")))
+        full_reconcile_data = ml_data["full_reconcile_data"]
+        if move_line["full_reconcile_id"]:
+            rec_id = move_line["full_reconcile_id"][0]
+            if rec_id not in full_reconcile_data:
+                full_reconcile_data.update(
+                    {
+                        rec_id: {
+                            "id": rec_id,
+                            "name": move_line["matching_number"],
+                        }
+                    }
+                )
+        acc_id = move_line["account_id"][0]
+        ml_id = move_line["id"]
+        if acc_id not in gen_ld_data.keys():
+            gen_ld_data[acc_id] = self._initialize_data(foreign_currency)
+            gen_ld_data[acc_id]["id"] = acc_id
+            gen_ld_data[acc_id]["mame"] = move_line["account_id"][1]
+            gen_ld_data[acc_id][grouped_by] = False
+        if acc_id in acc_prt_account_ids:
+            item_ids = self._prepare_ml_items(move_line, grouped_by)
+            for item in item_ids:
+                item_id = item["id"]
+                if item_id not in gen_ld_data[acc_id]:
+                    gen_ld_data[acc_id][grouped_by] = True
+                    gen_ld_data[acc_id][item_id] = self._initialize_data(
+                        foreign_currency
+                    )
+                    gen_ld_data[acc_id][item_id]["id"] = item_id
+                    gen_ld_data[acc_id][item_id]["name"] = item["name"]
+                gen_ld_data[acc_id][item_id][ml_id] = self._get_move_line_data(
+                    move_line
+                )
+                gen_ld_data[acc_id][item_id]["fin_bal"]["credit"] += move_line["credit"]
+                gen_ld_data[acc_id][item_id]["fin_bal"]["debit"] += move_line["debit"]
+                gen_ld_data[acc_id][item_id]["fin_bal"]["balance"] += move_line[
+                    "balance"
+                ]
+                if foreign_currency:
+                    gen_ld_data[acc_id][item_id]["fin_bal"]["bal_curr"] += move_line[
+                        "amount_currency"
+                    ]
+        else:
+            gen_ld_data[acc_id][ml_id] = self._get_move_line_data(move_line)
+        gen_ld_data[acc_id]["fin_bal"]["credit"] += move_line["credit"]
+        gen_ld_data[acc_id]["fin_bal"]["debit"] += move_line["debit"]
+        gen_ld_data[acc_id]["fin_bal"]["balance"] += move_line["balance"]
+        if foreign_currency:
+            gen_ld_data[acc_id]["fin_bal"]["bal_curr"] += move_line["amount_currency"]
+        return gen_ld_data
+
     def _get_period_ml_data(
         self,
         account_ids,
@@ -459,73 +539,21 @@ class GeneralLedgerReport(models.AbstractModel):
         move_lines = self.env["account.move.line"].search_read(
             domain=domain, fields=ml_fields, order="date,move_name"
         )
-        journal_ids = set()
-        full_reconcile_ids = set()
-        taxes_ids = set()
-        analytic_ids = set()
-        full_reconcile_data = {}
+        ml_data = self._init_period_ml_aux_data()
         acc_prt_account_ids = self._get_acc_prt_accounts_ids(company_id, grouped_by)
         for move_line in move_lines:
-            journal_ids.add(move_line["journal_id"][0])
-            for tax_id in move_line["tax_ids"]:
-                taxes_ids.add(tax_id)
-            for ids in (move_line["analytic_distribution"] or {}).keys():
-                analytic_ids.update(map(int, ids.split(",")))
-            if move_line["full_reconcile_id"]:
-                rec_id = move_line["full_reconcile_id"][0]
-                if rec_id not in full_reconcile_ids:
-                    full_reconcile_data.update(
-                        {
-                            rec_id: {
-                                "id": rec_id,
-                                "name": move_line["matching_number"],
-                            }
-                        }
-                    )
-                    full_reconcile_ids.add(rec_id)
-            acc_id = move_line["account_id"][0]
-            ml_id = move_line["id"]
-            if acc_id not in gen_ld_data.keys():
-                gen_ld_data[acc_id] = self._initialize_data(foreign_currency)
-                gen_ld_data[acc_id]["id"] = acc_id
-                gen_ld_data[acc_id]["mame"] = move_line["account_id"][1]
-                gen_ld_data[acc_id][grouped_by] = False
-            if acc_id in acc_prt_account_ids:
-                item_ids = self._prepare_ml_items(move_line, grouped_by)
-                for item in item_ids:
-                    item_id = item["id"]
-                    if item_id not in gen_ld_data[acc_id]:
-                        gen_ld_data[acc_id][grouped_by] = True
-                        gen_ld_data[acc_id][item_id] = self._initialize_data(
-                            foreign_currency
-                        )
-                        gen_ld_data[acc_id][item_id]["id"] = item_id
-                        gen_ld_data[acc_id][item_id]["name"] = item["name"]
-                    gen_ld_data[acc_id][item_id][ml_id] = self._get_move_line_data(
-                        move_line
-                    )
-                    gen_ld_data[acc_id][item_id]["fin_bal"]["credit"] += move_line[
-                        "credit"
-                    ]
-                    gen_ld_data[acc_id][item_id]["fin_bal"]["debit"] += move_line[
-                        "debit"
-                    ]
-                    gen_ld_data[acc_id][item_id]["fin_bal"]["balance"] += move_line[
-                        "balance"
-                    ]
-                    if foreign_currency:
-                        gen_ld_data[acc_id][item_id]["fin_bal"][
-                            "bal_curr"
-                        ] += move_line["amount_currency"]
-            else:
-                gen_ld_data[acc_id][ml_id] = self._get_move_line_data(move_line)
-            gen_ld_data[acc_id]["fin_bal"]["credit"] += move_line["credit"]
-            gen_ld_data[acc_id]["fin_bal"]["debit"] += move_line["debit"]
-            gen_ld_data[acc_id]["fin_bal"]["balance"] += move_line["balance"]
-            if foreign_currency:
-                gen_ld_data[acc_id]["fin_bal"]["bal_curr"] += move_line[
-                    "amount_currency"
-                ]
+            self._add_period_ml(
+                gen_ld_data,
+                move_line,
+                ml_data,
+                foreign_currency,
+                grouped_by,
+                acc_prt_account_ids,
+            )
+        journal_ids = ml_data["journal_ids"]
+        taxes_ids = ml_data["taxes_ids"]
+        analytic_ids = ml_data["analytic_ids"]
+        full_reconcile_data = ml_data["full_reconcile_data"]
         journals_data = self._get_journals_data(list(journal_ids))
         accounts_data = self._get_accounts_data(gen_ld_data.keys())
         taxes_data = self._get_taxes_data(list(taxes_ids))
@@ -745,71 +773,23 @@ class GeneralLedgerReport(models.AbstractModel):
             list_centralized_ml += list(centralized_ml[jnl_id].values())
         return list_centralized_ml
 
-    # flake8: noqa: C901
-    def _get_report_values(self, docids, data):
-        res = super()._get_report_values(docids, data)
-        wizard_id = data["wizard_id"]
-        company = self.env["res.company"].browse(data["company_id"])
-        company_id = data["company_id"]
-        date_to = data["date_to"]
-        date_from = data["date_from"]
-        partner_ids = data["partner_ids"]
-        account_ids = data["account_ids"]
-        cost_center_ids = data["cost_center_ids"]
-        grouped_by = data["grouped_by"]
-        hide_account_at_0 = data["hide_account_at_0"]
+    def _finalize_general_ledger(
+        self,
+        general_ledger,
+        gen_ld_data,
+        rec_after_date_to_ids,
+        data,
+        company,
+    ):
+        """Apply centralization and foreign currency adjustments to the
+        accounts of ``general_ledger`` (modified in place)."""
         foreign_currency = data["foreign_currency"]
-        only_posted_moves = data["only_posted_moves"]
-        unaffected_earnings_account = data["unaffected_earnings_account"]
-        fy_start_date = data["fy_start_date"]
-        extra_domain = data["domain"]
-        gen_ld_data = self._get_initial_balance_data(
-            account_ids,
-            partner_ids,
-            company_id,
-            date_from,
-            foreign_currency,
-            only_posted_moves,
-            unaffected_earnings_account,
-            fy_start_date,
-            cost_center_ids,
-            extra_domain,
-            grouped_by,
-        )
-        centralize = data["centralize"]
-        (
-            gen_ld_data,
-            accounts_data,
-            journals_data,
-            full_reconcile_data,
-            taxes_data,
-            analytic_data,
-            rec_after_date_to_ids,
-        ) = self._get_period_ml_data(
-            account_ids,
-            partner_ids,
-            company_id,
-            foreign_currency,
-            only_posted_moves,
-            date_from,
-            date_to,
-            gen_ld_data,
-            cost_center_ids,
-            extra_domain,
-            grouped_by,
-        )
-        general_ledger = self._create_general_ledger(
-            gen_ld_data,
-            accounts_data,
-            grouped_by,
-            rec_after_date_to_ids,
-            hide_account_at_0,
-        )
-        if centralize:
+        grouped_by = data["grouped_by"]
+        if data["centralize"]:
             for account in general_ledger:
                 if account["centralized"]:
                     centralized_ml = self._get_centralized_ml(
-                        account, date_to, grouped_by
+                        account, data["date_to"], grouped_by
                     )
                     account["move_lines"] = centralized_ml
                     account["move_lines"] = self._recalculate_cumul_balance(
@@ -820,7 +800,6 @@ class GeneralLedgerReport(models.AbstractModel):
                     if account[grouped_by]:
                         account[grouped_by] = False
                         del account["list_grouped"]
-        general_ledger = sorted(general_ledger, key=lambda k: k["code"])
         # Set the bal_curr of the initial balance to 0 if it does not correspond
         # (reducing the corresponding of the bal_curr of the initial balance).
         for gl_item in general_ledger:
@@ -877,6 +856,220 @@ class GeneralLedgerReport(models.AbstractModel):
             if not gl_item["currency_id"] and len(fin_bal_currency_ids) == 1:
                 fin_bal_currency_id = fin_bal_currency_ids[0]
             gl_item["fin_bal_currency_id"] = fin_bal_currency_id
+        return general_ledger
+
+    def _get_period_ml_account_ids(self, domain):
+        groups = self.env["account.move.line"].read_group(
+            domain=domain, fields=["account_id"], groupby=["account_id"]
+        )
+        return [group["account_id"][0] for group in groups]
+
+    def _get_period_ml_stream_query(self, domain, account_ids):
+        """Query returning the ids of the period move lines ordered the way the
+        general ledger is rendered: accounts by code (``account_ids`` must be
+        given in that order), then by date and entry, as the in-memory mode
+        does."""
+        query = self.env["account.move.line"]._search(domain)
+        query.order = SQL(
+            "array_position(%s::int[], account_move_line.account_id), "
+            "account_move_line.date, account_move_line.move_name, "
+            "account_move_line.id",
+            list(account_ids),
+        )
+        return query.select("account_move_line.id")
+
+    def _iter_period_move_lines(self, domain, account_ids, chunk_size):
+        """Yield the period move lines (as ``search_read`` dictionaries) using
+        a server-side cursor, so that no more than ``chunk_size`` lines are
+        held in memory (and in the ORM cache) at a time."""
+        aml_model = self.env["account.move.line"]
+        ml_fields = self._get_ml_fields()
+        query = self._get_period_ml_stream_query(domain, account_ids)
+        self.env.flush_all()
+        cursor_name = "general_ledger_%s" % uuid.uuid4().hex
+        with self.env.cr._cnx.cursor(cursor_name) as stream_cr:
+            stream_cr.itersize = chunk_size
+            stream_cr.execute(query.code, query.params)
+            while True:
+                rows = stream_cr.fetchmany(chunk_size)
+                if not rows:
+                    break
+                move_lines = aml_model.browse([row[0] for row in rows])
+                yield from move_lines.read(ml_fields)
+                move_lines.invalidate_recordset()
+
+    def _iter_general_ledger(
+        self,
+        data,
+        gen_ld_data,
+        accounts_data,
+        account_ids,
+        domain,
+        aux_data,
+    ):
+        """Yield the general ledger accounts one at a time.
+
+        Only the move lines of the account being built are kept in memory.
+        Journals, taxes and analytic accounts data are added to the
+        dictionaries of ``aux_data`` before yielding each account, so the
+        renderers can look them up while iterating.
+        """
+        if not account_ids:
+            return
+        company = self.env["res.company"].browse(data["company_id"])
+        grouped_by = data["grouped_by"]
+        foreign_currency = data["foreign_currency"]
+        chunk_size = data.get("stream_chunk_size") or self._stream_chunk_size
+        acc_prt_account_ids = self._get_acc_prt_accounts_ids(
+            data["company_id"], grouped_by
+        )
+        move_lines = self._iter_period_move_lines(domain, account_ids, chunk_size)
+        move_line = next(move_lines, None)
+        for acc_id in account_ids:
+            acc_ld_data = {}
+            if acc_id in gen_ld_data:
+                acc_ld_data[acc_id] = gen_ld_data.pop(acc_id)
+            ml_data = self._init_period_ml_aux_data()
+            while move_line and move_line["account_id"][0] == acc_id:
+                self._add_period_ml(
+                    acc_ld_data,
+                    move_line,
+                    ml_data,
+                    foreign_currency,
+                    grouped_by,
+                    acc_prt_account_ids,
+                )
+                move_line = next(move_lines, None)
+            if not acc_ld_data:
+                continue
+            aux_data["journals_data"].update(
+                self._get_journals_data(
+                    list(ml_data["journal_ids"] - set(aux_data["journals_data"]))
+                )
+            )
+            aux_data["taxes_data"].update(
+                self._get_taxes_data(
+                    list(ml_data["taxes_ids"] - set(aux_data["taxes_data"]))
+                )
+            )
+            aux_data["analytic_data"].update(
+                self._get_analytic_data(
+                    list(ml_data["analytic_ids"] - set(aux_data["analytic_data"]))
+                )
+            )
+            rec_after_date_to_ids = self._get_reconciled_after_date_to_ids(
+                ml_data["full_reconcile_data"].keys(), data["date_to"]
+            )
+            general_ledger = self._create_general_ledger(
+                acc_ld_data,
+                accounts_data,
+                grouped_by,
+                rec_after_date_to_ids,
+                data["hide_account_at_0"],
+            )
+            yield from self._finalize_general_ledger(
+                general_ledger, acc_ld_data, rec_after_date_to_ids, data, company
+            )
+
+    def _get_streamed_ledger_data(self, data, gen_ld_data):
+        domain = self._get_period_domain(
+            data["account_ids"],
+            data["partner_ids"],
+            data["company_id"],
+            data["only_posted_moves"],
+            data["date_to"],
+            data["date_from"],
+            data["cost_center_ids"],
+        )
+        if data["domain"]:
+            domain += data["domain"]
+        account_ids = set(gen_ld_data.keys())
+        account_ids.update(self._get_period_ml_account_ids(domain))
+        accounts_data = self._get_accounts_data(list(account_ids))
+        account_ids = sorted(account_ids, key=lambda a: accounts_data[a]["code"])
+        aux_data = {
+            "journals_data": {},
+            "taxes_data": {},
+            "analytic_data": {},
+        }
+        general_ledger = self._iter_general_ledger(
+            data, gen_ld_data, accounts_data, account_ids, domain, aux_data
+        )
+        return general_ledger, accounts_data, aux_data
+
+    def _get_report_values(self, docids, data):
+        res = super()._get_report_values(docids, data)
+        wizard_id = data["wizard_id"]
+        company = self.env["res.company"].browse(data["company_id"])
+        company_id = data["company_id"]
+        date_to = data["date_to"]
+        date_from = data["date_from"]
+        partner_ids = data["partner_ids"]
+        account_ids = data["account_ids"]
+        cost_center_ids = data["cost_center_ids"]
+        grouped_by = data["grouped_by"]
+        hide_account_at_0 = data["hide_account_at_0"]
+        foreign_currency = data["foreign_currency"]
+        only_posted_moves = data["only_posted_moves"]
+        unaffected_earnings_account = data["unaffected_earnings_account"]
+        fy_start_date = data["fy_start_date"]
+        extra_domain = data["domain"]
+        gen_ld_data = self._get_initial_balance_data(
+            account_ids,
+            partner_ids,
+            company_id,
+            date_from,
+            foreign_currency,
+            only_posted_moves,
+            unaffected_earnings_account,
+            fy_start_date,
+            cost_center_ids,
+            extra_domain,
+            grouped_by,
+        )
+        centralize = data["centralize"]
+        if data.get("stream_move_lines"):
+            # The ledger is a generator: accounts are built while rendering
+            general_ledger, accounts_data, aux_data = self._get_streamed_ledger_data(
+                data, gen_ld_data
+            )
+            journals_data = aux_data["journals_data"]
+            taxes_data = aux_data["taxes_data"]
+            analytic_data = aux_data["analytic_data"]
+            full_reconcile_data = {}
+        else:
+            (
+                gen_ld_data,
+                accounts_data,
+                journals_data,
+                full_reconcile_data,
+                taxes_data,
+                analytic_data,
+                rec_after_date_to_ids,
+            ) = self._get_period_ml_data(
+                account_ids,
+                partner_ids,
+                company_id,
+                foreign_currency,
+                only_posted_moves,
+                date_from,
+                date_to,
+                gen_ld_data,
+                cost_center_ids,
+                extra_domain,
+                grouped_by,
+            )
+            general_ledger = self._create_general_ledger(
+                gen_ld_data,
+                accounts_data,
+                grouped_by,
+                rec_after_date_to_ids,
+                hide_account_at_0,
+            )
+            general_ledger = self._finalize_general_ledger(
+                general_ledger, gen_ld_data, rec_after_date_to_ids, data, company
+            )
+            general_ledger = sorted(general_ledger, key=lambda k: k["code"])
         res.update(
             {
                 "doc_ids": [wizard_id],
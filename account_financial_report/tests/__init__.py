@@ -7,4 +7,6 @@ from . import test_journal_ledger
 from . import test_open_items
 from . import test_trial_balance
 from . import test_vat_report
+from . import test_monthly_balance
 from . import test_age_report_configuration
+from . import test_report_job
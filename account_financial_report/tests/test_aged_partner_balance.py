@@ -1,6 +1,8 @@
 #  Copyright 2021 Simone Rubino - Agile Business Group
 #  License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+from datetime import date
+
 from odoo.tests import TransactionCase, tagged
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT, test_reports
 
@@ -122,3 +124,39 @@ class TestAgedPartnerBalance(TransactionCase):
             data=data,
         )
         self.assertTrue(result)
+
+    def test_aging_buckets(self):
+        """Residuals are spread over the standard and configured intervals."""
+        self.account_age_report_config.line_ids = [
+            (0, 0, {"name": "31-60", "inferior_limit": 60})
+        ]
+        report = self.env[
+            "report.account_financial_report.aged_partner_balance"
+        ].with_context(age_partner_config=self.account_age_report_config)
+        date_at = date(2024, 6, 30)
+        due_dates = [
+            False,
+            date(2024, 7, 15),
+            date(2024, 6, 15),
+            date(2024, 5, 31),
+            date(2024, 5, 15),
+            date(2023, 12, 31),
+        ]
+        residuals = [1.0, 2.0, 4.0, 8.0, 16.0, 32.0]
+        matrix = report._get_aging_matrix(residuals, due_dates, date_at).tolist()
+        # current, 30_days, 60_days, 90_days, 120_days, older, 1-30, 31-60
+        self.assertEqual(matrix[0], [1.0, 0, 0, 0, 0, 0, 0, 0])
+        self.assertEqual(matrix[1], [2.0, 0, 0, 0, 0, 0, 0, 0])
+        self.assertEqual(matrix[2], [0, 4.0, 0, 0, 0, 0, 4.0, 0])
+        self.assertEqual(matrix[3], [0, 8.0, 0, 0, 0, 0, 8.0, 0])
+        self.assertEqual(matrix[4], [0, 0, 16.0, 0, 0, 0, 0, 16.0])
+        self.assertEqual(matrix[5], [0, 0, 0, 0, 0, 32.0, 0, 0])
+        ag_pb_data = report._initialize_account({}, 1)
+        report._initialize_partner(ag_pb_data, 1, 2)
+        report._compute_aging_amounts(
+            ag_pb_data, [(1, 2)] * len(residuals), residuals, due_dates, date_at
+        )
+        self.assertEqual(ag_pb_data[1]["residual"], 63.0)
+        self.assertEqual(ag_pb_data[1][2]["30_days"], 12.0)
+        aged_partner_data = report._calculate_percent([ag_pb_data[1]])
+        self.assertEqual(aged_partner_data[0]["percent_older"], 50.79)
@@ -5,6 +5,9 @@
 
 import time
 from datetime import date
+from io import BytesIO
+
+import xlsxwriter
 
 from odoo import api, fields
 from odoo.tests import tagged
@@ -101,7 +104,9 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
         move = self.env["account.move"].create(move_vals)
         move.action_post()
 
-    def _get_report_lines(self, with_partners=False, account_ids=False):
+    def _get_report_lines(
+        self, with_partners=False, account_ids=False, stream_move_lines=False
+    ):
         centralize = True
         if with_partners:
             centralize = False
@@ -116,12 +121,15 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
                 "account_ids": account_ids,
                 "fy_start_date": self.fy_date_start,
                 "centralize": centralize,
+                "stream_move_lines": stream_move_lines,
             }
         )
         data = general_ledger._prepare_report_data()
         res_data = self.env[
             "report.account_financial_report.general_ledger"
         ]._get_report_values(general_ledger, data)
+        if stream_move_lines:
+            res_data["general_ledger"] = list(res_data["general_ledger"])
         return res_data
 
     @api.model
@@ -687,6 +695,53 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
         self.assertEqual(unaffected_fin_balance["credit"], 1000)
         self.assertEqual(unaffected_fin_balance["balance"], 500)
 
+    def test_05_stream_move_lines(self):
+        self._add_move(
+            date=self.previous_fy_date_end,
+            receivable_debit=1000,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=1000,
+        )
+        self._add_move(
+            date=self.fy_date_start,
+            receivable_debit=0,
+            receivable_credit=400,
+            income_debit=400,
+            income_credit=0,
+        )
+        self._add_move(
+            date=self.fy_date_end,
+            receivable_debit=250,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=250,
+        )
+        for with_partners in (False, True):
+            general_ledger = self._get_report_lines(with_partners=with_partners)[
+                "general_ledger"
+            ]
+            streamed_ledger = self._get_report_lines(
+                with_partners=with_partners, stream_move_lines=True
+            )["general_ledger"]
+            self.assertEqual(
+                [account["code"] for account in streamed_ledger],
+                [account["code"] for account in general_ledger],
+            )
+            for account_id in (self.receivable_account.id, self.income_account.id):
+                self.assertEqual(
+                    self._get_initial_balance(account_id, streamed_ledger),
+                    self._get_initial_balance(account_id, general_ledger),
+                )
+                self.assertEqual(
+                    self._get_final_balance(account_id, streamed_ledger),
+                    self._get_final_balance(account_id, general_ledger),
+                )
+        receivable_fin_balance = self._get_final_balance(
+            self.receivable_account.id, streamed_ledger
+        )
+        self.assertEqual(receivable_fin_balance["balance"], 850)
+
     def test_partner_filter(self):
         partner_1 = self.env.ref("base.res_partner_1")
         partner_2 = self.env.ref("base.res_partner_2")
@@ -731,3 +786,24 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
         wizard.onchange_date_range_id()
         self.assertEqual(wizard.date_from, date(2018, 1, 1))
         self.assertEqual(wizard.date_to, date(2018, 12, 31))
+
+    def test_xlsx_currency_format_cache(self):
+        report_model = self.env["report.a_f_r.report_general_ledger_xlsx"]
+        workbook = xlsxwriter.Workbook(BytesIO())
+        report_data = {"workbook": workbook}
+        report_model._define_formats(workbook, report_data)
+        eur = self.env.ref("base.EUR")
+        usd = self.env.ref("base.USD")
+        line = {"currency_id": eur.id, "currency_name": eur.name}
+        format_eur = report_model._get_currency_amt_format_dict(line, report_data)
+        for _i in range(10):
+            self.assertIs(
+                report_model._get_currency_amt_format_dict(line, report_data),
+                format_eur,
+            )
+        line = {"currency_id": usd.id, "account_group_id": 1}
+        format_usd = report_model._get_currency_amt_format_dict(line, report_data)
+        self.assertIsNot(format_usd, format_eur)
+        self.assertTrue(format_usd.bold)
+        self.assertEqual(len(report_data["currency_formats"]), 2)
+        workbook.close()
@@ -0,0 +1,123 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestMonthlyBalance(AccountTestInvoicingCommon):
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.receivable_account = cls.company_data["default_account_receivable"]
+        cls.income_account = cls.company_data["default_account_revenue"]
+        cls.monthly_balance = cls.env["account.move.line.monthly.balance"]
+
+    def _add_move(self, date, amount):
+        move = self.env["account.move"].create(
+            {
+                "journal_id": self.company_data["default_journal_misc"].id,
+                "date": date,
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": amount,
+                            "credit": 0,
+                            "account_id": self.receivable_account.id,
+                            "partner_id": self.partner_a.id,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": 0,
+                            "credit": amount,
+                            "account_id": self.income_account.id,
+                        },
+                    ),
+                ],
+            }
+        )
+        move.action_post()
+        return move
+
+    def _get_domain(self, date_to):
+        return [
+            ("company_id", "=", self.env.company.id),
+            ("account_id", "in", (self.receivable_account + self.income_account).ids),
+            ("move_id.state", "=", "posted"),
+            ("date", "<", date_to),
+        ]
+
+    def _get_balances(self, groups):
+        return {
+            group["account_id"][0]: (group["debit"], group["credit"], group["balance"])
+            for group in groups
+        }
+
+    def test_monthly_balance_sync(self):
+        move = self._add_move("2016-01-10", 100)
+        self._add_move("2016-02-20", 50)
+        rows = self.monthly_balance.search(
+            [("account_id", "=", self.receivable_account.id)]
+        )
+        self.assertEqual(
+            rows.filtered(
+                lambda r: r.date == fields.Date.to_date("2016-01-01")
+            ).balance,
+            100,
+        )
+        move.button_draft()
+        rows = self.monthly_balance.search(
+            [
+                ("account_id", "=", self.receivable_account.id),
+                ("date", "=", "2016-01-01"),
+            ]
+        )
+        self.assertEqual(rows.balance, 0)
+
+    def test_monthly_balance_move_date(self):
+        move = self._add_move("2016-01-10", 100)
+        move.with_context(sequence_mixin_constraint_bypass=True).date = "2016-03-05"
+        rows = self.monthly_balance.search(
+            [("account_id", "=", self.receivable_account.id)]
+        )
+        self.assertFalse(
+            sum(
+                rows.filtered(
+                    lambda r: r.date == fields.Date.to_date("2016-01-01")
+                ).mapped("balance")
+            )
+        )
+        self.assertEqual(
+            rows.filtered(
+                lambda r: r.date == fields.Date.to_date("2016-03-01")
+            ).balance,
+            100,
+        )
+
+    def test_read_group_balances(self):
+        self._add_move("2016-01-10", 100)
+        self._add_move("2016-02-05", 30)
+        self._add_move("2016-02-20", 50)
+        for date_to in ("2016-02-01", "2016-02-15", "2016-03-01"):
+            domain = self._get_domain(date_to)
+            expected = self.env["account.move.line"].read_group(
+                domain=domain,
+                fields=["account_id", "debit", "credit", "balance"],
+                groupby=["account_id"],
+            )
+            groups = self.monthly_balance._read_group_balances(
+                domain, ["account_id", "debit", "credit", "balance"], ["account_id"]
+            )
+            self.assertEqual(self._get_balances(groups), self._get_balances(expected))
+        # Draft items are not in the monthly balances
+        domain = self._get_domain("2016-03-01")
+        domain[2] = ("move_id.state", "in", ["posted", "draft"])
+        self.assertIsNone(self.monthly_balance._translate_domain(domain))
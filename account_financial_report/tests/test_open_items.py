@@ -69,3 +69,31 @@ class TestOpenItems(AccountTestInvoicingCommon):
         wizard.on_change_account_range()
         res = wizard._prepare_report_data()
         self.assertEqual(res["grouped_by"], wizard.grouped_by)
+
+    def test_open_items_residual_at_date(self):
+        invoice = self.init_invoice(
+            "out_invoice",
+            invoice_date="2020-01-10",
+            amounts=[1000.0],
+            taxes=[],
+            post=True,
+        )
+        self.env["account.payment.register"].with_context(
+            active_model="account.move", active_ids=invoice.ids
+        ).create({"amount": 400.0, "payment_date": "2020-02-15"})._create_payments()
+        receivable = self.company_data["default_account_receivable"]
+        report = self.env["report.account_financial_report.open_items"]
+
+        def get_residual(date_at):
+            move_lines = report._get_move_lines_at_date(
+                self.env.company.id,
+                receivable.ids,
+                self.partner_a.ids,
+                True,
+                False,
+                Date.to_date(date_at),
+            )
+            return sum(ml["amount_residual"] for ml in move_lines)
+
+        self.assertEqual(get_residual("2020-01-31"), 1000.0)
+        self.assertEqual(get_residual("2020-03-01"), 600.0)
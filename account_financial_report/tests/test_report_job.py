@@ -0,0 +1,85 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestReportJob(AccountTestInvoicingCommon):
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.job_model = cls.env["account.financial.report.job"]
+
+    def _create_wizard(self, date_to="2016-12-31"):
+        return self.env["trial.balance.report.wizard"].create(
+            {
+                "date_from": "2016-01-01",
+                "date_to": date_to,
+                "target_move": "posted",
+                "run_in_background": True,
+            }
+        )
+
+    def test_enqueue_reuses_job(self):
+        wizard = self._create_wizard()
+        action = wizard.button_export_xlsx()
+        job = self.job_model.search([], limit=1)
+        self.assertEqual(job.state, "pending")
+        self.assertEqual(action["res_id"], job.id)
+        self.assertEqual(str(job.date_to), "2016-12-31")
+        # Same parameters from another wizard: the queued job is reused
+        self._create_wizard().button_export_xlsx()
+        self.assertEqual(self.job_model.search_count([]), 1)
+        # Different parameters give a new job
+        self._create_wizard(date_to="2016-06-30").button_export_xlsx()
+        self.assertEqual(self.job_model.search_count([]), 2)
+
+    def test_invalidate_on_post(self):
+        wizard = self._create_wizard()
+        wizard.button_export_xlsx()
+        job = self.job_model.search([], limit=1)
+        job.state = "done"
+        invoice = self.init_invoice(
+            "out_invoice", invoice_date="2017-01-15", amounts=[100], taxes=[]
+        )
+        invoice.action_post()
+        self.assertEqual(job.state, "done")
+        invoice = self.init_invoice(
+            "out_invoice", invoice_date="2016-11-15", amounts=[100], taxes=[]
+        )
+        invoice.action_post()
+        self.assertEqual(job.state, "expired")
+        job.action_retry()
+        self.assertEqual(job.state, "pending")
+
+    def test_run_without_wizard(self):
+        wizard = self._create_wizard()
+        wizard.button_export_xlsx()
+        job = self.job_model.search([], limit=1)
+        # The transient wizard may be vacuumed before the job runs
+        wizard.unlink()
+        self.job_model._cron_run_jobs()
+        self.assertEqual(job.state, "done")
+        self.assertTrue(job.attachment_id)
+
+    def test_interrupted_job(self):
+        wizard = self._create_wizard()
+        wizard.button_export_xlsx()
+        job = self.job_model.search([], limit=1)
+        job.write(
+            {
+                "state": "running",
+                "date_started": fields.Datetime.subtract(
+                    fields.Datetime.now(), seconds=self.job_model._job_timeout + 60
+                ),
+            }
+        )
+        # A stale running job is not reused
+        self._create_wizard().button_export_xlsx()
+        self.assertEqual(self.job_model.search_count([]), 2)
+        self.job_model._cron_run_jobs()
+        self.assertEqual(job.state, "failed")
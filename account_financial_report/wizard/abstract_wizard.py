@@ -35,6 +35,10 @@ class AbstractWizard(models.AbstractModel):
         string="Company",
     )
     label_text_limit = fields.Integer(default=40)
+    run_in_background = fields.Boolean(
+        help="Render the PDF or XLSX file in background. The file of an "
+        "identical report is reused until a move is posted in its period.",
+    )
 
     def button_export_html(self):
         self.ensure_one()
@@ -46,13 +50,20 @@ class AbstractWizard(models.AbstractModel):
         self.ensure_one()
         self._set_default_wizard_values()
         report_type = "qweb-pdf"
-        return self._export(report_type)
+        return self._export_report(report_type)
 
     def button_export_xlsx(self):
         self.ensure_one()
         self._set_default_wizard_values()
         report_type = "xlsx"
-        return self._export(report_type)
+        return self._export_report(report_type)
+
+    def _export_report(self, report_type):
+        action = self._export(report_type)
+        if not self.run_in_background:
+            return action
+        job = self.env["account.financial.report.job"]._enqueue(self, action)
+        return job.action_download()
 
     def _limit_text(self, value, limit_field="label_text_limit"):
         limit = self[limit_field]
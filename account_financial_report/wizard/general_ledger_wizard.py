@@ -84,6 +84,12 @@ class GeneralLedgerReportWizard(models.TransientModel):
         string="Show Analytic Account",
         default=True,
     )
+    stream_move_lines = fields.Boolean(
+        help="Fetch the journal items of the period in chunks and build the "
+        "report one account at a time. Use it on very large ledgers to keep "
+        "memory usage bounded by the biggest account instead of the whole "
+        "period.",
+    )
     domain = fields.Char(
         string="Journal Items Domain",
         default=[],
@@ -312,6 +318,7 @@ class GeneralLedgerReportWizard(models.TransientModel):
             "unaffected_earnings_account": self.unaffected_earnings_account.id,
             "account_financial_report_lang": self.env.lang,
             "domain": self._get_account_move_lines_domain(),
+            "stream_move_lines": self.stream_move_lines,
         }
 
     def _prepare_report_data(self):
@@ -14,6 +14,7 @@
     "data": [
         "security/security.xml",
         "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "views/account_financial_risk_view.xml",
         "views/portal_templates.xml",
         "views/res_config_view.xml",
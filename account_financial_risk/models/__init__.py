@@ -1,4 +1,7 @@
 from . import account_invoice
+from . import account_move_line
+from . import account_partial_reconcile
 from . import res_company
 from . import res_config
 from . import res_partner
+from . import res_partner_risk
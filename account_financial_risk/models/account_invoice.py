@@ -39,21 +39,27 @@ class AccountMove(models.Model):
                 round=False,
             )
 
+    def write(self, vals):
+        if "state" in vals:
+            self.line_ids._schedule_risk_update()
+        return super().write(vals)
+
     def risk_exception_msg(self):
         self.ensure_one()
-        partner = self.partner_id.commercial_partner_id
+        partner = self.partner_id.commercial_partner_id.with_company(self.company_id)
+        risk = partner._get_stored_risk(self.company_id)
         exception_msg = ""
-        if partner.risk_exception:
+        if risk["risk_exception"]:
             exception_msg = _("Financial risk exceeded.\n")
         elif partner.risk_invoice_open_limit and (
-            (partner.risk_invoice_open + self.risk_amount_total_currency)
+            (risk["risk_invoice_open"] + self.risk_amount_total_currency)
             > partner.risk_invoice_open_limit
         ):
             exception_msg = _("This invoice exceeds the open invoices risk.\n")
         # If risk_invoice_draft_include this invoice included in risk_total
         elif not partner.risk_invoice_draft_include and (
             partner.risk_invoice_open_include
-            and (partner.risk_total + self.risk_amount_total_currency)
+            and (risk["risk_total"] + self.risk_amount_total_currency)
             > partner.credit_limit
         ):
             exception_msg = _("This invoice exceeds the financial risk.\n")
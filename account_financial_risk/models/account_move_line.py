@@ -0,0 +1,46 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+RISK_FIELDS = {
+    "partner_id",
+    "account_id",
+    "date",
+    "date_maturity",
+    "debit",
+    "credit",
+    "balance",
+    "amount_currency",
+    "currency_id",
+}
+
+
+class AccountMoveLine(models.Model):
+    _inherit = "account.move.line"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._schedule_risk_update()
+        return lines
+
+    def write(self, vals):
+        if RISK_FIELDS & set(vals):
+            self._schedule_risk_update()
+            res = super().write(vals)
+            self._schedule_risk_update()
+            return res
+        return super().write(vals)
+
+    def unlink(self):
+        self._schedule_risk_update()
+        return super().unlink()
+
+    def _schedule_risk_update(self):
+        """Update the stored risk of the partners of these lines in the
+        companies of the lines."""
+        for company in self.company_id:
+            self.filtered(
+                lambda line, company=company: line.company_id == company
+            ).partner_id._schedule_risk_update(company)
@@ -0,0 +1,21 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = "account.partial.reconcile"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        partials._schedule_risk_update()
+        return partials
+
+    def unlink(self):
+        self._schedule_risk_update()
+        return super().unlink()
+
+    def _schedule_risk_update(self):
+        (self.debit_move_id | self.credit_move_id)._schedule_risk_update()
@@ -19,3 +19,11 @@ class ResCompany(models.Model):
         "Useful when the flow comes from sales orders and the over-risk "
         "has already been allowed when confirming these.",
     )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "invoice_unpaid_margin" in vals:
+            self.env.ref(
+                "account_financial_risk.ir_cron_update_partner_risk"
+            )._trigger()
+        return res
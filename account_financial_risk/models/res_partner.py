@@ -7,12 +7,18 @@ from dateutil.relativedelta import relativedelta
 
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import split_every
 from odoo.tools.misc import str2bool
 
 
+RISK_UPDATE_KEY = "account_financial_risk.partner_ids"
+
+
 class ResPartner(models.Model):
     _inherit = "res.partner"
 
+    _risk_update_batch_size = 1000
+
     move_line_ids = fields.One2many(
         comodel_name="account.move.line",
         inverse_name="partner_id",
@@ -182,6 +188,12 @@ class ResPartner(models.Model):
         "config.",
     )
 
+    risk_ids = fields.One2many(
+        comodel_name="res.partner.risk",
+        inverse_name="partner_id",
+        string="Stored Risk",
+    )
+
     @api.model
     def _commercial_fields(self):
         return super()._commercial_fields() + [
@@ -488,29 +500,216 @@ class ResPartner(models.Model):
 
     @api.model
     def _search_risk_exception(self, operator, value):
-        commercial_partners = self.search(
-            [
-                ("customer_rank", ">", 0),
-                "|",
-                ("is_company", "=", True),
-                ("parent_id", "=", False),
-            ],
-            order="id",
-        )
-        risk_partner_ids = commercial_partners.filtered("risk_exception").ids
+        self._flush_risk_updates()
+        risk_domain = [
+            ("company_id", "in", self.env.companies.ids),
+            ("risk_exception", "=", True),
+        ]
         if (operator == "=" and value) or (operator == "!=" and not value):
-            return [("id", "in", risk_partner_ids)]
+            return [("risk_ids", "any", risk_domain)]
         else:
-            return [("id", "not in", risk_partner_ids)]
+            return [("risk_ids", "not any", risk_domain)]
 
     @api.model
     def _search_risk_remaining_percentage(self, operator, value):
         # Make risk_remaining_percentage searchable.
-        partners = self.search([("credit_limit", ">", 0)])
-        partner_ids = partners.filtered_domain(
-            [("risk_remaining_percentage", operator, value)]
-        ).ids
-        return [("id", "in", partner_ids)]
+        self._flush_risk_updates()
+        return [
+            (
+                "risk_ids",
+                "any",
+                [
+                    ("company_id", "in", self.env.companies.ids),
+                    ("credit_limit", ">", 0),
+                    ("risk_remaining_percentage", operator, value),
+                ],
+            )
+        ]
+
+    @api.model
+    def _get_risk_update_fields(self):
+        """Partner fields whose change updates the stored risk."""
+        res = [
+            "credit_limit",
+            "credit_currency",
+            "manual_credit_currency_id",
+            "property_account_receivable_id",
+            "parent_id",
+            "is_company",
+        ]
+        for risk_field in self._risk_field_list():
+            res.extend(risk_field[1:])
+        return res
+
+    def write(self, vals):
+        if self.ids and set(vals) & set(self._get_risk_update_fields()):
+            self._schedule_risk_update()
+        res = super().write(vals)
+        if "parent_id" in vals or "is_company" in vals:
+            self._schedule_risk_update()
+        return res
+
+    def _schedule_risk_update(self, companies=None):
+        """Update the stored risk of the commercial partners of these partners
+        in ``companies`` (all of them by default) before the transaction is
+        committed.
+
+        The modules adding risk fields computed from other records call it
+        when these records change, as done here by the journal items.
+        """
+        partner_ids = self.sudo().commercial_partner_id.ids
+        if not partner_ids:
+            return
+        precommit = self.env.cr.precommit
+        # {company id (0 for all the companies): commercial partner ids}
+        pending = precommit.data.setdefault(RISK_UPDATE_KEY, {})
+        if not pending:
+            precommit.add(self._flush_risk_updates)
+        for company_id in companies.ids if companies is not None else [0]:
+            pending.setdefault(company_id, set()).update(partner_ids)
+
+    @api.model
+    def _flush_risk_updates(self):
+        """Update now the stored risk of the partners scheduled for update."""
+        pending = self.env.cr.precommit.data.pop(RISK_UPDATE_KEY, None)
+        if not pending:
+            return
+        all_companies_ids = pending.pop(0, set())
+        if all_companies_ids:
+            self.browse(all_companies_ids).exists()._update_risk()
+        for company_id, partner_ids in pending.items():
+            partners = self.browse(partner_ids - all_companies_ids).exists()
+            if partners:
+                partners._update_risk(self.env["res.company"].browse(company_id))
+
+    def _flush_company_risk_update(self, company):
+        """Update now the stored risk of this commercial partner in
+        ``company`` if it is scheduled for update. The other updates are left
+        to the end of the transaction."""
+        self.ensure_one()
+        pending = self.env.cr.precommit.data.get(RISK_UPDATE_KEY) or {}
+        if self.id not in pending.get(company.id, set()) | pending.get(0, set()):
+            return
+        self._update_risk(company)
+        pending.get(company.id, set()).discard(self.id)
+
+    def _update_risk(self, companies=None):
+        """Compute the risk of these commercial partners in each company and
+        store it in ``res.partner.risk``. Partners without any risk amount,
+        exception nor credit limit don't have a stored risk."""
+        partners = self.sudo()
+        risk_model = self.env["res.partner.risk"].sudo()
+        if companies is None:
+            companies = self.env["res.company"].sudo().search([])
+        risk_fields = [risk_field[0] for risk_field in self._risk_field_list()]
+        computed_fields = risk_fields + [
+            "risk_total",
+            "risk_amount_exceeded",
+            "risk_exception",
+            "risk_currency_id",
+            "risk_remaining_percentage",
+        ]
+        today = fields.Date.context_today(self)
+        for company in companies:
+            company_partners = partners.with_company(company).with_context(
+                allowed_company_ids=company.ids
+            )
+            # The risk fields don't depend on the company in the cache
+            company_partners.invalidate_recordset(computed_fields)
+            risks = {
+                risk.partner_id.id: risk
+                for risk in risk_model.search(
+                    [
+                        ("partner_id", "in", partners.ids),
+                        ("company_id", "=", company.id),
+                    ]
+                )
+            }
+            to_create = []
+            to_unlink = risk_model
+            for partner in company_partners:
+                risk_amounts = {fname: partner[fname] for fname in risk_fields}
+                risk = risks.get(partner.id, risk_model)
+                if not (
+                    partner.risk_exception
+                    or partner.credit_limit
+                    or any(risk_amounts.values())
+                ):
+                    to_unlink |= risk
+                    continue
+                vals = {
+                    "currency_id": partner.risk_currency_id.id,
+                    "risk_amounts": risk_amounts,
+                    "risk_total": partner.risk_total,
+                    "risk_amount_exceeded": partner.risk_amount_exceeded,
+                    "risk_exception": partner.risk_exception,
+                    "credit_limit": partner.credit_limit,
+                    "risk_remaining_percentage": partner.risk_remaining_percentage,
+                    "date": today,
+                }
+                if risk:
+                    risk.write(vals)
+                else:
+                    vals.update(partner_id=partner.id, company_id=company.id)
+                    to_create.append(vals)
+            to_unlink.unlink()
+            risk_model.create(to_create)
+        partners.invalidate_recordset(computed_fields)
+
+    def _get_stored_risk(self, company):
+        """Return the stored risk of the commercial partner in ``company`` as
+        a dictionary with the risk fields, ``risk_total`` and
+        ``risk_exception``."""
+        self.ensure_one()
+        self.commercial_partner_id._flush_company_risk_update(company)
+        risk = (
+            self.env["res.partner.risk"]
+            .sudo()
+            .search(
+                [
+                    ("partner_id", "=", self.commercial_partner_id.id),
+                    ("company_id", "=", company.id),
+                ],
+                limit=1,
+            )
+        )
+        res = {risk_field[0]: 0.0 for risk_field in self._risk_field_list()}
+        res.update(risk.risk_amounts or {})
+        res.update(risk_total=risk.risk_total, risk_exception=risk.risk_exception)
+        return res
+
+    @api.model
+    def _get_risk_update_partner_ids(self):
+        """Commercial partners whose stored risk can change over time, because
+        they have open journal items, a credit limit or a stored risk."""
+        self.env.flush_all()
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT rp.commercial_partner_id
+            FROM account_move_line aml
+            JOIN res_partner rp ON rp.id = aml.partner_id
+            WHERE aml.account_type = 'asset_receivable'
+                AND NOT aml.reconciled
+            UNION
+            SELECT rp.commercial_partner_id
+            FROM ir_property ip
+            JOIN res_partner rp
+                ON ip.res_id = 'res.partner,' || rp.id
+            WHERE ip.name = 'credit_limit' AND ip.value_float != 0
+            UNION
+            SELECT partner_id FROM res_partner_risk
+            """
+        )
+        return [row[0] for row in self.env.cr.fetchall() if row[0]]
+
+    @api.model
+    def _cron_update_risk(self):
+        """Update the stored risk of all the partners with open items, as the
+        open amounts become unpaid with the time and currency rates change."""
+        partner_ids = self._get_risk_update_partner_ids()
+        for batch_ids in split_every(self._risk_update_batch_size, partner_ids):
+            self.browse(batch_ids).exists()._update_risk()
+            self.env.invalidate_all()
 
     @api.model
     def _max_risk_date_due(self):
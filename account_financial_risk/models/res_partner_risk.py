@@ -0,0 +1,65 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import fields, models
+
+
+class ResPartnerRisk(models.Model):
+    """Risk of a commercial partner in a company, stored when the journal
+    items, reconciliations or risk settings of the partner change. Used to
+    check the risk on invoice validation and to search partners in risk
+    without computing the risk of every customer."""
+
+    _name = "res.partner.risk"
+    _description = "Partner Financial Risk"
+    _order = "partner_id, company_id"
+
+    partner_id = fields.Many2one(
+        comodel_name="res.partner",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete="cascade",
+    )
+    company_id = fields.Many2one(
+        comodel_name="res.company",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete="cascade",
+    )
+    currency_id = fields.Many2one(comodel_name="res.currency", readonly=True)
+    risk_amounts = fields.Json(
+        readonly=True, help="Amount of each risk field of the partner"
+    )
+    risk_total = fields.Monetary(readonly=True)
+    risk_amount_exceeded = fields.Monetary(readonly=True)
+    risk_exception = fields.Boolean(readonly=True)
+    credit_limit = fields.Float(readonly=True)
+    risk_remaining_percentage = fields.Float(readonly=True)
+    date = fields.Date(readonly=True, help="Date of the computation of the risk")
+
+    _sql_constraints = [
+        (
+            "partner_company_uniq",
+            "unique(partner_id, company_id)",
+            "Only one risk record by partner and company is allowed.",
+        )
+    ]
+
+    def init(self):
+        # Partners in risk and remaining risk of the partners with a credit
+        # limit, searched from the partner list filters
+        self.env.cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS res_partner_risk_exception_index
+            ON res_partner_risk (company_id, partner_id) WHERE risk_exception
+            """
+        )
+        self.env.cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS res_partner_risk_remaining_index
+            ON res_partner_risk (company_id, risk_remaining_percentage)
+            WHERE credit_limit > 0
+            """
+        )
@@ -7,6 +7,7 @@ from odoo import fields
 from odoo.exceptions import UserError
 from odoo.tests import TransactionCase
 
+from odoo.addons.account_financial_risk.models.res_partner import RISK_UPDATE_KEY
 from odoo.addons.base.tests.common import DISABLED_MAIL_CONTEXT
 
 
@@ -296,3 +297,54 @@ class TestPartnerFinancialRisk(TransactionCase):
             self.partner.risk_amount_exceeded,
             self.partner.risk_total - self.partner.credit_limit,
         )
+
+    def test_stored_risk_update_company(self):
+        company = self.invoice.company_id
+        self.partner._flush_risk_updates()
+        self.invoice.line_ids.write({"date_maturity": "2017-01-01"})
+        pending = self.env.cr.precommit.data[RISK_UPDATE_KEY]
+        # Only the company of the journal items is updated
+        self.assertEqual(set(pending), {company.id})
+        self.assertIn(self.partner.id, pending[company.id])
+        # The risk check only updates the partner of the invoice
+        self.partner._get_stored_risk(company)
+        self.assertNotIn(self.partner.id, pending[company.id])
+
+    def test_stored_risk(self):
+        risk_model = self.env["res.partner.risk"]
+        self.partner._flush_risk_updates()
+        risk = risk_model.search([("partner_id", "=", self.partner.id)])
+        self.assertEqual(risk.company_id, self.invoice.company_id)
+        self.assertAlmostEqual(risk.risk_amounts["risk_invoice_draft"], 550.0)
+        self.assertAlmostEqual(risk.risk_total, 0.0)
+        self.partner.risk_invoice_open_include = True
+        self.invoice.action_post()
+        self.partner._flush_risk_updates()
+        self.assertAlmostEqual(risk.risk_amounts["risk_invoice_draft"], 0.0)
+        self.assertAlmostEqual(risk.risk_amounts["risk_invoice_open"], 550.0)
+        self.assertAlmostEqual(risk.risk_total, 550.0)
+        self.assertFalse(risk.risk_exception)
+        self.partner.credit_limit = 100.0
+        self.assertIn(
+            self.partner, self.partner.search([("risk_exception", "=", True)])
+        )
+        self.assertTrue(risk.risk_exception)
+        self.assertAlmostEqual(risk.risk_remaining_percentage, -450.0)
+        self.assertIn(
+            self.partner,
+            self.partner.search([("risk_remaining_percentage", "<", 0)]),
+        )
+        self.invoice.button_draft()
+        self.invoice.button_cancel()
+        self.partner._flush_risk_updates()
+        self.assertAlmostEqual(risk.risk_remaining_percentage, 100.0)
+        self.assertNotIn(
+            self.partner,
+            self.partner.search([("risk_remaining_percentage", "<", 0)]),
+        )
+        self.partner.credit_limit = 0.0
+        self.partner._flush_risk_updates()
+        self.assertFalse(risk.exists())
+        self.assertNotIn(
+            self.partner, self.partner.search([("risk_exception", "=", True)])
+        )
@@ -11,6 +11,7 @@
     "data": [
         "wizards/account_loan_increase_amount.xml",
         "data/ir_sequence_data.xml",
+        "data/ir_cron_data.xml",
         "security/ir.model.access.csv",
         "security/account_loan_security.xml",
         "wizards/account_loan_generate_entries_view.xml",
@@ -1,14 +1,18 @@
 # Copyright 2018 Creu Blanca
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+import bisect
 import logging
 import math
+import threading
+import time
 from datetime import datetime
 
 from dateutil.relativedelta import relativedelta
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import float_is_zero, groupby, split_every
 
 _logger = logging.getLogger(__name__)
 try:
@@ -21,6 +25,8 @@ class AccountLoan(models.Model):
     _name = "account.loan"
     _description = "Loan"
     _inherit = ["mail.thread", "mail.activity.mixin"]
+    # Number of loan lines of which the entries are created together
+    _entries_batch_size = 200
 
     def _default_company(self):
         return self.env.company
@@ -361,10 +367,13 @@ class AccountLoan(models.Model):
         self.write({"state": "closed"})
 
     def compute_lines(self):
-        self.ensure_one()
-        if self.state == "draft":
-            return self._compute_draft_lines()
-        return self._compute_posted_lines()
+        """Compute the lines of the loans, for instance after a change of
+        rate of several loans."""
+        for record in self:
+            if record.state == "draft":
+                record._compute_draft_lines()
+            else:
+                record._compute_posted_lines()
 
     def _compute_posted_lines(self):
         """
@@ -390,15 +399,22 @@ class AccountLoan(models.Model):
         amount = 0
         if not lines:
             return
+        # Principal of the lines from each date on, to get the principal
+        # payed in 12 months or more from every line in one pass
+        all_lines = self.line_ids.sorted(lambda r: r.date)
+        dates = all_lines.mapped("date")
+        principal_from = [0.0] * (len(all_lines) + 1)
+        for index in range(len(all_lines) - 1, -1, -1):
+            principal_from[index] = (
+                principal_from[index + 1] + all_lines[index].principal_amount
+            )
         final_sequence = min(lines.mapped("sequence"))
         for line in lines.sorted("sequence", reverse=True):
             date = line.date + relativedelta(months=12)
             if self.state == "draft" or line.sequence != final_sequence:
-                line.long_term_pending_principal_amount = sum(
-                    self.line_ids.filtered(lambda r, date=date: r.date >= date).mapped(
-                        "principal_amount"
-                    )
-                )
+                line.long_term_pending_principal_amount = principal_from[
+                    bisect.bisect_left(dates, date)
+                ]
             line.long_term_principal_amount = (
                 line.long_term_pending_principal_amount - amount
             )
@@ -413,11 +429,87 @@ class AccountLoan(models.Model):
             "rate": self.rate_period,
         }
 
-    def _compute_draft_lines(self):
+    def _get_line_interest(self, sequence, pending_principal_amount):
+        """Interests of the annuity `sequence` of the loan"""
+        if self.loan_type == "fixed-annuity-begin":
+            return -numpy_financial.ipmt(
+                self._loan_rate() / 100,
+                2,
+                self.periods - sequence + 1,
+                pending_principal_amount,
+                -self.residual_amount,
+                when="begin",
+            )
+        return pending_principal_amount * self._loan_rate() / 100
+
+    def _get_line_payment_amount(
+        self, sequence, pending_principal_amount, interests_amount
+    ):
+        """Amount to be payed on the annuity `sequence` of the loan"""
+        if sequence == self.periods:
+            return pending_principal_amount + interests_amount - self.residual_amount
+        if self.loan_type == "fixed-principal" and self.round_on_end:
+            return self.fixed_amount + interests_amount
+        if self.loan_type == "fixed-principal":
+            return (pending_principal_amount - self.residual_amount) / (
+                self.periods - sequence + 1
+            ) + interests_amount
+        if self.loan_type == "interest":
+            return interests_amount
+        if self.loan_type == "fixed-annuity" and self.round_on_end:
+            return self.fixed_amount
+        if self.loan_type == "fixed-annuity":
+            return self.currency_id.round(
+                -numpy_financial.pmt(
+                    self._loan_rate() / 100,
+                    self.periods - sequence + 1,
+                    pending_principal_amount,
+                    -self.residual_amount,
+                )
+            )
+        if self.loan_type == "fixed-annuity-begin" and self.round_on_end:
+            return self.fixed_amount
+        if self.loan_type == "fixed-annuity-begin":
+            return self.currency_id.round(
+                -numpy_financial.pmt(
+                    self._loan_rate() / 100,
+                    self.periods - sequence + 1,
+                    pending_principal_amount,
+                    -self.residual_amount,
+                    when="begin",
+                )
+            )
+
+    def _get_line_amounts(self, sequence, pending_principal_amount):
+        """Return the interests and the payment amount of the annuity
+        `sequence` of the loan, rounded as stored on the line."""
+        currency = self.currency_id
+        if (
+            sequence == self.periods
+            and self.round_on_end
+            and self.loan_type in ["fixed-annuity", "fixed-annuity-begin"]
+        ):
+            interests_amount = (
+                self.fixed_amount - pending_principal_amount + self.residual_amount
+            )
+        else:
+            interests_amount = self._get_line_interest(
+                sequence, pending_principal_amount
+            )
+        interests_amount = currency.round(interests_amount)
+        payment_amount = currency.round(
+            self._get_line_payment_amount(
+                sequence, pending_principal_amount, interests_amount
+            )
+        )
+        return interests_amount, payment_amount
+
+    def _get_draft_lines_vals(self):
+        """Return the values of all the lines of the loan, computed in one
+        pass over the periods."""
         self.ensure_one()
-        self.fixed_periods = self.periods
-        self.fixed_loan_amount = self.loan_amount
-        self.line_ids.unlink()
+        currency = self.currency_id
+        vals_list = []
         amount = self.loan_amount
         if self.start_date:
             date = self.start_date
@@ -429,12 +521,32 @@ class AccountLoan(models.Model):
             date = initial_date + delta
             initial_date = date
         for i in range(1, self.periods + 1):
-            line = self.env["account.loan.line"].create(
-                self._new_line_vals(i, date, amount)
+            vals = self._new_line_vals(i, date, amount)
+            pending_principal_amount = currency.round(amount)
+            interests_amount, payment_amount = self._get_line_amounts(
+                i, pending_principal_amount
+            )
+            rate = 0
+            if not float_is_zero(pending_principal_amount, precision_digits=2):
+                rate = interests_amount * 100 / pending_principal_amount
+            vals.update(
+                {
+                    "interests_amount": interests_amount,
+                    "payment_amount": payment_amount,
+                    "rate": rate,
+                }
             )
-            line._check_amount()
+            vals_list.append(vals)
             date = initial_date + delta * i
-            amount -= line.payment_amount - line.interests_amount
+            amount -= payment_amount - interests_amount
+        return vals_list
+
+    def _compute_draft_lines(self):
+        self.ensure_one()
+        self.fixed_periods = self.periods
+        self.fixed_loan_amount = self.loan_amount
+        self.line_ids.unlink()
+        self.env["account.loan.line"].create(self._get_draft_lines_vals())
         if self.long_term_loan_account_id:
             self._check_long_term_principal_amount()
 
@@ -465,6 +577,91 @@ class AccountLoan(models.Model):
         result["domain"] = [("loan_id", "=", self.id), ("move_type", "=", "in_invoice")]
         return result
 
+    @api.model
+    def _get_due_lines_domain(self, date, is_leasing):
+        return [
+            ("loan_state", "=", "posted"),
+            ("date", "<=", date),
+            ("is_leasing", "=", is_leasing),
+            ("move_ids", "=", False),
+        ]
+
+    @api.model
+    def _generate_entries(self, date, is_leasing, isolate_errors=False):
+        """
+        Generate the moves (the invoices for leasings) of the unfinished lines
+        up to date, by chunks of lines of the same journal and date.
+        With isolate_errors, each chunk is created in a savepoint and
+        committed: a failing chunk is created again line by line, and the
+        failing lines and the later lines of their loans are logged and left
+        for the next run.
+        :return: ids of the account.move generated
+        """
+        line_obj = self.env["account.loan.line"]
+        lines = line_obj.search(
+            self._get_due_lines_domain(date, is_leasing),
+            order="date, loan_id, sequence",
+        )
+        res = []
+        failed_loan_ids = set()
+        start = time.perf_counter()
+        for __, group_lines in groupby(lines, key=lambda r: (r.date, r.journal_id)):
+            group_ids = [line.id for line in group_lines]
+            for chunk_ids in split_every(self._entries_batch_size, group_ids):
+                chunk = line_obj.browse(chunk_ids)
+                if not isolate_errors:
+                    res += chunk._generate_entries_lines(is_leasing)
+                    continue
+                # The lines after a failing line of the loan can't be created
+                chunk = chunk.filtered(
+                    lambda line: line.loan_id.id not in failed_loan_ids
+                )
+                res += self._generate_isolated_entries(
+                    chunk, is_leasing, failed_loan_ids
+                )
+                if not getattr(threading.current_thread(), "testing", False):
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+                self.env.invalidate_all()
+        duration = time.perf_counter() - start
+        _logger.info(
+            "%s entries of %s loan lines created in %.2fs (%.1f lines/s)",
+            len(res),
+            len(lines),
+            duration,
+            len(lines) / duration if duration else 0,
+        )
+        return res
+
+    @api.model
+    def _generate_isolated_entries(self, lines, is_leasing, failed_loan_ids):
+        """Generate the entries of ``lines`` in a savepoint. If it fails, they
+        are generated line by line and the loans of the failing lines are
+        added to ``failed_loan_ids``."""
+        if not lines:
+            return []
+        try:
+            with self.env.cr.savepoint():
+                return lines._generate_entries_lines(is_leasing)
+        except Exception:
+            _logger.exception(
+                "Entries of %s loan lines of %s failed, creating them one by one",
+                len(lines),
+                lines[0].date,
+            )
+            self.env.invalidate_all()
+        res = []
+        for line in lines:
+            if line.loan_id.id in failed_loan_ids:
+                continue
+            try:
+                with self.env.cr.savepoint():
+                    res += line._generate_entries_lines(is_leasing)
+            except Exception:
+                _logger.exception("Entries of loan line %s failed", line.id)
+                self.env.invalidate_all()
+                failed_loan_ids.add(line.loan_id.id)
+        return res
+
     @api.model
     def _generate_loan_entries(self, date):
         """
@@ -472,23 +669,15 @@ class AccountLoan(models.Model):
         :param date:
         :return:
         """
-        res = []
-        for record in self.search(
-            [("state", "=", "posted"), ("is_leasing", "=", False)]
-        ):
-            lines = record.line_ids.filtered(
-                lambda r: r.date <= date and not r.move_ids
-            )
-            res += lines._generate_move()
-        return res
+        return self._generate_entries(date, is_leasing=False)
 
     @api.model
     def _generate_leasing_entries(self, date):
-        res = []
-        for record in self.search(
-            [("state", "=", "posted"), ("is_leasing", "=", True)]
-        ):
-            res += record.line_ids.filtered(
-                lambda r: r.date <= date and not r.move_ids
-            )._generate_invoice()
-        return res
+        return self._generate_entries(date, is_leasing=True)
+
+    @api.model
+    def _cron_generate_entries(self):
+        """Generate the due entries of the loans and the leasings"""
+        date = fields.Date.context_today(self)
+        self._generate_entries(date, is_leasing=False, isolate_errors=True)
+        self._generate_entries(date, is_leasing=True, isolate_errors=True)
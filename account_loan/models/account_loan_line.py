@@ -8,10 +8,6 @@ from odoo.exceptions import UserError
 from odoo.tools import float_is_zero
 
 _logger = logging.getLogger(__name__)
-try:
-    import numpy_financial
-except (OSError, ImportError) as err:
-    _logger.error(err)
 
 
 class AccountLoanLine(models.Model):
@@ -125,6 +121,15 @@ class AccountLoanLine(models.Model):
     has_moves = fields.Boolean(compute="_compute_has_moves")
     has_invoices = fields.Boolean(compute="_compute_has_invoices")
 
+    def init(self):
+        # Lines of the posted loans searched by date to generate the entries
+        self.env.cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS account_loan_line_loan_state_date_index
+            ON account_loan_line (loan_state, date)
+            """
+        )
+
     @api.depends("interests_amount")
     def _compute_rate(self):
         for record in self:
@@ -178,43 +183,9 @@ class AccountLoanLine(models.Model):
         Computes the payment amount
         :return: Amount to be payed on the annuity
         """
-        if self.sequence == self.loan_id.periods:
-            return (
-                self.pending_principal_amount
-                + self.interests_amount
-                - self.loan_id.residual_amount
-            )
-        if self.loan_type == "fixed-principal" and self.loan_id.round_on_end:
-            return self.loan_id.fixed_amount + self.interests_amount
-        if self.loan_type == "fixed-principal":
-            return (self.pending_principal_amount - self.loan_id.residual_amount) / (
-                self.loan_id.periods - self.sequence + 1
-            ) + self.interests_amount
-        if self.loan_type == "interest":
-            return self.interests_amount
-        if self.loan_type == "fixed-annuity" and self.loan_id.round_on_end:
-            return self.loan_id.fixed_amount
-        if self.loan_type == "fixed-annuity":
-            return self.currency_id.round(
-                -numpy_financial.pmt(
-                    self.loan_id._loan_rate() / 100,
-                    self.loan_id.periods - self.sequence + 1,
-                    self.pending_principal_amount,
-                    -self.loan_id.residual_amount,
-                )
-            )
-        if self.loan_type == "fixed-annuity-begin" and self.loan_id.round_on_end:
-            return self.loan_id.fixed_amount
-        if self.loan_type == "fixed-annuity-begin":
-            return self.currency_id.round(
-                -numpy_financial.pmt(
-                    self.loan_id._loan_rate() / 100,
-                    self.loan_id.periods - self.sequence + 1,
-                    self.pending_principal_amount,
-                    -self.loan_id.residual_amount,
-                    when="begin",
-                )
-            )
+        return self.loan_id._get_line_payment_amount(
+            self.sequence, self.pending_principal_amount, self.interests_amount
+        )
 
     def _check_amount(self):
         """Recompute amounts if the annuity has not been processed"""
@@ -222,35 +193,16 @@ class AccountLoanLine(models.Model):
             raise UserError(
                 _("Amount cannot be recomputed if moves or invoices exists " "already")
             )
-        if (
-            self.sequence == self.loan_id.periods
-            and self.loan_id.round_on_end
-            and self.loan_type in ["fixed-annuity", "fixed-annuity-begin"]
-        ):
-            self.interests_amount = self.currency_id.round(
-                self.loan_id.fixed_amount
-                - self.pending_principal_amount
-                + self.loan_id.residual_amount
-            )
-            self.payment_amount = self.currency_id.round(self._compute_amount())
-        elif not self.loan_id.round_on_end:
-            self.interests_amount = self.currency_id.round(self._compute_interest())
-            self.payment_amount = self.currency_id.round(self._compute_amount())
-        else:
-            self.interests_amount = self._compute_interest()
-            self.payment_amount = self._compute_amount()
+        interests_amount, payment_amount = self.loan_id._get_line_amounts(
+            self.sequence, self.pending_principal_amount
+        )
+        self.interests_amount = interests_amount
+        self.payment_amount = payment_amount
 
     def _compute_interest(self):
-        if self.loan_type == "fixed-annuity-begin":
-            return -numpy_financial.ipmt(
-                self.loan_id._loan_rate() / 100,
-                2,
-                self.loan_id.periods - self.sequence + 1,
-                self.pending_principal_amount,
-                -self.loan_id.residual_amount,
-                when="begin",
-            )
-        return self.pending_principal_amount * self.loan_id._loan_rate() / 100
+        return self.loan_id._get_line_interest(
+            self.sequence, self.pending_principal_amount
+        )
 
     def _check_move_amount(self):
         """
@@ -381,24 +333,44 @@ class AccountLoanLine(models.Model):
         )
         return vals
 
+    def _check_previous_lines(self, message):
+        """Raise ``message`` if some lines of the loans before the lines of
+        ``self`` have no move yet."""
+        if not self:
+            return
+        pending_lines = self.search(
+            [
+                ("loan_id", "in", self.loan_id.ids),
+                ("move_ids", "=", False),
+                ("id", "not in", self.ids),
+            ]
+        )
+        first_dates = {}
+        for record in self:
+            first_date = first_dates.get(record.loan_id)
+            if not first_date or record.date < first_date:
+                first_dates[record.loan_id] = record.date
+        if any(line.date < first_dates[line.loan_id] for line in pending_lines):
+            raise UserError(message)
+
+    def _generate_entries_lines(self, is_leasing):
+        """Generate the invoices (leasings) or the moves of the lines."""
+        if is_leasing:
+            return self._generate_invoice()
+        return self._generate_move()
+
     def _generate_move(self, journal=False, account=False):
         """
         Computes and post the moves of loans
         :return: list of account.move generated
         """
-        res = []
-        for record in self:
-            if not record.move_ids:
-                if record.loan_id.line_ids.filtered(
-                    lambda r, record=record: r.date < record.date and not r.move_ids
-                ):
-                    raise UserError(_("Some moves must be created first"))
-                move = self.env["account.move"].create(
-                    record._move_vals(journal=journal, account=account)
-                )
-                move.action_post()
-                res.append(move.id)
-        return res
+        lines = self.filtered(lambda r: not r.move_ids)
+        lines._check_previous_lines(_("Some moves must be created first"))
+        moves = self.env["account.move"].create(
+            [line._move_vals(journal=journal, account=account) for line in lines]
+        )
+        moves.action_post()
+        return moves.ids
 
     def _long_term_move_vals(self):
         return {
@@ -417,34 +389,26 @@ class AccountLoanLine(models.Model):
         Computes invoices of leases
         :return: list of account.move generated
         """
-        res = []
-        for record in self:
-            if not record.move_ids:
-                if record.loan_id.line_ids.filtered(
-                    lambda r, record=record: r.date < record.date and not r.move_ids
-                ):
-                    raise UserError(_("Some invoices must be created first"))
-                invoice = self.env["account.move"].create(record._invoice_vals())
-                res.append(invoice.id)
-                for line in invoice.invoice_line_ids:
-                    line.tax_ids = line._get_computed_taxes()
-                invoice.flush_recordset()
-                invoice.filtered(
-                    lambda m: m.currency_id.round(m.amount_total) < 0
-                ).action_switch_move_type()
-                if record.loan_id.post_invoice:
-                    invoice.action_post()
-                if (
-                    record.long_term_loan_account_id
-                    and record.long_term_principal_amount != 0
-                ):
-                    move = self.env["account.move"].create(
-                        record._long_term_move_vals()
-                    )
-                    if record.loan_id.post_invoice:
-                        move.action_post()
-                    res.append(move.id)
-        return res
+        lines = self.filtered(lambda r: not r.move_ids)
+        lines._check_previous_lines(_("Some invoices must be created first"))
+        invoices = self.env["account.move"].create(
+            [line._invoice_vals() for line in lines]
+        )
+        for line in invoices.invoice_line_ids:
+            line.tax_ids = line._get_computed_taxes()
+        invoices.flush_recordset()
+        invoices.filtered(
+            lambda m: m.currency_id.round(m.amount_total) < 0
+        ).action_switch_move_type()
+        invoices.filtered(lambda m: m.loan_id.post_invoice).action_post()
+        long_term_lines = lines.filtered(
+            lambda r: r.long_term_loan_account_id and r.long_term_principal_amount != 0
+        )
+        moves = self.env["account.move"].create(
+            [line._long_term_move_vals() for line in long_term_lines]
+        )
+        moves.filtered(lambda m: m.loan_id.post_invoice).action_post()
+        return invoices.ids + moves.ids
 
     def _get_long_term_move_line_vals(self):
         return [
@@ -11,6 +11,7 @@ class AccountMove(models.Model):
         "account.loan.line",
         readonly=True,
         ondelete="restrict",
+        index="btree_not_null",
     )
     loan_id = fields.Many2one(
         "account.loan",
@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
 import logging
+from unittest.mock import patch
 
 from dateutil.relativedelta import relativedelta
 from freezegun import freeze_time
@@ -675,6 +676,51 @@ class TestLoan(BaseCommon):
         loan.button_draft()
         self.assertEqual(loan.state, "draft")
 
+    @mute_logger("odoo.models.unlink")
+    @freeze_time("2025-01-01")
+    def test_generate_entries_several_loans(self):
+        loans = self.create_loan("fixed-annuity", 10000, 1, 24) | self.create_loan(
+            "fixed-principal", 5000, 2, 12
+        )
+        for loan in loans:
+            self.post(loan)
+        with freeze_time("2025-03-15"):
+            self.env["account.loan"]._cron_generate_entries()
+        for loan in loans:
+            lines = loan.line_ids.sorted("sequence")
+            self.assertTrue(all(line.move_ids for line in lines[:3]))
+            self.assertFalse(lines[3:].mapped("move_ids"))
+            self.assertEqual(set(lines[:3].move_ids.mapped("state")), {"posted"})
+
+    @freeze_time("2025-01-01")
+    def test_generate_entries_failing_loan(self):
+        loans = self.create_loan("fixed-annuity", 10000, 1, 24) | self.create_loan(
+            "fixed-principal", 5000, 2, 12
+        )
+        for loan in loans:
+            self.post(loan)
+        failing_loan = loans[0]
+        line_class = type(self.env["account.loan.line"])
+        generate_move = line_class._generate_move
+        failing_calls = []
+
+        def _generate_move(lines, journal=False, account=False):
+            if failing_loan in lines.loan_id:
+                failing_calls.append(lines.ids)
+                raise UserError("Failing loan")
+            return generate_move(lines, journal=journal, account=account)
+
+        with patch.object(line_class, "_generate_move", _generate_move), mute_logger(
+            "odoo.addons.account_loan.models.account_loan"
+        ), freeze_time("2025-03-15"):
+            self.env["account.loan"]._cron_generate_entries()
+        # the chunk and then the lines of the failing loan were generated
+        self.assertTrue(failing_calls)
+        self.assertFalse(failing_loan.line_ids.move_ids)
+        lines = loans[1].line_ids.sorted("sequence")
+        self.assertTrue(all(line.move_ids for line in lines[:3]))
+        self.assertFalse(lines[3:].mapped("move_ids"))
+
     def post(self, loan):
         self.assertFalse(loan.move_ids)
         post = (
@@ -699,6 +745,36 @@ class TestLoan(BaseCommon):
             }
         )
 
+    @mute_logger("odoo.models.unlink")
+    @freeze_time("2025-01-01")
+    def test_compute_lines_several_loans(self):
+        loans = self.create_loan("fixed-annuity", 10000, 1, 60) | self.create_loan(
+            "fixed-principal", 5000, 2, 36
+        )
+        loans.write({"rate": 3, "long_term_loan_account_id": self.lt_loan_account.id})
+        loans.compute_lines()
+        for loan in loans:
+            lines = loan.line_ids.sorted("sequence")
+            self.assertEqual(lines[0].pending_principal_amount, loan.loan_amount)
+            for line, next_line in zip(lines, lines[1:]):
+                self.assertAlmostEqual(
+                    line.final_pending_principal_amount,
+                    next_line.pending_principal_amount,
+                    2,
+                )
+            self.assertAlmostEqual(lines[-1].final_pending_principal_amount, 0, 2)
+            for line in lines:
+                date = line.date + relativedelta(months=12)
+                self.assertAlmostEqual(
+                    line.long_term_pending_principal_amount,
+                    sum(
+                        lines.filtered(lambda r, d=date: r.date >= d).mapped(
+                            "principal_amount"
+                        )
+                    ),
+                    2,
+                )
+
     def create_loan(self, type_loan, amount, rate, periods):
         loan = self.env["account.loan"].create(
             {
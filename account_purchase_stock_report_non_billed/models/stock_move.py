@@ -18,49 +18,11 @@ class StockMove(models.Model):
         if non_purchase_move:
             return super(StockMove, non_purchase_move)._compute_currency_id()
 
-    def get_quantity_invoiced(self, invoice_lines):
+    def _get_invoice_move_types(self):
+        self.ensure_one()
         if self.purchase_line_id:
-            if not invoice_lines:
-                return 0
-            qty_invoiced = abs(
-                sum(
-                    invoice_lines.mapped(
-                        lambda line: line.quantity
-                        if (
-                            line.move_id.move_type == "in_invoice"
-                            and not self.to_refund
-                        )
-                        or (line.move_id.move_type == "in_refund" and self.to_refund)
-                        else -line.quantity
-                    )
-                )
-            )
-            # Check when grouping different moves in an invoice line
-            moves = invoice_lines.mapped("move_line_ids")
-            date_start = self.env.context.get("moves_date_start")
-            date_end = self.env.context.get("moves_date_end")
-            if date_start and date_end:
-                moves = moves.filtered(
-                    lambda ml: ml.state == "done"
-                    and (ml.date_done >= date_start and ml.date_done <= date_end)
-                )
-            total_qty = moves.get_total_devolution_moves()
-            if qty_invoiced != total_qty:
-                invoiced = 0.0
-                for move in moves:
-                    qty = (
-                        move.quantity
-                        if move.quantity <= (qty_invoiced - invoiced)
-                        else qty_invoiced - invoiced
-                    )
-                    if move.check_is_return():
-                        qty = -qty
-                    if move == self:
-                        return qty
-                    invoiced += qty
-                return 0
-            return self.quantity if not self.check_is_return() else -self.quantity
-        return super().get_quantity_invoiced(invoice_lines)
+            return "in_invoice", "in_refund"
+        return super()._get_invoice_move_types()
 
     def _set_not_invoiced_values(self, qty_to_invoice, invoiced_qty):
         self.ensure_one()
@@ -380,3 +380,27 @@ class TestAccountPurchaseStockReportNonBilled(common.TransactionCase):
         domain_ids = action["domain"][0][2]
         for move in picking.move_ids:
             self.assertIn(move.id, domain_ids)
+
+    def test_12_read_group_not_invoiced(self):
+        picking = self.get_picking_done_po()
+        moves = picking.move_ids.with_context(
+            non_billed_date=fields.Date.today(),
+            non_billed_date_start=fields.Date.today() - relativedelta(days=1),
+        )
+        groups = moves.read_group(
+            [("id", "in", moves.ids)],
+            ["quantity_not_invoiced:sum", "price_not_invoiced:sum"],
+            ["product_id"],
+        )
+        self.assertEqual(len(groups), 1)
+        self.assertAlmostEqual(groups[0]["quantity_not_invoiced"], 1.0)
+        self.assertAlmostEqual(groups[0]["price_not_invoiced"], 15.0)
+        inv_action = self.po.action_create_invoice()
+        invoice = self.env["account.move"].browse([(inv_action["res_id"])])
+        invoice.invoice_date = fields.Date.today()
+        invoice.action_post()
+        moves.invalidate_recordset(["quantity_not_invoiced", "price_not_invoiced"])
+        groups = moves.read_group(
+            [("id", "in", moves.ids)], ["quantity_not_invoiced:sum"], ["product_id"]
+        )
+        self.assertAlmostEqual(groups[0]["quantity_not_invoiced"], 0.0)
@@ -2,7 +2,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 {
     "name": "Account Sale Stock Report Non Billed",
-    "version": "17.0.1.0.0",
+    "version": "17.0.2.0.0",
     "license": "AGPL-3",
     "author": "Tecnativa, Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/account-financial-reporting",
@@ -11,7 +11,10 @@
         "views/res_config_settings_views.xml",
         "views/stock_move_non_billed_views.xml",
         "security/ir.model.access.csv",
+        "security/security.xml",
         "wizard/account_sale_stock_report_non_billed_wiz_views.xml",
+        "views/account_sale_stock_report_non_billed_snapshot_views.xml",
+        "data/ir_cron.xml",
     ],
     "installable": True,
     "maintainers": ["CarlosRoca13"],
@@ -1,4 +1,4 @@
-from . import account_move_line
+from . import account_sale_stock_report_non_billed_snapshot
 from . import res_company
 from . import res_config_settings
 from . import stock_move
@@ -0,0 +1,104 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models
+
+
+class AccountSaleStockReportNonBilledSnapshot(models.Model):
+    """Non billed stock moves at a month end, kept so the report of a closed
+    period can be opened again without computing it."""
+
+    _name = "account.sale.stock.report.non.billed.snapshot"
+    _description = "Non Billed Stock Moves Snapshot"
+    _order = "date_check desc, id desc"
+    _rec_name = "date_check"
+
+    company_id = fields.Many2one(
+        comodel_name="res.company",
+        required=True,
+        readonly=True,
+        default=lambda self: self.env.company,
+    )
+    date_check = fields.Date(string="Date", required=True, readonly=True)
+    stock_move_non_billed_threshold = fields.Date(readonly=True)
+    interval_restrict_invoices = fields.Boolean(
+        string="Restrict invoices using the date interval", readonly=True
+    )
+    stock_move_ids = fields.Many2many(
+        comodel_name="stock.move",
+        relation="stock_move_non_billed_snapshot_rel",
+        column1="snapshot_id",
+        column2="move_id",
+        readonly=True,
+    )
+    stock_move_count = fields.Integer(compute="_compute_stock_move_count")
+
+    _sql_constraints = [
+        (
+            "snapshot_uniq",
+            "unique(company_id, date_check, stock_move_non_billed_threshold, "
+            "interval_restrict_invoices)",
+            "A snapshot with the same date and threshold already exists.",
+        )
+    ]
+
+    @api.depends("stock_move_ids")
+    def _compute_stock_move_count(self):
+        for snapshot in self:
+            snapshot.stock_move_count = len(snapshot.stock_move_ids)
+
+    def _get_wizard(self):
+        self.ensure_one()
+        return (
+            self.env["account.sale.stock.report.non.billed.wiz"]
+            .with_company(self.company_id)
+            .new(
+                {
+                    "date_check": self.date_check,
+                    "stock_move_non_billed_threshold": (
+                        self.stock_move_non_billed_threshold
+                    ),
+                    "interval_restrict_invoices": self.interval_restrict_invoices,
+                }
+            )
+        )
+
+    def action_open(self):
+        self.ensure_one()
+        return self._get_wizard()._get_non_billed_action(self.stock_move_ids.ids)
+
+    @api.model
+    def _cron_create_month_end_snapshots(self):
+        """Store the non billed stock moves at the end of the previous month
+        for the companies with the snapshots enabled."""
+        date_check = fields.Date.context_today(self) + relativedelta(day=1, days=-1)
+        companies = self.env["res.company"].search(
+            [("stock_move_non_billed_snapshot", "=", True)]
+        )
+        for company in companies:
+            wizard = (
+                self.env["account.sale.stock.report.non.billed.wiz"]
+                .with_company(company)
+                .create({"date_check": date_check})
+            )
+            if wizard._get_snapshot():
+                continue
+            moves = self.env["stock.move"].search(
+                [
+                    ("id", "in", wizard._get_non_billed_move_ids()),
+                    ("company_id", "=", company.id),
+                ]
+            )
+            self.create(
+                {
+                    "company_id": company.id,
+                    "date_check": date_check,
+                    "stock_move_non_billed_threshold": (
+                        wizard.stock_move_non_billed_threshold
+                    ),
+                    "interval_restrict_invoices": wizard.interval_restrict_invoices,
+                    "stock_move_ids": [(6, 0, moves.ids)],
+                }
+            )
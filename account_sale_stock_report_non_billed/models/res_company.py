@@ -10,3 +10,8 @@ class ResCompany(models.Model):
     stock_move_non_billed_threshold = fields.Date(
         string="Non Billed Threshold Date", default=fields.Date.context_today
     )
+    stock_move_non_billed_snapshot = fields.Boolean(
+        string="Non Billed Month End Snapshots",
+        help="Store the non billed stock moves at every month end. The "
+        "snapshots can be opened again as they were at that time.",
+    )
@@ -10,6 +10,9 @@ class ResConfigSettings(models.TransientModel):
     stock_move_non_billed_threshold = fields.Date(
         related="company_id.stock_move_non_billed_threshold", readonly=False
     )
+    stock_move_non_billed_snapshot = fields.Boolean(
+        related="company_id.stock_move_non_billed_snapshot", readonly=False
+    )
     default_interval_restrict_invoices = fields.Boolean(
         string="Restrict invoices using the date interval",
         default_model="account.sale.stock.report.non.billed.wiz",
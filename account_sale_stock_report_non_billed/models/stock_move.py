@@ -2,6 +2,7 @@
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
 
 from odoo import api, fields, models
+from odoo.tools import SQL
 
 
 class StockMove(models.Model):
@@ -23,7 +24,7 @@ class StockMove(models.Model):
         comodel_name="res.currency", compute="_compute_currency_id", compute_sudo=True
     )
     date_done = fields.Date(
-        string="Effective Date", compute="_compute_date_done", store=True
+        string="Effective Date", compute="_compute_date_done", store=True, index=True
     )
 
     @api.depends("picking_id.date_done")
@@ -43,62 +44,270 @@ class StockMove(models.Model):
             if move.sale_line_id:
                 move.currency_id = move.sale_line_id.currency_id
 
-    def check_is_return(self):
+    def _get_invoice_move_types(self):
+        """Invoice and refund types of the invoices of the move. Method to be
+        overwritten when new implementations are made, e.g. with
+        purchase_stock_picking_invoice_link.
+        """
         self.ensure_one()
-        if not self.origin_returned_move_id:
-            return False
-        else:
-            return not self.origin_returned_move_id.check_is_return()
+        return "out_invoice", "out_refund"
 
-    def get_total_devolution_moves(self):
-        total_qty = 0
-        for move in self:
-            # Avoid moves related to returns that not update qty on stock
-            if move.origin_returned_move_id and not move.to_refund:
+    @api.model
+    def _get_is_return_by_move(self, move_ids):
+        """Return whether the given moves are returns (a return of a return
+        is not), following all the chains of returned moves in one query."""
+        if not move_ids:
+            return {}
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH RECURSIVE returned_move(id, origin_id, depth) AS (
+                    SELECT id, origin_returned_move_id, 0
+                    FROM stock_move
+                    WHERE id IN %(move_ids)s
+                    UNION ALL
+                    SELECT rm.id, sm.origin_returned_move_id, rm.depth + 1
+                    FROM returned_move rm
+                    JOIN stock_move sm ON sm.id = rm.origin_id
+                )
+                SELECT id, MAX(depth) FROM returned_move GROUP BY id
+                """,
+                move_ids=tuple(move_ids),
+            )
+        )
+        return {move_id: depth % 2 == 1 for move_id, depth in self.env.cr.fetchall()}
+
+    @api.model
+    def _get_invoice_date_condition(
+        self, line_alias, move_alias, date_end, date_start=False
+    ):
+        """SQL condition on the date of the invoice lines: the invoice date,
+        the accounting date or the creation date of the line."""
+        invoice_date = SQL(
+            "COALESCE(%s.invoice_date, %s.date, %s.create_date::date)",
+            SQL.identifier(move_alias),
+            SQL.identifier(move_alias),
+            SQL.identifier(line_alias),
+        )
+        condition = SQL("%s <= %s", invoice_date, date_end)
+        if date_start:
+            condition = SQL("%s AND %s >= %s", condition, invoice_date, date_start)
+        return condition
+
+    def _get_moves_with_invoice_lines_in_date(self, date_end, date_start=False):
+        """Return the ids of the moves with an invoice line in date."""
+        if not self:
+            return set()
+        self.env.flush_all()
+        field = self._fields["invoice_line_ids"]
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT DISTINCT rel.%(move_col)s
+                FROM %(rel)s rel
+                JOIN account_move_line aml ON aml.id = rel.%(line_col)s
+                JOIN account_move am ON am.id = aml.move_id
+                WHERE rel.%(move_col)s IN %(move_ids)s AND %(invoice_date_cond)s
+                """,
+                rel=SQL.identifier(field.relation),
+                move_col=SQL.identifier(field.column1),
+                line_col=SQL.identifier(field.column2),
+                move_ids=tuple(self.ids),
+                invoice_date_cond=self._get_invoice_date_condition(
+                    "aml", "am", date_end, date_start=date_start
+                ),
+            )
+        )
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    def _get_invoice_lines_in_date(
+        self, date_start, date_end, invoice_date_start=False
+    ):
+        """Return the ids of the invoice lines to take into account for each
+        move: the invoice lines up to ``date_end`` of the moves done between
+        ``date_start`` and ``date_end`` that share a not cancelled invoice
+        line with the move."""
+        field = self._fields["invoice_line_ids"]
+        rel = SQL.identifier(field.relation)
+        move_col = SQL.identifier(field.column1)
+        line_col = SQL.identifier(field.column2)
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT DISTINCT rel1.%(move_col)s, rel3.%(line_col)s
+                FROM %(rel)s rel1
+                JOIN account_move_line aml1 ON aml1.id = rel1.%(line_col)s
+                JOIN account_move am1 ON am1.id = aml1.move_id
+                JOIN %(rel)s rel2 ON rel2.%(line_col)s = rel1.%(line_col)s
+                JOIN stock_move sm2 ON sm2.id = rel2.%(move_col)s
+                JOIN %(rel)s rel3 ON rel3.%(move_col)s = sm2.id
+                JOIN account_move_line aml3 ON aml3.id = rel3.%(line_col)s
+                JOIN account_move am3 ON am3.id = aml3.move_id
+                WHERE rel1.%(move_col)s IN %(move_ids)s
+                    AND am1.state != 'cancel'
+                    AND sm2.state = 'done'
+                    AND sm2.date_done BETWEEN %(date_start)s AND %(date_end)s
+                    AND %(invoice_date_cond)s
+                """,
+                rel=rel,
+                move_col=move_col,
+                line_col=line_col,
+                move_ids=tuple(self.ids),
+                date_start=date_start,
+                date_end=date_end,
+                invoice_date_cond=self._get_invoice_date_condition(
+                    "aml3", "am3", date_end, date_start=invoice_date_start
+                ),
+            )
+        )
+        line_ids_by_move = {}
+        for move_id, line_id in self.env.cr.fetchall():
+            line_ids_by_move.setdefault(move_id, []).append(line_id)
+        return line_ids_by_move
+
+    def _get_invoice_lines_data(self, line_ids, date_start, date_end):
+        """Return the quantity and type of invoice of the given invoice lines,
+        the ids of their moves done between ``date_start`` and ``date_end`` and
+        the ``(quantity, to_refund, is_returned_move)`` of these moves, in the
+        order of the moves."""
+        field = self._fields["invoice_line_ids"]
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT aml.id, aml.quantity, am.move_type
+                FROM account_move_line aml
+                JOIN account_move am ON am.id = aml.move_id
+                WHERE aml.id IN %s
+                """,
+                tuple(line_ids),
+            )
+        )
+        lines = {
+            line_id: (quantity, move_type)
+            for line_id, quantity, move_type in self.env.cr.fetchall()
+        }
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT rel.%(line_col)s, sm.id, sm.quantity, sm.to_refund,
+                    sm.origin_returned_move_id IS NOT NULL
+                FROM %(rel)s rel
+                JOIN stock_move sm ON sm.id = rel.%(move_col)s
+                WHERE rel.%(line_col)s IN %(line_ids)s
+                    AND sm.state = 'done'
+                    AND sm.date_done BETWEEN %(date_start)s AND %(date_end)s
+                ORDER BY sm.sequence, sm.id
+                """,
+                rel=SQL.identifier(field.relation),
+                move_col=SQL.identifier(field.column1),
+                line_col=SQL.identifier(field.column2),
+                line_ids=tuple(line_ids),
+                date_start=date_start,
+                date_end=date_end,
+            )
+        )
+        move_ids_by_line = {}
+        moves_data = {}
+        for line_id, move_id, *move_data in self.env.cr.fetchall():
+            move_ids_by_line.setdefault(line_id, []).append(move_id)
+            moves_data.setdefault(move_id, tuple(move_data))
+        return lines, move_ids_by_line, moves_data
+
+    def _get_not_invoiced_quantities(
+        self, date_start, date_end, invoice_date_start=False
+    ):
+        """Return ``{move id: (quantity to invoice, quantity invoiced)}`` at
+        ``date_end`` for all the moves at once. The invoice lines and the
+        related moves are read with a few grouped queries, then the invoiced
+        quantity of every move is computed by _get_quantity_invoiced.
+        """
+        moves = self._origin
+        if not moves:
+            return {}
+        self.env.flush_all()
+        line_ids_by_move = moves._get_invoice_lines_in_date(
+            date_start, date_end, invoice_date_start
+        )
+        line_ids = set().union(*line_ids_by_move.values())
+        lines, move_ids_by_line, moves_data = {}, {}, {}
+        if line_ids:
+            lines, move_ids_by_line, moves_data = moves._get_invoice_lines_data(
+                line_ids, date_start, date_end
+            )
+        move_sequence = {move_id: i for i, move_id in enumerate(moves_data)}
+        is_return = self._get_is_return_by_move(set(moves.ids) | set(moves_data))
+        res = {}
+        for move in moves:
+            sign = -1 if is_return[move.id] else 1
+            qty_to_invoice = sign * move.quantity
+            move_line_ids = line_ids_by_move.get(move.id)
+            if not move_line_ids:
+                res[move.id] = (qty_to_invoice, 0.0)
                 continue
-            if not move.check_is_return():
-                total_qty += move.quantity
-            else:
-                total_qty -= move.quantity
-        return total_qty
-
-    def get_quantity_invoiced(self, invoice_lines):
-        if not invoice_lines:
-            return 0
+            # Check when grouping different moves in an invoice line
+            related_move_ids = sorted(
+                {
+                    move_id
+                    for line_id in move_line_ids
+                    for move_id in move_ids_by_line.get(line_id, [])
+                },
+                key=move_sequence.get,
+            )
+            calculated_qty = move._get_quantity_invoiced(
+                [lines[line_id] for line_id in move_line_ids],
+                [
+                    (move_id, *moves_data[move_id], is_return[move_id])
+                    for move_id in related_move_ids
+                ],
+                qty_to_invoice,
+            )
+            res[move.id] = (qty_to_invoice, calculated_qty)
+        return res
+
+    def _get_quantity_invoiced(self, invoice_lines, related_moves, qty_to_invoice):
+        """Return the quantity invoiced of the move.
+
+        :param invoice_lines: ``(quantity, move type)`` of the invoice lines in
+            date of the move.
+        :param related_moves: ``(move id, quantity, to_refund,
+            is_returned_move, is_return)`` of the moves in date of these
+            invoice lines, in the order of the moves.
+        :param qty_to_invoice: quantity of the move, negative for returns.
+        """
+        self.ensure_one()
+        invoice_type, refund_type = self._get_invoice_move_types()
         total_invoiced = abs(
             sum(
-                invoice_lines.mapped(
-                    lambda line: line.quantity
-                    if (line.move_id.move_type == "out_invoice" and not self.to_refund)
-                    or (line.move_id.move_type == "out_refund" and self.to_refund)
-                    else -line.quantity
-                )
+                quantity
+                if (move_type == invoice_type and not self.to_refund)
+                or (move_type == refund_type and self.to_refund)
+                else -quantity
+                for quantity, move_type in invoice_lines
             )
         )
-        # Check when grouping different moves in an invoice line
-        moves = invoice_lines.move_line_ids.filtered(lambda x: x.state == "done")
-        date_start = self.env.context.get("moves_date_start")
-        date_end = self.env.context.get("moves_date_end")
-        if date_start and date_end:
-            moves = moves.filtered(
-                lambda ml: ml.date_done >= date_start and ml.date_done <= date_end
-            )
-        total_qty = moves.get_total_devolution_moves()
-        if total_invoiced != total_qty:
-            invoiced = 0.0
-            for move in moves:
-                qty = (
-                    move.quantity
-                    if move.quantity <= (total_invoiced - invoiced)
-                    else total_invoiced - invoiced
-                )
-                if move.check_is_return():
-                    qty = -qty
-                if move == self:
-                    return qty
-                invoiced += qty
-            return 0
-        return self.quantity if not self.check_is_return() else -self.quantity
+        total_qty = 0
+        for _move_id, quantity, to_refund, is_returned_move, is_return in related_moves:
+            # Avoid moves related to returns that not update qty on stock
+            if is_returned_move and not to_refund:
+                continue
+            total_qty += -quantity if is_return else quantity
+        if total_invoiced == total_qty:
+            return qty_to_invoice
+        invoiced = 0.0
+        for (
+            move_id,
+            quantity,
+            _to_refund,
+            _is_returned_move,
+            is_return,
+        ) in related_moves:
+            qty = min(quantity, total_invoiced - invoiced)
+            if is_return:
+                qty = -qty
+            if move_id == self.id:
+                return qty
+            invoiced += qty
+        return 0
 
     def _set_not_invoiced_values(self, qty_to_invoice, invoiced_qty):
         self.ensure_one()
@@ -112,45 +321,25 @@ class StockMove(models.Model):
         "non_billed_date", "non_billed_date_start", "non_billed_invoice_date_start"
     )
     def _compute_not_invoiced_values(self):
-        for move in self:
-            context = self.env.context
-            if not context.get("non_billed_date") or not context.get(
-                "non_billed_date_start"
-            ):
-                move.quantity_not_invoiced = 0
-                move.price_not_invoiced = 0
-                continue
-            date_start = fields.Date.from_string(context["non_billed_date_start"])
-            date_end = fields.Date.from_string(context["non_billed_date"])
-            invoices_not_cancel = move.invoice_line_ids.filtered(
-                lambda line: line.move_id.state != "cancel"
-            )
-            moves_in_date = invoices_not_cancel.mapped("move_line_ids").filtered(
-                lambda m, date_start=date_start, date_end=date_end: m.state == "done"
-                and m.date_done >= date_start
-                and m.date_done <= date_end
-            )
-            invoice_date_start = False
-            if context.get("non_billed_invoice_date_start"):
-                invoice_date_start = fields.Date.from_string(
-                    context["non_billed_invoice_date_start"]
-                )
-            inv_lines = moves_in_date.mapped("invoice_line_ids").filtered(
-                lambda line,
-                date_end=date_end,
-                invoice_date_start=invoice_date_start: line.check_invoice_line_in_date(
-                    date_end,
-                    date_start=invoice_date_start,
-                )
-            )
-            qty_to_invoice = (
-                move.quantity if not move.check_is_return() else -move.quantity
+        context = self.env.context
+        if not context.get("non_billed_date") or not context.get(
+            "non_billed_date_start"
+        ):
+            self.quantity_not_invoiced = 0
+            self.price_not_invoiced = 0
+            return
+        invoice_date_start = False
+        if context.get("non_billed_invoice_date_start"):
+            invoice_date_start = fields.Date.from_string(
+                context["non_billed_invoice_date_start"]
             )
-            calculated_qty = move.with_context(
-                moves_date_start=date_start,
-                moves_date_end=date_end,
-            ).get_quantity_invoiced(inv_lines)
-            move._set_not_invoiced_values(qty_to_invoice, calculated_qty)
+        quantities = self._get_not_invoiced_quantities(
+            fields.Date.from_string(context["non_billed_date_start"]),
+            fields.Date.from_string(context["non_billed_date"]),
+            invoice_date_start=invoice_date_start,
+        )
+        for move in self:
+            move._set_not_invoiced_values(*quantities.get(move._origin.id, (0.0, 0.0)))
 
     @api.model
     def read_group(
@@ -159,16 +348,22 @@ class StockMove(models.Model):
         """Method to add the computed values 'quantity_not_invoiced' and
         'price_not_invoiced' to the result. Without doing it we get an error when trying
         to get the info on a pivot view.
-        As the fields are not stored, before call super() method we had to remove
-        the keys from 'fields' argument to avoid errors.
+        As the fields are not stored, the ids of the moves of every group are read
+        instead, and the values of all these moves are computed at once.
         """
-        aux_fields = []
-        if "quantity_not_invoiced:sum" in fields:
-            aux_fields.append("quantity_not_invoiced:sum")
-            fields.remove("quantity_not_invoiced:sum")
-        if "price_not_invoiced:sum" in fields:
-            aux_fields.append("price_not_invoiced:sum")
-            fields.remove("price_not_invoiced:sum")
+        aux_fields = {"quantity_not_invoiced:sum", "price_not_invoiced:sum"}
+        if not aux_fields.intersection(fields):
+            return super().read_group(
+                domain,
+                fields,
+                groupby,
+                offset=offset,
+                limit=limit,
+                orderby=orderby,
+                lazy=lazy,
+            )
+        fields = [fname for fname in fields if fname not in aux_fields]
+        fields.append("not_invoiced_move_ids:array_agg(id)")
         res = super().read_group(
             domain,
             fields,
@@ -178,18 +373,21 @@ class StockMove(models.Model):
             orderby=orderby,
             lazy=lazy,
         )
-        qty_not_inv = "quantity_not_invoiced:sum" in aux_fields
-        price_not_inv = "price_not_invoiced:sum" in aux_fields
-        if qty_not_inv or price_not_inv:
-            for line in res:
-                quantity = 0.0
-                price = 0.0
-                moves = self.search(line.get("__domain", domain))
-                for move in moves:
-                    quantity += move.quantity_not_invoiced if qty_not_inv else 0.0
-                    price += move.price_not_invoiced if price_not_inv else 0.0
-                line["quantity_not_invoiced"] = quantity
-                line["price_not_invoiced"] = price
+        move_ids = set()
+        for line in res:
+            move_ids.update(line.get("not_invoiced_move_ids") or [])
+        values = {
+            move.id: (move.quantity_not_invoiced, move.price_not_invoiced)
+            for move in self.browse(move_ids)
+        }
+        for line in res:
+            line_move_ids = line.pop("not_invoiced_move_ids", None) or []
+            line["quantity_not_invoiced"] = sum(
+                values[move_id][0] for move_id in line_move_ids
+            )
+            line["price_not_invoiced"] = sum(
+                values[move_id][1] for move_id in line_move_ids
+            )
         return res
 
     def _get_model_id_origin_document(self):
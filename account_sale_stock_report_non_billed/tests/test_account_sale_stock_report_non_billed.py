@@ -274,3 +274,72 @@ class TestAccountSaleStrockReportNonBilled(
         domain_ids = action["domain"][0][2]
         for move in picking.move_ids:
             self.assertIn(move.id, domain_ids)
+
+    def test_11_read_group_not_invoiced(self):
+        pick_1 = self.get_picking_done_so()
+        moves = pick_1.move_ids.with_context(
+            non_billed_date=fields.Date.today(),
+            non_billed_date_start=fields.Date.today() - relativedelta(days=1),
+        )
+        groups = moves.read_group(
+            [("id", "in", moves.ids)],
+            ["quantity_not_invoiced:sum", "price_not_invoiced:sum"],
+            ["product_id"],
+        )
+        self.assertEqual(len(groups), len(moves.product_id))
+        for group in groups:
+            self.assertNotIn("not_invoiced_move_ids", group)
+            group_moves = moves.filtered(
+                lambda m, group=group: m.product_id.id == group["product_id"][0]
+            )
+            self.assertAlmostEqual(
+                group["quantity_not_invoiced"], sum(group_moves.mapped("quantity"))
+            )
+            self.assertAlmostEqual(
+                group["price_not_invoiced"],
+                sum(group_moves.mapped("price_not_invoiced")),
+            )
+        self.so._create_invoices().action_post()
+        moves.invalidate_recordset(["quantity_not_invoiced", "price_not_invoiced"])
+        groups = moves.read_group(
+            [("id", "in", moves.ids)], ["quantity_not_invoiced:sum"], ["product_id"]
+        )
+        self.assertFalse(any(group["quantity_not_invoiced"] for group in groups))
+
+    def test_12_month_end_snapshot(self):
+        date_check = fields.Date.today() + relativedelta(day=1, days=-1)
+        self.env.company.write(
+            {
+                "stock_move_non_billed_snapshot": True,
+                "stock_move_non_billed_threshold": date_check - relativedelta(months=1),
+            }
+        )
+        picking = self.get_picking_done_so()
+        picking.date_done = fields.Datetime.to_datetime(date_check)
+        snapshot_model = self.env["account.sale.stock.report.non.billed.snapshot"]
+        snapshot_model._cron_create_month_end_snapshots()
+        snapshot = snapshot_model.search(
+            [
+                ("company_id", "=", self.env.company.id),
+                ("date_check", "=", date_check),
+            ]
+        )
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(snapshot.stock_move_ids, picking.move_ids)
+        # Running it again does not duplicate the snapshot
+        snapshot_model._cron_create_month_end_snapshots()
+        self.assertEqual(
+            snapshot_model.search_count([("date_check", "=", date_check)]), 1
+        )
+        # Invoices dated afterwards in the closed month do not change the
+        # snapshot, but the report at that date takes them into account
+        inv = self.so._create_invoices()
+        inv.invoice_date = date_check
+        inv.action_post()
+        wiz = self.env["account.sale.stock.report.non.billed.wiz"].create(
+            {"date_check": date_check}
+        )
+        domain_ids = wiz.open_at_date()["domain"][0][2]
+        self.assertFalse(set(picking.move_ids.ids) & set(domain_ids))
+        domain_ids = snapshot.action_open()["domain"][0][2]
+        self.assertEqual(set(domain_ids), set(picking.move_ids.ids))
@@ -42,69 +42,79 @@ class AccountSaleStockReportNonBilledWiz(models.TransientModel):
 
     @api.model
     def _get_neutralized_moves(self, stock_moves):
-        neutralized_moves = self.env["stock.move"]
+        dp = self.env["decimal.precision"].precision_get("Product Unit of Measure")
+        date_start = (
+            self.stock_move_non_billed_threshold
+            if self.interval_restrict_invoices
+            else False
+        )
+        invoiced_move_ids = (
+            stock_moves | stock_moves.returned_move_ids
+        )._get_moves_with_invoice_lines_in_date(self.date_check, date_start=date_start)
+        neutralized_move_ids = set()
         for move in stock_moves.sorted("origin_returned_move_id"):
             # Not show returns that not update qty on stock
             if move.origin_returned_move_id and not move.to_refund:
-                neutralized_moves |= move
-            if move in neutralized_moves:
+                neutralized_move_ids.add(move.id)
+            if move.id in neutralized_move_ids:
                 continue
-            dp = self.env["decimal.precision"].precision_get("Product Unit of Measure")
-            date_start = (
-                self.stock_move_non_billed_threshold
-                if self.interval_restrict_invoices
-                else False
-            )
+            moves = move | move.returned_move_ids
             if float_is_zero(
                 move.quantity - sum(move.returned_move_ids.mapped("quantity")),
                 precision_digits=dp,
-            ) and not (
-                move.invoice_line_ids
-                + move.returned_move_ids.mapped("invoice_line_ids")
-            ).filtered(
-                lambda line, date_start=date_start: line.check_invoice_line_in_date(
-                    self.date_check, date_start=date_start
-                )
-            ):
-                neutralized_moves |= move + move.returned_move_ids
-        return neutralized_moves
+            ) and not invoiced_move_ids.intersection(moves.ids):
+                neutralized_move_ids.update(moves.ids)
+        return self.env["stock.move"].browse(neutralized_move_ids)
 
-    def open_at_date(self):
+    def _get_non_billed_move_ids(self):
+        """Return the ids of the moves not invoiced at the date of the
+        wizard."""
+        self.ensure_one()
         dp = self.env["decimal.precision"].precision_get("Product Unit of Measure")
         # Get the moves after the threshold
         domain = self._get_search_domain()
         stock_moves = self.env["stock.move"].search(domain)
         stock_moves = self.discart_kits_from_moves(stock_moves)
         stock_moves -= self._get_neutralized_moves(stock_moves)
-        final_stock_move_ids = []
         date_start = (
             self.stock_move_non_billed_threshold
             if self.interval_restrict_invoices
             else False
         )
-        for move in stock_moves:
-            inv_lines_not_cancel = move.invoice_line_ids.filtered(
-                lambda line: line.move_id.state != "cancel"
-            )
-            moves_in_date = inv_lines_not_cancel.move_line_ids.filtered(
-                lambda m: m.state == "done"
-                and m.date_done >= self.stock_move_non_billed_threshold
-                and m.date_done <= self.date_check
-            )
-            inv_lines = moves_in_date.invoice_line_ids.filtered(
-                lambda line: line.check_invoice_line_in_date(
-                    self.date_check, date_start=date_start
-                )
-            )
-            qty_to_invoice = (
-                move.quantity if not move.check_is_return() else -move.quantity
-            )
-            calculated_qty = move.with_context(
-                moves_date_start=self.stock_move_non_billed_threshold,
-                moves_date_end=self.date_check,
-            ).get_quantity_invoiced(inv_lines)
-            if not float_is_zero(qty_to_invoice - calculated_qty, precision_digits=dp):
-                final_stock_move_ids.append(move.id)
+        quantities = stock_moves._get_not_invoiced_quantities(
+            self.stock_move_non_billed_threshold,
+            self.date_check,
+            invoice_date_start=date_start,
+        )
+        return [
+            move_id
+            for move_id, (qty_to_invoice, calculated_qty) in quantities.items()
+            if not float_is_zero(qty_to_invoice - calculated_qty, precision_digits=dp)
+        ]
+
+    def _get_snapshot(self):
+        """Month end snapshot of the company with the same parameters, if
+        any."""
+        self.ensure_one()
+        return self.env["account.sale.stock.report.non.billed.snapshot"].search(
+            [
+                ("company_id", "=", self.env.company.id),
+                ("date_check", "=", self.date_check),
+                (
+                    "stock_move_non_billed_threshold",
+                    "=",
+                    self.stock_move_non_billed_threshold,
+                ),
+                ("interval_restrict_invoices", "=", self.interval_restrict_invoices),
+            ],
+            limit=1,
+        )
+
+    def open_at_date(self):
+        return self._get_non_billed_action(self._get_non_billed_move_ids())
+
+    def _get_non_billed_action(self, final_stock_move_ids):
+        self.ensure_one()
         tree_view_id = self.env.ref(
             "account_sale_stock_report_non_billed.view_move_tree"
         ).id
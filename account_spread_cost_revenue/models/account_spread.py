@@ -586,12 +586,17 @@ class AccountSpread(models.Model):
             line.create_move()
 
     def _post_spread_moves(self, moves):
-        self.ensure_one()
+        """Post the ``moves`` of the spreads that are automatically posted,
+        all together."""
         moves = moves.filtered(lambda x: x.state != "posted")
         if not moves:
             return
         ctx = dict(self.env.context, skip_unique_sequence_number=True)
-        if self.company_id.force_move_auto_post or self.move_line_auto_post:
+        auto_post_spreads = self.filtered(
+            lambda s: s.company_id.force_move_auto_post or s.move_line_auto_post
+        )
+        moves &= auto_post_spreads.line_ids.move_id
+        if moves:
             moves.with_context(**ctx).action_post()
 
     @api.depends("debit_account_id.deprecated", "credit_account_id.deprecated")
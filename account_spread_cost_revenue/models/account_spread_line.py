@@ -1,41 +1,53 @@
 # Copyright 2016-2020 Onestein (<https://www.onestein.eu>)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+import logging
+import threading
+
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
 
 
 class AccountInvoiceSpreadLine(models.Model):
     _name = "account.spread.line"
     _description = "Account Spread Lines"
     _order = "date"
+    # Number of spread lines processed by transaction in the cron job
+    _cron_batch_size = 500
 
     name = fields.Char("Description")
     amount = fields.Float(digits="Account", required=True)
     date = fields.Date(required=True)
-    spread_id = fields.Many2one("account.spread", ondelete="cascade")
-    move_id = fields.Many2one("account.move", string="Journal Entry")
+    spread_id = fields.Many2one("account.spread", ondelete="cascade", index=True)
+    move_id = fields.Many2one(
+        "account.move", string="Journal Entry", index="btree_not_null"
+    )
+
+    def init(self):
+        # Spread lines without journal entry, searched by date by the cron job
+        self.env.cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS account_spread_line_due_index
+            ON account_spread_line (date) WHERE move_id IS NULL
+            """
+        )
 
     def create_and_reconcile_moves(self):
-        grouped_lines = {}
-        for spread_line in self:
-            spread = spread_line.spread_id
-            spread_line_list = grouped_lines.get(
-                spread, self.env["account.spread.line"]
-            )
-            grouped_lines.update({spread: spread_line_list + spread_line})
-        for spread in grouped_lines:
-            created_moves = grouped_lines[spread]._create_moves()
-
-            if created_moves:
+        created_moves = self._create_moves()
+        for spread in self.spread_id:
+            spread_moves = created_moves & spread.line_ids.move_id
+            if spread_moves:
                 post_msg = _("Created move(s) ")
                 post_msg += ", ".join(
                     "<a href=# data-oe-model=account.move data-oe-id=%d"
                     ">%s</a>" % (move.id, move.name)
-                    for move in created_moves
+                    for move in spread_moves
                 )
                 spread.message_post(body=post_msg)
-            spread._post_spread_moves(created_moves)
+        self.spread_id._post_spread_moves(created_moves)
 
     def create_move(self):
         """Button to manually create a move from a spread line entry."""
@@ -53,12 +65,11 @@ class AccountInvoiceSpreadLine(models.Model):
                 )
             )
 
-        created_moves = self.env["account.move"]
-        for line in self:
-            move_vals = line._prepare_move()
-            move = self.env["account.move"].create(move_vals)
+        created_moves = self.env["account.move"].create(
+            [line._prepare_move() for line in self]
+        )
+        for line, move in zip(self, created_moves):
             line.move_id = move
-            created_moves += move
         return created_moves
 
     def _prepare_move(self):
@@ -147,27 +158,70 @@ class AccountInvoiceSpreadLine(models.Model):
             line.spread_id.message_post(body=post_msg)
 
     @api.model
-    def _create_entries(self):
+    def _create_entries(self, batch_size=None, auto_commit=None):
         """Find spread line entries where date is in the past and
         create moves for them. Method also called by the cron job.
-        """
-        lines = self.search(
-            [("date", "<=", fields.Date.today()), ("move_id", "=", False)]
-        )
-        lines.create_and_reconcile_moves()
 
-        unposted_moves = (
-            self.search([("move_id", "!=", False)])
-            .mapped("move_id")
-            .filtered(lambda m: m.state != "posted")
+        The lines are processed by company, in chunks of ``batch_size`` lines
+        committed one by one (unless ``auto_commit`` is False, by default in
+        tests). The lines of a failing chunk are processed one by one, so only
+        the failing lines are left for the next run.
+        """
+        batch_size = batch_size or self._cron_batch_size
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), "testing", False)
+        due_domain = [("date", "<=", fields.Date.today()), ("move_id", "=", False)]
+        for company in self.env["res.company"].search([]):
+            last_id = 0
+            while True:
+                lines = self.with_company(company).search(
+                    due_domain
+                    + [("spread_id.company_id", "=", company.id), ("id", ">", last_id)],
+                    order="id",
+                    limit=batch_size,
+                )
+                if not lines:
+                    break
+                last_id = lines[-1].id
+                try:
+                    with self.env.cr.savepoint():
+                        lines.create_and_reconcile_moves()
+                except Exception:
+                    _logger.exception(
+                        "Spread entries of %s lines of company %s failed, "
+                        "retrying line by line",
+                        len(lines),
+                        company.name,
+                    )
+                    self.env.invalidate_all()
+                    for line in lines:
+                        try:
+                            with self.env.cr.savepoint():
+                                line.create_and_reconcile_moves()
+                        except Exception:
+                            _logger.exception("Spread entry of line %s failed", line.id)
+                if auto_commit:
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+                self.env.invalidate_all()
+
+        unposted_lines = self.search(
+            [
+                ("move_id", "!=", False),
+                ("move_id.state", "!=", "posted"),
+                ("spread_id.company_id.force_move_auto_post", "=", True),
+            ]
         )
-        unposted_moves.filtered(
-            lambda m: m.company_id.force_move_auto_post
-        ).action_post()
-
-        spreads_to_archive = (
-            self.env["account.spread"]
-            .search([("all_posted", "=", True)])
-            .filtered(lambda s: s.company_id.auto_archive_spread)
+        for chunk in split_every(batch_size, unposted_lines.move_id.ids):
+            self.env["account.move"].browse(chunk).action_post()
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+
+        # Only the active spreads are searched, the spreads archived by the
+        # previous runs are not written again
+        spreads_to_archive = self.env["account.spread"].search(
+            [
+                ("all_posted", "=", True),
+                ("company_id.auto_archive_spread", "=", True),
+            ]
         )
         spreads_to_archive.write({"active": False})
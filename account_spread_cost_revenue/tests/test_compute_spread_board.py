@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 import datetime
+from unittest.mock import patch
 
 from odoo.exceptions import UserError
 from odoo.tests import Form, common
@@ -466,6 +467,37 @@ class TestComputeSpreadBoard(common.TransactionCase):
         for line in self.spread.line_ids:
             self.assertTrue(line.move_id)
 
+    def test_10_create_entries_batch(self):
+        self.spread.compute_spread_board()
+        self.spread2.compute_spread_board()
+        lines = self.spread.line_ids | self.spread2.line_ids
+        self.env["account.spread.line"]._create_entries(batch_size=2)
+        for line in lines:
+            self.assertTrue(line.move_id)
+        self.assertEqual(len(lines.move_id), len(lines))
+        self.assertTrue(self.spread.message_ids.filtered(lambda m: "Created" in m.body))
+
+    def test_10_create_entries_failing_line(self):
+        self.spread.compute_spread_board()
+        lines = self.spread.line_ids
+        failing_line = lines[1]
+        line_model = type(self.env["account.spread.line"])
+        prepare_move = line_model._prepare_move
+
+        def _prepare_move(line):
+            if line == failing_line:
+                raise UserError("Boom")
+            return prepare_move(line)
+
+        with patch.object(line_model, "_prepare_move", _prepare_move):
+            self.env["account.spread.line"]._create_entries()
+        self.assertFalse(failing_line.move_id)
+        for line in lines - failing_line:
+            self.assertTrue(line.move_id)
+
+        self.env["account.spread.line"]._create_entries()
+        self.assertTrue(failing_line.move_id)
+
     def test_11_create_move_sale_invoice(self):
         self.spread2.move_line_auto_post = False
         self.spread2.compute_spread_board()
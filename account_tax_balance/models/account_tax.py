@@ -2,7 +2,10 @@
 # Copyright 2016 Antonio Espinosa <antonio.espinosa@tecnativa.com>
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import _, api, fields, models
+from datetime import date
+
+from odoo import _, api, fields, models, tools
+from odoo.tools import SQL
 
 
 class AccountTax(models.Model):
@@ -88,21 +91,124 @@ class AccountTax(models.Model):
         "target_move",
     )
     def _compute_balance(self):
+        balances = self._origin._get_balances()
         for tax in self:
-            tax.balance_regular = tax.compute_balance(
-                tax_or_base="tax", financial_type="regular"
-            )
-            tax.base_balance_regular = tax.compute_balance(
-                tax_or_base="base", financial_type="regular"
+            tax_balances = balances.get(tax._origin.id, {})
+            tax.balance_regular = tax_balances.get(("tax", "regular"), 0)
+            tax.base_balance_regular = tax_balances.get(("base", "regular"), 0)
+            tax.balance_refund = tax_balances.get(("tax", "refund"), 0)
+            tax.base_balance_refund = tax_balances.get(("base", "refund"), 0)
+            tax.balance = tax.balance_regular + tax.balance_refund
+            tax.base_balance = tax.base_balance_regular + tax.base_balance_refund
+
+    def _get_balances(self):
+        """Return the balances of the taxes by tax id and by
+        ``(tax_or_base, financial_type)``, as computed by ``compute_balance``.
+
+        The balances of periods locked in all the companies cannot change
+        anymore, so they are kept in cache. The write date of the companies is
+        part of the cache key, so modifying a lock date drops them.
+        """
+        if not self.ids:
+            return {}
+        from_date, to_date, company_ids, target_move = self.get_context_values()
+        from_date = fields.Date.to_date(from_date)
+        to_date = fields.Date.to_date(to_date)
+        companies = self.env["res.company"].browse(company_ids)
+        lock_dates = [
+            max(
+                company.fiscalyear_lock_date or date.min,
+                company.tax_lock_date or date.min,
             )
-            tax.balance_refund = tax.compute_balance(
-                tax_or_base="tax", financial_type="refund"
+            for company in companies
+        ]
+        if target_move == "posted" and lock_dates and to_date <= min(lock_dates):
+            return self._get_locked_period_balances(
+                tuple(self.ids),
+                from_date,
+                to_date,
+                tuple(companies.ids),
+                tuple(companies.sudo().mapped("write_date")),
             )
-            tax.base_balance_refund = tax.compute_balance(
-                tax_or_base="base", financial_type="refund"
+        return self._read_balances()
+
+    @tools.ormcache(
+        "self.env.uid",
+        "tuple(self.env.companies.ids)",
+        "tax_ids",
+        "from_date",
+        "to_date",
+        "company_ids",
+        "company_write_dates",
+    )
+    def _get_locked_period_balances(
+        self, tax_ids, from_date, to_date, company_ids, company_write_dates
+    ):
+        return (
+            self.browse(tax_ids)
+            .with_context(
+                from_date=from_date,
+                to_date=to_date,
+                company_ids=list(company_ids),
+                target_move="posted",
             )
-            tax.balance = tax.balance_regular + tax.balance_refund
-            tax.base_balance = tax.base_balance_regular + tax.base_balance_refund
+            ._read_balances()
+        )
+
+    def _read_balances(self):
+        """Group the balances of all the taxes by tax, tax or base and
+        financial type in a single query. The journal items of each of them
+        are those of ``get_move_lines_domain``, as shown by the lines
+        actions."""
+        aml_model = self.env["account.move.line"]
+        aml_model.check_access_rights("read")
+        aml_model.flush_model(["balance", "tax_line_id", "tax_ids"])
+        queries = []
+        for tax_or_base in ("tax", "base"):
+            for financial_type in ("regular", "refund"):
+                domain = self.get_move_lines_domain(
+                    tax_or_base=tax_or_base, financial_type=financial_type
+                )
+                aml_model._flush_search(domain)
+                query = aml_model._where_calc(domain)
+                aml_model._apply_ir_rules(query, "read")
+                if tax_or_base == "tax":
+                    sql = """
+                        SELECT aml.tax_line_id, %(tax_or_base)s,
+                            %(financial_type)s, SUM(aml.balance)
+                        FROM account_move_line aml
+                        WHERE aml.id IN (%(line_ids)s)
+                            AND aml.tax_line_id IN %(tax_ids)s
+                        GROUP BY aml.tax_line_id
+                    """
+                else:
+                    sql = """
+                        SELECT rel.account_tax_id, %(tax_or_base)s,
+                            %(financial_type)s, SUM(aml.balance)
+                        FROM account_move_line aml
+                        JOIN account_move_line_account_tax_rel rel
+                            ON rel.account_move_line_id = aml.id
+                        WHERE aml.id IN (%(line_ids)s)
+                            AND rel.account_tax_id IN %(tax_ids)s
+                        GROUP BY rel.account_tax_id
+                    """
+                queries.append(
+                    SQL(
+                        sql,
+                        tax_or_base=tax_or_base,
+                        financial_type=financial_type,
+                        line_ids=query.subselect(),
+                        tax_ids=tuple(self.ids),
+                    )
+                )
+        self.env.cr.execute(SQL(" UNION ALL ").join(queries))
+        balances = {}
+        for tax_id, tax_or_base, financial_type, balance in self.env.cr.fetchall():
+            # balance is debit - credit whereas on tax return you want to see
+            # what vat has to be paid so:
+            # VAT on sales (credit) - VAT on purchases (debit).
+            balances.setdefault(tax_id, {})[(tax_or_base, financial_type)] = -balance
+        return balances
 
     def get_target_type_list(self, financial_type=None):
         if financial_type == "refund":
@@ -144,7 +250,7 @@ class AccountTax(models.Model):
     def get_balance_domain(self, state_list, type_list):
         domain = [
             ("move_id.state", "in", state_list),
-            ("tax_line_id", "=", self.id),
+            ("tax_line_id", "in", self.ids),
         ]
         domain.extend(self.env["account.move.line"]._get_tax_exigible_domain())
         if type_list:
@@ -154,7 +260,7 @@ class AccountTax(models.Model):
     def get_base_balance_domain(self, state_list, type_list):
         domain = [
             ("move_id.state", "in", state_list),
-            ("tax_ids", "in", self.id),
+            ("tax_ids", "in", self.ids),
         ]
         domain.extend(self.env["account.move.line"]._get_tax_exigible_domain())
         if type_list:
@@ -283,3 +283,55 @@ class TestInvoicingBalance(AccountTestInvoicingCommon):
             to_date=date,
         )
         self.assertEqual(tax.balance, balance)
+
+    def test_balance_lines_action(self):
+        """Check that the balances are those of the lines of the actions."""
+        self.init_invoice(
+            "out_invoice",
+            partner=self.partner_a,
+            invoice_date=fields.Date.today(),
+            post=True,
+            amounts=[100],
+            taxes=self.tax_sale_a,
+        )
+        tax = self.tax_sale_a
+        aml_model = self.env["account.move.line"]
+        for tax_or_base, balance_field in (
+            ("tax", "balance"),
+            ("base", "base_balance"),
+        ):
+            for financial_type in ("regular", "refund"):
+                action = tax.get_lines_action(
+                    tax_or_base=tax_or_base, financial_type=financial_type
+                )
+                lines = aml_model.search(action["domain"])
+                self.assertAlmostEqual(
+                    tax[f"{balance_field}_{financial_type}"],
+                    -sum(lines.mapped("balance")),
+                )
+        self.assertEqual(tax.balance, 15)
+        self.assertEqual(tax.base_balance, 100)
+
+    def test_balance_locked_period(self):
+        """Check that the balances of locked periods are kept in cache."""
+        today = fields.Date.today()
+        self.init_invoice(
+            "in_invoice",
+            partner=self.partner_a,
+            invoice_date=today,
+            post=True,
+            amounts=[100],
+            taxes=self.tax_purchase_a,
+        )
+        taxes = (self.tax_sale_a | self.tax_purchase_a).with_context(
+            from_date=today, to_date=today
+        )
+        balances = taxes._read_balances()
+        self.assertEqual(balances[self.tax_purchase_a.id][("tax", "regular")], -15)
+        self.assertEqual(balances[self.tax_purchase_a.id][("base", "regular")], -100)
+        self.assertNotIn(self.tax_sale_a.id, balances)
+        self.company_data["company"].tax_lock_date = today
+        self.assertEqual(taxes._get_balances(), balances)
+        self.assertEqual(taxes[1].balance, -15)
+        self.assertEqual(taxes[1].base_balance, -100)
+        self.assertEqual(taxes[0].balance, 0)
@@ -19,7 +19,9 @@
         "views/detailed_activity_statement.xml",
         "views/aging_buckets.xml",
         "views/res_config_settings.xml",
+        "views/partner_statement_run.xml",
         "wizard/statement_wizard.xml",
+        "data/ir_cron.xml",
     ],
     "assets": {
         "web.report_assets_common": [
@@ -0,0 +1,5 @@
+from . import account_move
+from . import account_move_line
+from . import account_partial_reconcile
+from . import partner_statement_aging_cache
+from . import partner_statement_run
@@ -0,0 +1,13 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    def write(self, vals):
+        if "state" in vals:
+            self.env["partner.statement.aging.cache"]._invalidate(self.line_ids)
+        return super().write(vals)
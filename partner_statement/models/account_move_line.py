@@ -0,0 +1,13 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+from odoo import models
+
+
+class AccountMoveLine(models.Model):
+    _inherit = "account.move.line"
+
+    def write(self, vals):
+        if {"blocked", "date_maturity"} & set(vals):
+            self.env["partner.statement.aging.cache"]._invalidate(self)
+        return super().write(vals)
@@ -0,0 +1,22 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = "account.partial.reconcile"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        self.env["partner.statement.aging.cache"]._invalidate(
+            partials.debit_move_id | partials.credit_move_id
+        )
+        return partials
+
+    def unlink(self):
+        self.env["partner.statement.aging.cache"]._invalidate(
+            self.debit_move_id | self.credit_move_id
+        )
+        return super().unlink()
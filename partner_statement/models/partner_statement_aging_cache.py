@@ -0,0 +1,179 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+import json
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+BUCKET_FIELDS = (
+    "current",
+    "b_1_30",
+    "b_30_60",
+    "b_60_90",
+    "b_90_120",
+    "b_over_120",
+    "balance",
+)
+
+
+class PartnerStatementAgingCache(models.Model):
+    """Aging buckets of all the partners of a company at a date.
+
+    Computed with one query the first time the buckets are requested with the
+    ``partner_statement_aging_cache`` context key, as done by the statement
+    runs, then read by partner. When journal items are posted, reset to draft
+    or reconciled, the buckets of their partners are dropped and computed
+    again for these partners only the next time they are requested. The
+    caches are dropped after a day.
+    """
+
+    _name = "partner.statement.aging.cache"
+    _description = "Partner Statement Aging Buckets Cache"
+
+    company_id = fields.Many2one(
+        "res.company", required=True, readonly=True, ondelete="cascade"
+    )
+    date_end = fields.Date(required=True, readonly=True)
+    account_type = fields.Char(required=True, readonly=True)
+    aging_type = fields.Char(required=True, readonly=True)
+    options_key = fields.Char(
+        required=True, readonly=True, help="Excluded accounts and overdue filter"
+    )
+    stale_partner_ids = fields.Many2many(
+        "res.partner",
+        relation="partner_statement_aging_cache_stale_rel",
+        column1="cache_id",
+        column2="partner_id",
+        readonly=True,
+        help="Partners whose buckets must be computed again",
+    )
+
+    _sql_constraints = [
+        (
+            "key_uniq",
+            "unique(company_id, date_end, account_type, aging_type, options_key)",
+            "The aging buckets are cached once by date and options.",
+        )
+    ]
+
+    @api.model
+    def _get_options_key(self, report):
+        context = report.env.context
+        return json.dumps(
+            [
+                sorted(context.get("excluded_accounts_ids", [])),
+                bool(context.get("show_only_overdue")),
+            ]
+        )
+
+    def _fill(self, report, partner_ids=None):
+        """Compute the buckets of `partner_ids`, of all the partners when
+        None, with the query of the statement `report`."""
+        self.ensure_one()
+        # pylint: disable=E8103
+        # All input queries are properly escaped
+        self.env.cr.execute(
+            """
+            INSERT INTO partner_statement_aging_cache_line
+                (cache_id, partner_id, currency_id, {fields})
+            SELECT {cache_id}, partner_id, currency_id, {fields}
+            FROM ({query}) AS buckets
+            """.format(
+                fields=", ".join(BUCKET_FIELDS),
+                cache_id=int(self.id),
+                query=report._get_account_show_buckets_query(
+                    self.company_id.id,
+                    tuple(partner_ids) if partner_ids is not None else None,
+                    self.date_end,
+                    self.account_type,
+                    self.aging_type,
+                ),
+            )
+        )
+
+    @api.model
+    def _get_buckets(
+        self, report, company_id, partner_ids, date_end, account_type, aging_type
+    ):
+        """Return the aging buckets of `partner_ids` like
+        `_get_account_show_buckets` of the statement `report`."""
+        key = {
+            "company_id": company_id,
+            "date_end": date_end,
+            "account_type": account_type,
+            "aging_type": aging_type,
+            "options_key": self._get_options_key(report),
+        }
+        cache = self.sudo().search(
+            [(fname, "=", value) for fname, value in key.items()], limit=1
+        )
+        if not cache:
+            cache = self.sudo().create(key)
+            cache._fill(report)
+        stale_partner_ids = set(cache.stale_partner_ids.ids) & set(partner_ids)
+        if stale_partner_ids:
+            cache._fill(report, partner_ids=stale_partner_ids)
+            cache.stale_partner_ids = [(3, pid) for pid in stale_partner_ids]
+        buckets = {partner_id: [] for partner_id in partner_ids}
+        self.env.cr.execute(
+            """
+            SELECT partner_id, currency_id, {fields}
+            FROM partner_statement_aging_cache_line
+            WHERE cache_id = %s AND partner_id IN %s
+            ORDER BY id
+            """.format(
+                fields=", ".join(BUCKET_FIELDS)
+            ),
+            (cache.id, tuple(partner_ids)),
+        )
+        for row in self.env.cr.dictfetchall():
+            buckets[row.pop("partner_id")].append(row)
+        return buckets
+
+    @api.model
+    def _invalidate(self, move_lines):
+        """Drop the cached buckets of the partners of `move_lines`."""
+        for company in move_lines.company_id:
+            partners = move_lines.filtered(
+                lambda line, company=company: line.company_id == company
+            ).partner_id
+            caches = self.sudo().search([("company_id", "=", company.id)])
+            if not caches or not partners:
+                continue
+            self.env.cr.execute(
+                """
+                DELETE FROM partner_statement_aging_cache_line
+                WHERE cache_id IN %s AND partner_id IN %s
+                """,
+                (tuple(caches.ids), tuple(partners.ids)),
+            )
+            caches.write({"stale_partner_ids": [(4, pid) for pid in partners.ids]})
+
+    @api.autovacuum
+    def _gc_aging_cache(self):
+        limit_date = fields.Datetime.now() - timedelta(days=1)
+        self.sudo().search([("create_date", "<", limit_date)]).unlink()
+
+
+class PartnerStatementAgingCacheLine(models.Model):
+    _name = "partner.statement.aging.cache.line"
+    _description = "Partner Statement Aging Buckets Cache Line"
+    _log_access = False
+
+    cache_id = fields.Many2one(
+        "partner.statement.aging.cache",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete="cascade",
+    )
+    partner_id = fields.Many2one("res.partner", readonly=True, index=True)
+    currency_id = fields.Many2one("res.currency", readonly=True)
+    current = fields.Float(readonly=True)
+    b_1_30 = fields.Float(readonly=True)
+    b_30_60 = fields.Float(readonly=True)
+    b_60_90 = fields.Float(readonly=True)
+    b_90_120 = fields.Float(readonly=True)
+    b_over_120 = fields.Float(readonly=True)
+    balance = fields.Float(readonly=True)
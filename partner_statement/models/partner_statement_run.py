@@ -0,0 +1,245 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+import logging
+
+from odoo import _, api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+REPORT_EXTENSIONS = {"qweb-pdf": "pdf", "xlsx": "xlsx"}
+
+
+class PartnerStatementRun(models.Model):
+    """Statements of many partners generated in background.
+
+    The pending partners are processed by batches by a scheduled action: the
+    statement data of a batch is computed with one set of queries, then a
+    document is rendered, attached and optionally emailed for each partner.
+    Each batch is committed, so an interrupted run resumes where it stopped,
+    and the partners of a failing batch are set as failed to be retried.
+    """
+
+    _name = "partner.statement.run"
+    _description = "Partner Statement Batch Run"
+    _order = "create_date desc, id desc"
+
+    _batch_size = 100
+
+    name = fields.Char(required=True, readonly=True)
+    report_name = fields.Char(
+        required=True, readonly=True, help="Report action rendering the statements"
+    )
+    statement_model = fields.Char(
+        required=True, readonly=True, help="Model computing the statement data"
+    )
+    report_type = fields.Selection(
+        [("qweb-pdf", "PDF"), ("xlsx", "XLSX")],
+        required=True,
+        readonly=True,
+    )
+    data = fields.Json(readonly=True, help="Statement options of the wizard")
+    company_id = fields.Many2one("res.company", required=True, readonly=True)
+    user_id = fields.Many2one(
+        "res.users", required=True, readonly=True, default=lambda self: self.env.user
+    )
+    send_email = fields.Boolean(
+        readonly=True, help="Send the statement by email to the invoice address"
+    )
+    state = fields.Selection(
+        [
+            ("running", "Running"),
+            ("done", "Done"),
+            ("cancel", "Cancelled"),
+        ],
+        default="running",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    line_ids = fields.One2many(
+        "partner.statement.run.line", "run_id", string="Partners", readonly=True
+    )
+    partner_count = fields.Integer(compute="_compute_progress")
+    processed_count = fields.Integer(compute="_compute_progress")
+    progress = fields.Float(compute="_compute_progress")
+
+    @api.depends("line_ids.state")
+    def _compute_progress(self):
+        groups = self.env["partner.statement.run.line"].read_group(
+            [("run_id", "in", self.ids)],
+            ["run_id", "state"],
+            ["run_id", "state"],
+            lazy=False,
+        )
+        counts = {}
+        for group in groups:
+            run_counts = counts.setdefault(group["run_id"][0], {})
+            run_counts[group["state"]] = group["__count"]
+        for run in self:
+            run_counts = counts.get(run.id, {})
+            run.partner_count = sum(run_counts.values())
+            run.processed_count = run.partner_count - run_counts.get("pending", 0)
+            run.progress = (
+                100.0 * run.processed_count / run.partner_count
+                if run.partner_count
+                else 0.0
+            )
+
+    @api.model
+    def _trigger_cron(self):
+        self.env.ref("partner_statement.ir_cron_partner_statement_run")._trigger()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        runs = super().create(vals_list)
+        self._trigger_cron()
+        return runs
+
+    def _get_report_model(self):
+        self.ensure_one()
+        return self.env[self.statement_model]
+
+    def _render_statement(self, partner, report_values):
+        """Render the statement of `partner` from the values computed for the
+        whole batch."""
+        self.ensure_one()
+        data = dict(self.data, partner_ids=partner.ids)
+        report_obj = self.env["ir.actions.report"].with_context(
+            partner_statement_report_values=report_values,
+            active_model="res.partner",
+            lang=partner.lang or self.env.lang,
+        )
+        if self.report_type == "xlsx":
+            content, __ = report_obj._render_xlsx(self.report_name, partner.ids, data)
+        else:
+            content, __ = report_obj._render_qweb_pdf(
+                self.report_name, partner.ids, data=data
+            )
+        return content
+
+    def _send_statement(self, partner, attachment):
+        self.ensure_one()
+        invoice_address = self._get_report_model()._get_invoice_address(partner)
+        partner.message_post(
+            body=_("Please find attached your statement."),
+            subject=self.name,
+            attachment_ids=attachment.ids,
+            partner_ids=invoice_address.ids,
+            message_type="comment",
+            subtype_xmlid="mail.mt_comment",
+        )
+
+    def _process_lines(self, lines):
+        """Generate the statements of `lines`, all of this run."""
+        self.ensure_one()
+        # the aging buckets of all the partners are computed by the first batch
+        report_model = self._get_report_model().with_context(
+            partner_statement_aging_cache=True
+        )
+        partner_ids = lines.partner_id.ids
+        # the partners without statement are removed from the list
+        report_values = report_model._get_report_values(
+            list(partner_ids), dict(self.data, partner_ids=list(partner_ids))
+        )
+        extension = REPORT_EXTENSIONS[self.report_type]
+        for line in lines:
+            partner = line.partner_id
+            if partner.id not in report_values["data"]:
+                line.state = "skipped"
+                continue
+            try:
+                with self.env.cr.savepoint():
+                    content = self._render_statement(partner, report_values)
+                    attachment = self.env["ir.attachment"].create(
+                        {
+                            "name": f"{self.name} - {partner.display_name}.{extension}",
+                            "raw": content,
+                            "res_model": partner._name,
+                            "res_id": partner.id,
+                        }
+                    )
+                    if self.send_email:
+                        self._send_statement(partner, attachment)
+                    line.write({"state": "done", "attachment_id": attachment.id})
+            except Exception as e:
+                _logger.exception(
+                    "Statement of partner %s of run %s failed", partner.id, self.id
+                )
+                line.write({"state": "failed", "error": str(e)})
+
+    def _process_batch(self):
+        self.ensure_one()
+        lines = self.env["partner.statement.run.line"].search(
+            [("run_id", "=", self.id), ("state", "=", "pending")],
+            order="id",
+            limit=self._batch_size,
+        )
+        if not lines:
+            self.state = "done"
+            return False
+        try:
+            with self.env.cr.savepoint():
+                self.with_user(self.user_id)._process_lines(
+                    lines.with_user(self.user_id)
+                )
+        except Exception as e:
+            # the statement data of the batch could not be computed, its
+            # partners are set as failed so the next batches and runs go on
+            _logger.exception("Batch of statement run %s failed", self.id)
+            lines.write({"state": "failed", "error": str(e)})
+        return True
+
+    @api.model
+    def _cron_process_runs(self, batch_limit=10):
+        """Process up to `batch_limit` batches of the running statement runs
+        and trigger the cron again while partners are pending."""
+        runs = self.search([("state", "=", "running")], order="id")
+        for run in runs:
+            while batch_limit:
+                if not run._process_batch():
+                    break
+                batch_limit -= 1
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+            if not batch_limit:
+                self._trigger_cron()
+                break
+
+    def action_cancel(self):
+        self.filtered(lambda r: r.state == "running").state = "cancel"
+
+    def action_resume(self):
+        self.filtered(lambda r: r.state == "cancel").state = "running"
+        self._trigger_cron()
+
+    def action_retry_failed(self):
+        self.line_ids.filtered(lambda r: r.state == "failed").write(
+            {"state": "pending", "error": False}
+        )
+        self.state = "running"
+        self._trigger_cron()
+
+
+class PartnerStatementRunLine(models.Model):
+    _name = "partner.statement.run.line"
+    _description = "Partner Statement Batch Run Line"
+    _order = "run_id, id"
+
+    run_id = fields.Many2one(
+        "partner.statement.run", required=True, ondelete="cascade", index=True
+    )
+    partner_id = fields.Many2one("res.partner", required=True, readonly=True)
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("skipped", "Skipped"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    attachment_id = fields.Many2one("ir.attachment", readonly=True)
+    error = fields.Text(readonly=True)
@@ -1,6 +1,7 @@
 # Copyright 2018 ForgeFlow, S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 from odoo import _, api, fields, models
@@ -59,6 +60,9 @@ class ReportStatementCommon(models.AbstractModel):
         return {}
 
     def _show_buckets_sql_q1(self, partners, date_end, account_type):
+        # without partners, the buckets of all the partners are computed
+        all_partners = partners is None
+        partners = partners or (-1,)
         excluded_accounts_ids = tuple(
             self.env.context.get("excluded_accounts_ids", [])
         ) or (-1,)
@@ -94,7 +98,10 @@ class ReportStatementCommon(models.AbstractModel):
                 ON pr.debit_move_id = l2.id
                 WHERE l2.date <= %(date_end)s
             ) as pc ON pc.credit_move_id = l.id
-            WHERE l.partner_id IN %(partners)s
+            WHERE (
+                    (%(all_partners)s AND l.partner_id IS NOT NULL)
+                    OR l.partner_id IN %(partners)s
+                )
                 AND aa.id not in %(excluded_accounts_ids)s
                 AND (
                   (pd.id IS NOT NULL AND
@@ -241,16 +248,14 @@ class ReportStatementCommon(models.AbstractModel):
             d = d.replace(day=1) - timedelta(days=1)
         return res
 
-    def _get_account_show_buckets(
-        self, company_id, partner_ids, date_end, account_type, aging_type
+    def _get_account_show_buckets_query(
+        self, company_id, partners, date_end, account_type, aging_type
     ):
-        buckets = dict(map(lambda x: (x, []), partner_ids))
-        partners = tuple(partner_ids)
+        """Return the query of the aging buckets of `partners`, of all the
+        partners when None."""
         full_dates = self._get_bucket_dates(date_end, aging_type)
-        # pylint: disable=E8103
-        # All input queries are properly escaped - false positive
-        self.env.cr.execute(
-            """
+        # All input queries are properly escaped
+        return """
             WITH Q1 AS ({}),
                 Q2 AS ({}),
                 Q3 AS ({}),
@@ -262,16 +267,30 @@ class ReportStatementCommon(models.AbstractModel):
             FROM Q4
             GROUP BY partner_id, currency_id, current, b_1_30, b_30_60,
                 b_60_90, b_90_120, b_over_120""".format(
-                self._show_buckets_sql_q1(partners, date_end, account_type),
-                self._show_buckets_sql_q2(
-                    full_dates["date_end"],
-                    full_dates["minus_30"],
-                    full_dates["minus_60"],
-                    full_dates["minus_90"],
-                    full_dates["minus_120"],
-                ),
-                self._show_buckets_sql_q3(company_id),
-                self._show_buckets_sql_q4(),
+            self._show_buckets_sql_q1(partners, date_end, account_type),
+            self._show_buckets_sql_q2(
+                full_dates["date_end"],
+                full_dates["minus_30"],
+                full_dates["minus_60"],
+                full_dates["minus_90"],
+                full_dates["minus_120"],
+            ),
+            self._show_buckets_sql_q3(company_id),
+            self._show_buckets_sql_q4(),
+        )
+
+    def _get_account_show_buckets(
+        self, company_id, partner_ids, date_end, account_type, aging_type
+    ):
+        if self.env.context.get("partner_statement_aging_cache"):
+            return self.env["partner.statement.aging.cache"]._get_buckets(
+                self, company_id, partner_ids, date_end, account_type, aging_type
+            )
+        buckets = dict(map(lambda x: (x, []), partner_ids))
+        # pylint: disable=E8103
+        self.env.cr.execute(
+            self._get_account_show_buckets_query(
+                company_id, tuple(partner_ids), date_end, account_type, aging_type
             )
         )
         for row in self.env.cr.dictfetchall():
@@ -333,6 +352,17 @@ class ReportStatementCommon(models.AbstractModel):
     def _add_currency_ending_line(self, line, currency):
         return [line]
 
+    def _get_partner_report_values(self, report_values, partner_ids):
+        """Restrict the values returned by `_get_report_values` for several
+        partners to the statements of `partner_ids`."""
+        partner_ids = [p for p in partner_ids if p in report_values["data"]]
+        return dict(
+            report_values,
+            doc_ids=partner_ids,
+            docs=self.env["res.partner"].browse(partner_ids),
+            data={p: report_values["data"][p] for p in partner_ids},
+        )
+
     @api.model
     def _get_report_values(self, docids, data=None):
         # flake8: noqa: C901
@@ -356,6 +386,11 @@ class ReportStatementCommon(models.AbstractModel):
           }
         }
         """
+        # Values already computed for a batch of partners, see
+        # partner.statement.run
+        report_values = self.env.context.get("partner_statement_report_values")
+        if report_values:
+            return self._get_partner_report_values(report_values, data["partner_ids"])
         company_id = data["company_id"]
         partner_ids = data["partner_ids"]
         date_start = data.get("date_start")
@@ -424,6 +459,10 @@ class ReportStatementCommon(models.AbstractModel):
             if is_activity
             else {}
         )
+        # reconciled lines by index, for each reconciled journal item
+        reconciled_lines_by_id = defaultdict(dict)
+        for index, line2 in enumerate(reconciled_lines):
+            reconciled_lines_by_id[line2["id"]][index] = line2
         balances_forward = self._get_account_initial_balance(
             company_id, partner_ids, date_start, account_type
         )
@@ -517,29 +556,33 @@ class ReportStatementCommon(models.AbstractModel):
                 line_currency["lines"].extend(
                     self._add_currency_line(line, currencies[line["currency_id"]])
                 )
-                for line2 in reconciled_lines:
-                    if line2["id"] in line["ids"]:
-                        line2["reconciled_line"] = True
-                        line2["applied_amount"] = line2["open_amount"]
-                        if line2["date"] >= date_start and line2["date"] <= date_end:
-                            line2["outside-date-rank"] = False
-                            if not line2["blocked"]:
-                                line["applied_amount"] += line2["open_amount"]
-                        else:
-                            line2["outside-date-rank"] = True
-                        line2["date"] = format_date(
-                            line2["date"], date_formats.get(partner_id, default_fmt)
-                        )
-                        line2["date_maturity"] = format_date(
-                            line2["date_maturity"],
-                            date_formats.get(partner_id, default_fmt),
-                        )
-                        if is_detailed:
-                            line_currency["lines"].extend(
-                                self._add_currency_line(
-                                    line2, currencies[line["currency_id"]]
-                                )
+                line_reconciled_lines = {}
+                for line_id in line.get("ids", []):
+                    line_reconciled_lines.update(
+                        reconciled_lines_by_id.get(line_id, {})
+                    )
+                for _index, line2 in sorted(line_reconciled_lines.items()):
+                    line2["reconciled_line"] = True
+                    line2["applied_amount"] = line2["open_amount"]
+                    if line2["date"] >= date_start and line2["date"] <= date_end:
+                        line2["outside-date-rank"] = False
+                        if not line2["blocked"]:
+                            line["applied_amount"] += line2["open_amount"]
+                    else:
+                        line2["outside-date-rank"] = True
+                    line2["date"] = format_date(
+                        line2["date"], date_formats.get(partner_id, default_fmt)
+                    )
+                    line2["date_maturity"] = format_date(
+                        line2["date_maturity"],
+                        date_formats.get(partner_id, default_fmt),
+                    )
+                    if is_detailed:
+                        line_currency["lines"].extend(
+                            self._add_currency_line(
+                                line2, currencies[line["currency_id"]]
                             )
+                        )
                 if is_activity:
                     line["open_amount"] = line["amount"] + line["applied_amount"]
                     if not line["blocked"]:
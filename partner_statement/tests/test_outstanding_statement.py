@@ -2,6 +2,8 @@
 # Copyright 2025 Simone Rubino - PyTech
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
+from unittest.mock import patch
+
 from dateutil.relativedelta import relativedelta
 
 from odoo import fields
@@ -198,3 +200,88 @@ class TestOutstandingStatement(TransactionCase):
         moves_names = [line["name"] for line in partner_move_lines]
         self.assertNotIn(due_invoice.name, moves_names)
         self.assertIn(overdue_invoice.name, moves_names)
+
+    def test_statement_run(self):
+        """Statements generated by batch, one document by partner."""
+        partners = self.partner1 | self.partner2
+        wizard = self.wiz.with_context(active_ids=partners.ids).create(
+            {"filter_partners_non_due": False, "batch_report_type": "xlsx"}
+        )
+        action = wizard.button_batch_run()
+        run = self.env["partner.statement.run"].browse(action["res_id"])
+        self.assertEqual(run.partner_count, 2)
+        self.assertEqual(run.processed_count, 0)
+
+        self.assertTrue(run._process_batch())
+        run.invalidate_recordset()
+        self.assertEqual(run.processed_count, 2)
+        self.assertEqual(set(run.line_ids.mapped("state")), {"done"})
+        for line in run.line_ids:
+            self.assertEqual(line.attachment_id.res_id, line.partner_id.id)
+            self.assertTrue(line.attachment_id.raw)
+
+        self.assertFalse(run._process_batch())
+        self.assertEqual(run.state, "done")
+
+    def test_statement_run_failing_batch(self):
+        """A batch whose statement data fails is set as failed."""
+        partners = self.partner1 | self.partner2
+        wizard = self.wiz.with_context(active_ids=partners.ids).create(
+            {"filter_partners_non_due": False, "batch_report_type": "xlsx"}
+        )
+        action = wizard.button_batch_run()
+        run = self.env["partner.statement.run"].browse(action["res_id"])
+        report_model = type(run._get_report_model())
+        with patch.object(
+            report_model, "_get_report_values", side_effect=ValueError("Boom")
+        ):
+            self.assertTrue(run._process_batch())
+        self.assertEqual(set(run.line_ids.mapped("state")), {"failed"})
+        self.assertIn("Boom", run.line_ids[0].error)
+        self.assertFalse(run._process_batch())
+        self.assertEqual(run.state, "done")
+        run.action_retry_failed()
+        self.assertTrue(run._process_batch())
+        self.assertEqual(set(run.line_ids.mapped("state")), {"done"})
+
+    def test_aging_cache(self):
+        """Aging buckets read from the cache of all the partners."""
+        partners = self.partner1 | self.partner2
+        self.init_invoice("out_invoice", self.partner1)
+        wizard = self.wiz.with_context(active_ids=partners.ids).create({})
+        data = wizard._prepare_statement()
+        args = (
+            data["company_id"],
+            partners.ids,
+            data["date_end"],
+            data["account_type"],
+            data["aging_type"],
+        )
+        buckets = self.statement_model._get_account_show_buckets(*args)
+        cache_model = self.env["partner.statement.aging.cache"]
+        cached_buckets = self.statement_model.with_context(
+            partner_statement_aging_cache=True
+        )._get_account_show_buckets(*args)
+        self.assertEqual(len(cache_model.search([])), 1)
+        self.assertTrue(buckets[self.partner1.id])
+        for partner_id, rows in buckets.items():
+            self.assertEqual(len(cached_buckets[partner_id]), len(rows))
+            for row, cached_row in zip(rows, cached_buckets[partner_id], strict=True):
+                self.assertEqual(cached_row["currency_id"], row["currency_id"])
+                self.assertAlmostEqual(cached_row["balance"], row["balance"])
+        # Posting a new invoice only drops the buckets of its partner, which
+        # are computed again when requested
+        cache = cache_model.search([])
+        self.init_invoice("out_invoice", self.partner2)
+        self.assertEqual(cache.stale_partner_ids, self.partner2)
+        self.assertTrue(cache.exists())
+        buckets = self.statement_model._get_account_show_buckets(*args)
+        cached_buckets = self.statement_model.with_context(
+            partner_statement_aging_cache=True
+        )._get_account_show_buckets(*args)
+        self.assertFalse(cache.stale_partner_ids)
+        self.assertTrue(cached_buckets[self.partner2.id])
+        for partner_id, rows in buckets.items():
+            self.assertEqual(len(cached_buckets[partner_id]), len(rows))
+            for row, cached_row in zip(rows, cached_buckets[partner_id], strict=True):
+                self.assertAlmostEqual(cached_row["balance"], row["balance"])
@@ -12,6 +12,10 @@ class ActivityStatementWizard(models.TransientModel):
     _inherit = "statement.common.wizard"
     _name = "activity.statement.wizard"
     _description = "Activity Statement Wizard"
+    _report_names = {
+        "qweb": "partner_statement.activity_statement",
+        "xlsx": "p_s.report_activity_statement_xlsx",
+    }
 
     @api.model
     def _get_date_start(self):
@@ -43,10 +47,7 @@ class ActivityStatementWizard(models.TransientModel):
     def _print_report(self, report_type):
         self.ensure_one()
         data = self._prepare_statement()
-        if report_type == "xlsx":
-            report_name = "p_s.report_activity_statement_xlsx"
-        else:
-            report_name = "partner_statement.activity_statement"
+        report_name = self._get_report_name(report_type)
         partners = self.env["res.partner"].browse(data["partner_ids"])
         return (
             self.env["ir.actions.report"]
@@ -10,6 +10,10 @@ class DetailedActivityStatementWizard(models.TransientModel):
     _inherit = "activity.statement.wizard"
     _name = "detailed.activity.statement.wizard"
     _description = "Detailed Activity Statement Wizard"
+    _report_names = {
+        "qweb": "partner_statement.detailed_activity_statement",
+        "xlsx": "p_s.report_detailed_activity_statement_xlsx",
+    }
 
     show_aging_buckets = fields.Boolean(default=False)
     show_balance = fields.Boolean(string="Show Balance column")
@@ -26,10 +30,7 @@ class DetailedActivityStatementWizard(models.TransientModel):
     def _print_report(self, report_type):
         self.ensure_one()
         data = self._prepare_statement()
-        if report_type == "xlsx":
-            report_name = "p_s.report_detailed_activity_statement_xlsx"
-        else:
-            report_name = "partner_statement.detailed_activity_statement"
+        report_name = self._get_report_name(report_type)
         partners = self.env["res.partner"].browse(data["partner_ids"])
         return (
             self.env["ir.actions.report"]
@@ -10,6 +10,10 @@ class OutstandingStatementWizard(models.TransientModel):
     _name = "outstanding.statement.wizard"
     _inherit = "statement.common.wizard"
     _description = "Outstanding Statement Wizard"
+    _report_names = {
+        "qweb": "partner_statement.outstanding_statement",
+        "xlsx": "p_s.report_outstanding_statement_xlsx",
+    }
 
     def _prepare_statement(self):
         res = super()._prepare_statement()
@@ -23,10 +27,7 @@ class OutstandingStatementWizard(models.TransientModel):
     def _print_report(self, report_type):
         self.ensure_one()
         data = self._prepare_statement()
-        if report_type == "xlsx":
-            report_name = "p_s.report_outstanding_statement_xlsx"
-        else:
-            report_name = "partner_statement.outstanding_statement"
+        report_name = self._get_report_name(report_type)
         partners = self.env["res.partner"].browse(data["partner_ids"])
         return (
             self.env["ir.actions.report"]
@@ -1,15 +1,20 @@
 # Copyright 2018 Graeme Gellatly
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+import json
+
 from dateutil.relativedelta import relativedelta
 
-from odoo import api, fields, models
+from odoo import Command, _, api, fields, models
 from odoo.osv import expression
 
 
 class StatementCommon(models.AbstractModel):
     _name = "statement.common.wizard"
     _description = "Statement Reports Common Wizard"
+    # Report names of the statement, "qweb" for the PDF and HTML reports and
+    # "xlsx" for the XLSX one
+    _report_names = {}
 
     name = fields.Char()
     company_id = fields.Many2one(
@@ -42,6 +47,19 @@ class StatementCommon(models.AbstractModel):
         [("asset_receivable", "Receivable"), ("liability_payable", "Payable")],
         default="asset_receivable",
     )
+    batch_report_type = fields.Selection(
+        [("qweb-pdf", "PDF"), ("xlsx", "XLSX")],
+        string="Batch Format",
+        default="qweb-pdf",
+        required=True,
+        help="Format of the statements generated in background, one document "
+        "by partner.",
+    )
+    send_email = fields.Boolean(
+        string="Send by Email",
+        help="Send the statements generated in background to the invoice "
+        "address of the partners.",
+    )
     excluded_accounts_selector = fields.Char(
         string="Accounts to exclude",
         help="Select account codes to be excluded "
@@ -105,6 +123,38 @@ class StatementCommon(models.AbstractModel):
             "excluded_accounts_ids": self._get_excluded_accounts().ids,
         }
 
+    def _get_report_name(self, report_type):
+        return self._report_names["xlsx" if report_type == "xlsx" else "qweb"]
+
+    def _prepare_statement_run(self):
+        self.ensure_one()
+        data = self._prepare_statement()
+        partner_ids = data.pop("partner_ids")
+        return {
+            "name": self.name or _("Statements at %s") % self.date_end,
+            "report_name": self._get_report_name(self.batch_report_type),
+            "report_type": self.batch_report_type,
+            "statement_model": "report.%s" % self._get_report_name("qweb-pdf"),
+            "data": json.loads(json.dumps(data, default=str)),
+            "company_id": self.company_id.id,
+            "send_email": self.send_email,
+            "line_ids": [
+                Command.create({"partner_id": partner_id}) for partner_id in partner_ids
+            ],
+        }
+
+    def button_batch_run(self):
+        """Generate one statement by partner in background."""
+        self.ensure_one()
+        run = self.env["partner.statement.run"].create(self._prepare_statement_run())
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Statement Run"),
+            "res_model": run._name,
+            "res_id": run.id,
+            "view_mode": "form",
+        }
+
     def button_export_html(self):
         self.ensure_one()
         report_type = "qweb-html"
@@ -4,6 +4,7 @@
 
 import json
 import logging
+import os
 
 from werkzeug.urls import url_decode
 
@@ -24,6 +25,20 @@ _logger = logging.getLogger(__name__)
 
 
 class ReportController(ReportController):
+    _xlsx_chunk_size = 64 * 1024
+
+    def _iter_xlsx_file(self, report_file):
+        """Send the temporary file of a streamed report by chunks and delete
+        it afterwards."""
+        try:
+            while True:
+                chunk = report_file.read(self._xlsx_chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            report_file.close()
+
     @route()
     def report_routes(self, reportname, docids=None, converter=None, **data):
         if converter == "xlsx":
@@ -36,16 +51,22 @@ class ReportController(ReportController):
             if data.get("context"):
                 data["context"] = json.loads(data["context"])
                 context.update(data["context"])
+            context["xlsx_stream_file"] = True
             xlsx = report.with_context(**context)._render_xlsx(
                 reportname, docids, data=data
             )[0]
+            if isinstance(xlsx, bytes):
+                length = len(xlsx)
+            else:
+                length = os.fstat(xlsx.fileno()).st_size
+                xlsx = self._iter_xlsx_file(xlsx)
             xlsxhttpheaders = [
                 (
                     "Content-Type",
                     "application/vnd.openxmlformats-"
                     "officedocument.spreadsheetml.sheet",
                 ),
-                ("Content-Length", len(xlsx)),
+                ("Content-Length", length),
             ]
             return request.make_response(xlsx, headers=xlsxhttpheaders)
         return super().report_routes(reportname, docids, converter, **data)
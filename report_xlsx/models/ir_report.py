@@ -20,12 +20,18 @@ class ReportAction(models.Model):
     def _render_xlsx(self, report_ref, docids, data):
         report_sudo = self._get_report(report_ref)
         report_model_name = "report.%s" % report_sudo.report_name
-        report_model = self.env[report_model_name]
-        ret = (
-            report_model.with_context(active_model=report_sudo.model)
-            .sudo(False)
-            .create_xlsx_report(docids, data)  # noqa
+        report_model = self.env[report_model_name].with_context(
+            active_model=report_sudo.model
         )
+        stream_file = self.env.context.get("xlsx_stream_file")
+        if stream_file and report_model._is_xlsx_stream(data):
+            # The caller gets an open temporary file instead of the content
+            report_file = report_model.sudo(False).create_xlsx_report_file(docids, data)
+            if report_sudo.attachment:
+                report_sudo.save_xlsx_report_attachment(docids, report_file.read())
+                report_file.seek(0)
+            return report_file, "xlsx"
+        ret = report_model.sudo(False).create_xlsx_report(docids, data)  # noqa
         if ret and isinstance(ret, (tuple | list)):  # data, "xlsx"
             report_sudo.save_xlsx_report_attachment(docids, ret[0])
         return ret
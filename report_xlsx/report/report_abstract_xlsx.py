@@ -3,6 +3,7 @@
 
 import logging
 import re
+import tempfile
 from io import BytesIO
 
 from odoo import models
@@ -69,6 +70,11 @@ class ReportXlsxAbstract(models.AbstractModel):
     _name = "report.report_xlsx.abstract"
     _description = "Abstract XLSX Report"
 
+    # Write the worksheets row by row to temporary files and the workbook to a
+    # temporary file instead of memory. Rows must be written in order, see
+    # https://xlsxwriter.readthedocs.io/working_with_memory.html
+    _xlsx_stream = False
+
     def _get_objs_for_report(self, docids, data):
         """
         Returns objects for xlx report.  From WebUI these
@@ -98,7 +104,36 @@ class ReportXlsxAbstract(models.AbstractModel):
         s_after = " %s" % currency.symbol if currency.position == "after" else ""
         return f"{f'{s_before}'}#,##0.{'0' * currency.decimal_places}{f'{s_after}'}"
 
+    def _is_xlsx_stream(self, data):
+        """Whether the report is rendered in constant memory mode, either
+        because the report opts in or because it is requested in ``data``."""
+        return self._xlsx_stream or bool(data and data.get("xlsx_stream"))
+
+    def create_xlsx_report_file(self, docids, data):
+        """Render the report in constant memory mode into a temporary file.
+        The file is positioned at its start and deleted once closed by the
+        caller."""
+        objs = self._get_objs_for_report(docids, data)
+        options = dict(
+            self.get_workbook_options(),
+            constant_memory=True,
+            tmpdir=tempfile.gettempdir(),
+        )
+        report_file = tempfile.TemporaryFile(suffix=".xlsx")
+        try:
+            workbook = xlsxwriter.Workbook(report_file, options)
+            self.generate_xlsx_report(workbook, data, objs)
+            workbook.close()
+        except Exception:
+            report_file.close()
+            raise
+        report_file.seek(0)
+        return report_file
+
     def create_xlsx_report(self, docids, data):
+        if self._is_xlsx_stream(data):
+            with self.create_xlsx_report_file(docids, data) as report_file:
+                return report_file.read(), "xlsx"
         objs = self._get_objs_for_report(docids, data)
         file_data = BytesIO()
         workbook = xlsxwriter.Workbook(file_data, self.get_workbook_options())
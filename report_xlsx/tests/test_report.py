@@ -32,6 +32,24 @@ class TestReport(common.TransactionCase):
         sheet = wb.sheet_by_index(0)
         self.assertEqual(sheet.cell(0, 0).value, self.docs.name)
 
+    def test_report_stream(self):
+        data = {"xlsx_stream": True}
+        rep = self.report_object._render(self.report_name, self.docs.ids, data)
+        wb = open_workbook(file_contents=rep[0])
+        self.assertEqual(wb.sheet_by_index(0).cell(0, 0).value, self.docs.name)
+        report_file, report_type = self.report_object.with_context(
+            xlsx_stream_file=True
+        )._render_xlsx(self.report_name, self.docs.ids, data)
+        self.assertEqual(report_type, "xlsx")
+        with report_file:
+            wb = open_workbook(file_contents=report_file.read())
+        self.assertEqual(wb.sheet_by_index(0).cell(0, 0).value, self.docs.name)
+        # Without the request in data the report is rendered in memory
+        rep = self.report_object.with_context(xlsx_stream_file=True)._render_xlsx(
+            self.report_name, self.docs.ids, {}
+        )
+        self.assertIsInstance(rep[0], bytes)
+
     def test_save_attachment(self):
         self.report.attachment = 'object.name + ".xlsx"'
         self.report_object._render(self.report_name, self.docs.ids, {})
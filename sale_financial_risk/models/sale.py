@@ -4,6 +4,9 @@
 from odoo import _, api, fields, models
 from odoo.tools import float_round
 
+# Sale order line fields whose change changes the risk amount
+RISK_FIELDS = {"product_id", "product_uom_qty", "price_unit", "discount", "tax_id"}
+
 
 class SaleOrder(models.Model):
     _inherit = "sale.order"
@@ -13,6 +16,14 @@ class SaleOrder(models.Model):
     # relation is triggered.
     partner_invoice_id = fields.Many2one(index=True)
 
+    def write(self, vals):
+        if {"state", "partner_invoice_id"} & set(vals):
+            self.order_line._schedule_risk_update()
+            res = super().write(vals)
+            self.order_line._schedule_risk_update()
+            return res
+        return super().write(vals)
+
     def evaluate_risk_message(self, partner):
         self.ensure_one()
         risk_amount = self.currency_id._convert(
@@ -88,6 +99,32 @@ class SaleOrderLine(models.Model):
         index=True,
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._schedule_risk_update()
+        return lines
+
+    def write(self, vals):
+        res = super().write(vals)
+        if RISK_FIELDS & set(vals):
+            self._schedule_risk_update()
+        return res
+
+    def unlink(self):
+        self._schedule_risk_update()
+        return super().unlink()
+
+    def _schedule_risk_update(self):
+        """Update the stored risk of the invoice partners of these lines in
+        the companies of the lines, if they are in a risk state."""
+        risk_states = self.env["sale.order"]._get_risk_states()
+        lines = self.filtered(lambda line: line.state in risk_states)
+        for company in lines.company_id:
+            lines.filtered(
+                lambda line, company=company: line.company_id == company
+            ).order_id.partner_invoice_id._schedule_risk_update(company)
+
     @api.depends(
         "state",
         "price_reduce_taxinc",
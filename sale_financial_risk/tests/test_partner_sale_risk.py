@@ -88,6 +88,23 @@ class TestPartnerSaleRisk(TransactionCase):
         wiz.button_continue()
         self.assertAlmostEqual(self.partner.risk_sale_order, 230.0)
 
+    def test_sale_order_stored_risk(self):
+        self.partner.write({"risk_sale_order_include": True, "credit_limit": 100.0})
+        self.partner._flush_risk_updates()
+        risk = self.partner._get_stored_risk(self.env.company)
+        self.assertFalse(risk["risk_exception"])
+        self.sale_order.with_context(bypass_risk=True).action_confirm()
+        risk = self.partner._get_stored_risk(self.env.company)
+        self.assertAlmostEqual(risk["risk_sale_order"], 115.0)
+        self.assertTrue(risk["risk_exception"])
+        self.assertIn(
+            self.partner,
+            self.env["res.partner"].search([("risk_exception", "=", True)]),
+        )
+        self.sale_order._action_cancel()
+        risk = self.partner._get_stored_risk(self.env.company)
+        self.assertFalse(risk["risk_sale_order"])
+
     def test_sale_order_auto_done(self):
         self.env["ir.config_parameter"].create(
             {"key": "sale.auto_done_setting", "value": "True"}
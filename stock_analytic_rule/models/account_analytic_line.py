@@ -7,5 +7,5 @@ class AccountAnalyticLine(models.Model):
     _inherit = "account.analytic.line"
 
     stock_move_id = fields.Many2one(
-        "stock.move", string="Stock Move", ondelete="cascade"
+        "stock.move", string="Stock Move", ondelete="cascade", index="btree_not_null"
     )
@@ -89,20 +89,27 @@ class StockAnalyticRule(models.Model):
         if self.env.context.get("bypass_combination_check"):
             # Avoid validation when record is being copied
             return
+        rule_ids_by_combination = {}
+        for rule in self.search([]):
+            rule_ids_by_combination.setdefault(rule._get_combination(), set()).add(
+                rule.id
+            )
         for record in self:
-            others = self.search([("id", "!=", record.id)])
-            for other in others:
-                if set(other.location_from_ids.ids) == set(
-                    record.location_from_ids.ids
-                ) and set(other.location_dest_ids.ids) == set(
-                    record.location_dest_ids.ids
-                ):
-                    raise ValidationError(
-                        _(
-                            """A Stock Analytic Rule with the same
-                            'From' and 'To' already exists."""
-                        )
+            rule_ids = rule_ids_by_combination.get(record._get_combination(), set())
+            if rule_ids - {record.id}:
+                raise ValidationError(
+                    _(
+                        """A Stock Analytic Rule with the same
+                        'From' and 'To' already exists."""
                     )
+                )
+
+    def _get_combination(self):
+        self.ensure_one()
+        return (
+            frozenset(self.location_from_ids.ids),
+            frozenset(self.location_dest_ids.ids),
+        )
 
     def action_open_form(self):
         self.ensure_one()
@@ -169,6 +176,17 @@ class StockAnalyticRule(models.Model):
         is_reversal is neeeded to know if the lines comes from a devolution
         wich means we need to change the sign of the amount.
         """
+        self.env["account.analytic.line"].create(
+            self._prepare_analytic_lines(
+                amount, product, stock_move_id, company_id, is_reversal=is_reversal
+            )
+        )
+
+    def _prepare_analytic_lines(
+        self, amount, product, stock_move_id, company_id, is_reversal=False
+    ):
+        """Values of the analytic lines of both positive and negative
+        accounts (see _create_analytic_lines)."""
         analytic_lines_to_create = []
         # Change the sign of the amount if it's the reversal rule.
         positive_amount = amount if not is_reversal else -amount
@@ -195,8 +213,7 @@ class StockAnalyticRule(models.Model):
                     self.financial_account_id,
                 )
             )
-
-        self.env["account.analytic.line"].create(analytic_lines_to_create)
+        return analytic_lines_to_create
 
     def _split_amount_by_analytic_distribution(
         self,
@@ -246,46 +263,52 @@ class StockAnalyticRule(models.Model):
             )
 
     @api.model
-    def generate_analytic_lines(self, stock_move):
-        """Generates analytic lines based on matching stock analytic rules."""
+    def _get_rule_index(self, company_ids):
+        """Return the active rules of the companies by (location from,
+        location to, company), keeping the first rule of each combination."""
+        index = {}
+        rules = self.search([("active", "=", True), ("company_id", "in", company_ids)])
+        for rule in rules:
+            for location_from in rule.location_from_ids:
+                for location_dest in rule.location_dest_ids:
+                    key = (location_from.id, location_dest.id, rule.company_id.id)
+                    index.setdefault(key, rule)
+        return index
 
-        product = stock_move.product_id
-        quantity = stock_move.quantity
-        location_from_id = stock_move.location_id.id
-        location_dest_id = stock_move.location_dest_id.id
-        company_id = stock_move.company_id.id
-        partner = stock_move.partner_id
-
-        record = self.search(
-            [
-                ("location_from_ids", "in", [location_from_id]),
-                ("location_dest_ids", "in", [location_dest_id]),
-                ("active", "=", True),
-                ("company_id", "=", company_id),
-            ],
-            limit=1,
-        )
-
-        if record:
+    @api.model
+    def generate_analytic_lines(self, stock_moves):
+        """Generates analytic lines based on matching stock analytic rules.
+        The lines of all the moves are created together."""
+        if not stock_moves:
+            return
+        index = self._get_rule_index(stock_moves.company_id.ids)
+        if not index:
+            return
+        analytic_lines_to_create = []
+        for stock_move in stock_moves:
+            location_from_id = stock_move.location_id.id
+            location_dest_id = stock_move.location_dest_id.id
+            company_id = stock_move.company_id.id
+            is_reversal = False
+            record = index.get((location_from_id, location_dest_id, company_id))
+            if not record:
+                # Look for the reversal rule, if it exists.
+                record = index.get((location_dest_id, location_from_id, company_id))
+                is_reversal = True
+            if not record:
+                continue
             # If the stock moves matches with the rule criteria,
             # then generate the analytic lines.
-            amount = record._compute_amount(product, quantity, partner=partner)
-            record._create_analytic_lines(amount, product, stock_move.id, company_id)
-            return
-        else:
-            # Look for the reversal rule, if it exists.
-            reversal = self.search(
-                [
-                    ("location_from_ids", "in", [location_dest_id]),
-                    ("location_dest_ids", "in", [location_from_id]),
-                    ("active", "=", True),
-                    ("company_id", "=", company_id),
-                ],
-                limit=1,
+            amount = record._compute_amount(
+                stock_move.product_id,
+                stock_move.quantity,
+                partner=stock_move.partner_id,
             )
-
-            if reversal:
-                amount = reversal._compute_amount(product, quantity, partner=partner)
-                reversal._create_analytic_lines(
-                    amount, product, stock_move.id, company_id, is_reversal=True
-                )
+            analytic_lines_to_create += record._prepare_analytic_lines(
+                amount,
+                stock_move.product_id,
+                stock_move.id,
+                company_id,
+                is_reversal=is_reversal,
+            )
+        self.env["account.analytic.line"].create(analytic_lines_to_create)
@@ -11,31 +11,29 @@ class StockMove(models.Model):
         res = super().create(vals_list)
 
         stock_analytic_model = self.env["stock.analytic.rule"].sudo()
-        for move_id in res:
-            if move_id.state == "done":
-                stock_analytic_model.generate_analytic_lines(move_id)
+        stock_analytic_model.generate_analytic_lines(
+            res.filtered(lambda m: m.state == "done")
+        )
         return res
 
     def write(self, vals):
         res = super().write(vals)
 
-        for record in self:
-            # Look if this move has analytic lines
-            analytic_lines = analytic_lines = (
-                self.env["account.analytic.line"]
-                .sudo()
-                .search([("stock_move_id", "=", record.id)])
-                if record.id
-                else False
-            )
-
-            stock_analytic_model = self.env["stock.analytic.rule"].sudo()
-
-            if vals.get("state") == "done" and not analytic_lines:
-                stock_analytic_model.generate_analytic_lines(record)
-
-            if analytic_lines:
-                analytic_lines.unlink()
-                stock_analytic_model.generate_analytic_lines(record)
+        records = self.filtered("id")
+        # Look if these moves have analytic lines
+        analytic_lines = (
+            self.env["account.analytic.line"]
+            .sudo()
+            .search([("stock_move_id", "in", records.ids)])
+        )
+        moves_with_lines = self.browse(analytic_lines.stock_move_id.ids)
+        moves_to_generate = moves_with_lines
+        if vals.get("state") == "done":
+            moves_to_generate |= records - moves_with_lines
+        if analytic_lines:
+            analytic_lines.unlink()
+        self.env["stock.analytic.rule"].sudo().generate_analytic_lines(
+            moves_to_generate
+        )
 
         return res
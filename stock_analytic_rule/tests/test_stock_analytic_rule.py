@@ -166,6 +166,49 @@ class TestStockAnalyticModel(TransactionCase):
             self.analytic_account_negative.id,
         )
 
+    def test_stock_move_create_several(self):
+        """Test the creation of several moves generates the analytic lines of
+        every matching move, the reversal ones included"""
+        moves = self.env["stock.move"].create(
+            [
+                {
+                    "name": "Test Move",
+                    "product_id": self.product.id,
+                    "product_uom": self.product.uom_id.id,
+                    "product_uom_qty": qty,
+                    "quantity": qty,
+                    "location_id": location_from.id,
+                    "location_dest_id": location_dest.id,
+                    "state": "done",
+                    "company_id": self.env.company.id,
+                }
+                for qty, location_from, location_dest in [
+                    (10.0, self.stock_location, self.stock_location_2),
+                    (4.0, self.stock_location, self.stock_location_2),
+                    (2.0, self.stock_location_2, self.stock_location),
+                    (3.0, self.stock_location, self.stock_location),
+                ]
+            ]
+        )
+        for move in moves:
+            analytic_lines = self.env["account.analytic.line"].search(
+                [("stock_move_id", "=", move.id)]
+            )
+            if move.location_id == move.location_dest_id:
+                self.assertFalse(analytic_lines)
+                continue
+            expected_amount = self._get_amount(self.product_category, move.quantity)
+            if move.location_id == self.stock_location_2:
+                expected_amount = -expected_amount
+            self.assertEqual(len(analytic_lines), 2)
+            self.assertEqual(
+                analytic_lines.filtered(
+                    lambda line: line[self.analytic_plan._column_name()]
+                    == self.analytic_account
+                ).amount,
+                expected_amount,
+            )
+
     def test_stock_move_write(self):
         """Test updating a move regenerates analytic lines"""
 